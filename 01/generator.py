@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+import random
+import string
+
+WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+# Extra arguments of generate used by diff, to also check inputs on which part 1 is not defined
+DIFF_OPTIONS = {"words_only": True}
+
+
+def generate(size: float = 1, seed: int = 0, words_only: bool = False):
+    """Calibration document with 1000 * size lines.
+
+    The first and the last digit-or-word are placed explicitly, the filler
+    around them uses letters that cannot spell a digit. Every line has a
+    plain digit, unless words_only is set: then in about half of the
+    documents some lines have only spelled digits, part 1 is not defined
+    for them, and only the answer of part 2 is returned."""
+    rng = random.Random(seed)
+    # Letters used by the digit names never appear in the filler
+    filler_letters = "".join(ch for ch in string.ascii_lowercase if ch not in set("".join(WORDS)))
+
+    def filler(max_length):
+        return "".join(rng.choice(filler_letters) for _ in range(rng.randint(0, max_length)))
+
+    lines = list()
+    total1 = 0
+    total2 = 0
+    # Drawn only with words_only, so that the default documents do not depend on it
+    words_only_rate = 0.1 if words_only and rng.random() < 0.5 else 0
+    has_words_only = False
+    for _ in range(max(1, int(1000 * size))):
+        line_words_only = words_only_rate > 0 and rng.random() < words_only_rate
+        digits = [rng.randint(1, 9) for _ in range(0 if line_words_only else rng.randint(1, 4))]
+        tokens = [str(digit) for digit in digits]
+        first_word = rng.randint(1, 9)
+        last_word = rng.randint(1, 9)
+        use_first_word = line_words_only or rng.random() < 0.5
+        use_last_word = rng.random() < 0.5
+        if use_first_word:
+            tokens.insert(0, WORDS[first_word - 1])
+        if use_last_word:
+            tokens.append(WORDS[last_word - 1])
+        line = filler(5) + "".join(token + filler(4) for token in tokens)
+        lines.append(line)
+
+        first = first_word if use_first_word else digits[0]
+        if line_words_only:
+            has_words_only = True
+            last = last_word if use_last_word else first_word
+        else:
+            total1 += digits[0] * 10 + digits[-1]
+            last = last_word if use_last_word else digits[-1]
+        total2 += first * 10 + last
+    if has_words_only:
+        return "\n".join(lines) + "\n", {2: total2}
+    return "\n".join(lines) + "\n", {1: total1, 2: total2}
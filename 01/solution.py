@@ -1,4 +1,15 @@
 #!/usr/bin/env python
+import collections
+import concurrent.futures
+import mmap
+import os
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+
 
 DIGITS = {
     "one": "1",
@@ -13,14 +24,189 @@ DIGITS = {
 }
 
 
+# Output of an automaton state: the value of the digit, plus PLAIN for a plain digit
+PLAIN = 16
+VALUE_MASK = 15
+
+
+class Automaton:
+    """Aho-Corasick automaton over bytes for the digits and their names.
+
+    The failure links are folded into a full transition table, one bytes
+    object of 256 targets per state, so that each byte of a line costs a
+    single lookup. No pattern is a substring of another, so the first
+    match to end is also the first to start."""
+
+    def __init__(self, patterns: Dict[bytes, int]):
+        goto = [dict()]
+        outputs = [0]
+        for pattern, output in patterns.items():
+            state = 0
+            for byte in pattern:
+                if byte not in goto[state]:
+                    goto.append(dict())
+                    outputs.append(0)
+                    goto[state][byte] = len(goto) - 1
+                state = goto[state][byte]
+            outputs[state] = output
+        assert len(goto) <= 256
+
+        transitions = [bytearray(256) for _ in goto]
+        for byte, target in goto[0].items():
+            transitions[0][byte] = target
+        # Breadth first, so that the failure state of every state is already complete
+        queue = collections.deque((target, 0) for target in goto[0].values())
+        while len(queue) > 0:
+            state, failure = queue.popleft()
+            transitions[state][:] = transitions[failure]
+            if outputs[state] == 0:
+                outputs[state] = outputs[failure]
+            for byte, target in goto[state].items():
+                transitions[state][byte] = target
+                queue.append((target, transitions[failure][byte]))
+        self.transitions = [bytes(table) for table in transitions]
+        self.outputs = bytes(outputs)
+
+    def scan(self, values: Iterable[int]) -> Tuple[int, int]:
+        """First plain digit and first digit or name in values, 0 if none."""
+        transitions = self.transitions
+        outputs = self.outputs
+        state = 0
+        first = 0
+        for byte in values:
+            state = transitions[state][byte]
+            output = outputs[state]
+            if output:
+                if first == 0:
+                    first = output & VALUE_MASK
+                if output & PLAIN:
+                    return output & VALUE_MASK, first
+        return 0, first
+
+
+def _get_patterns(reverse: bool = False) -> Dict[bytes, int]:
+    patterns = dict()
+    for name, digit in DIGITS.items():
+        name = name[::-1] if reverse else name
+        patterns[name.encode()] = int(digit)
+        patterns[digit.encode()] = int(digit) | PLAIN
+    return patterns
+
+
+FORWARD = Automaton(_get_patterns())
+# Scans lines from their end, for the last digit
+BACKWARD = Automaton(_get_patterns(reverse=True))
+
+
+def _sum_numbers(lines: Iterable[bytes]) -> Tuple[int | None, int]:
+    """Totals of both parts over lines; part 1 is None if a line has no plain digit."""
+    tot1, tot2 = 0, 0
+    get_numbers = Solver.get_numbers
+    for line in lines:
+        number1, number2 = get_numbers(line)
+        if number1 is None or tot1 is None:
+            tot1 = None
+        else:
+            tot1 += number1
+        tot2 += number2
+    return tot1, tot2
+
+
+def _sum_lines(content) -> Tuple[int | None, int]:
+    """Totals of both parts over the lines of a bytes-like object."""
+    return _sum_numbers(content.splitlines())
+
+
+def _sum_file_chunk(path: str, start: int, end: int) -> Tuple[int, int]:
+    # Each worker maps the file on its own, only the bounds of the chunk are sent
+    with open(path, "rb") as hand:
+        with mmap.mmap(hand.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return _sum_lines(content[start:end])
+
+
 class Solver:
+    # Inputs smaller than this are solved in the calling process
+    parallel_threshold = 64 * 2 ** 20
+    chunk_size = 4 * 2 ** 20
 
     def __init__(self):
-        self.data = None
+        self.content = None
+        self.path = None
+        self.jobs = os.cpu_count() or 1
+        self.totals = None
+
+    def parse(self, file):
+        # Large files are memory-mapped: no line is decoded or kept in memory
+        content = inputs.read_bytes(file)
+        # Chunks are found with find and split with splitlines, which other buffers lack
+        if not isinstance(content, (bytes, bytearray, mmap.mmap)):
+            content = bytes(content)
+        self.content = content
+        self.path = os.fspath(file) if inputs.is_path(file) else None
+
+    @staticmethod
+    def get_numbers(line: bytes) -> Tuple[int | None, int]:
+        """Calibration values of line for both parts, in a single scan from each end.
+
+        The value of part 1 is None when the line has only spelled digits."""
+        first1, first2 = FORWARD.scan(line)
+        last1, last2 = BACKWARD.scan(reversed(line))
+        if first2 == 0:
+            raise ValueError("No digit in line %r" % line)
+        return (10 * first1 + last1 if first1 != 0 else None), 10 * first2 + last2
+
+    def get_chunks(self) -> List[Tuple[int, int]]:
+        """Bounds of consecutive chunks of the content, each ending after a newline."""
+        content = self.content
+        chunks = list()
+        start = 0
+        while start < len(content):
+            end = content.find(b"\n", min(start + self.chunk_size, len(content)) - 1) + 1
+            if end == 0:
+                end = len(content)
+            chunks.append((start, end))
+            start = end
+        return chunks
+
+    def get_totals(self) -> Tuple[int, int]:
+        if self.totals is not None:
+            return self.totals
+        chunks = self.get_chunks()
+        if self.jobs <= 1 or len(self.content) < self.parallel_threshold:
+            partials = [_sum_lines(self.content[start:end]) for start, end in chunks]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=min(self.jobs, len(chunks))) as executor:
+                if self.path is not None:
+                    futures = [executor.submit(_sum_file_chunk, self.path, start, end) for start, end in chunks]
+                else:
+                    futures = [executor.submit(_sum_lines, bytes(self.content[start:end])) for start, end in chunks]
+                partials = [future.result() for future in futures]
+        totals1 = [partial[0] for partial in partials]
+        total1 = None if None in totals1 else sum(totals1)
+        self.totals = (total1, sum(partial[1] for partial in partials))
+        return self.totals
+
+    def solve1(self):
+        total = self.get_totals()[0]
+        if total is None:
+            raise ValueError("Part 1 needs a plain digit on every line")
+        return total
+
+    def solve2(self):
+        return self.get_totals()[1]
+
+    def stream(self, lines: Iterable[bytes | str]) -> Tuple[int | None, int]:
+        """Solve both parts in a single pass over the lines; part 1 is None
+        if a line has no plain digit."""
+        return _sum_numbers(line.encode() if isinstance(line, str) else line for line in lines)
+
+
+class ReferenceSolver(Solver):
+    """Tries every name at every index of the line, from each end."""
 
     def parse(self, file):
         lines = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 lines.append(line)
         self.data = lines
@@ -32,21 +218,26 @@ class Solver:
         else:
             return None
 
+    def get_number(self, get_digit, line):
+        number = ""
+        for idx in range(len(line)):
+            digit = get_digit(idx, line)
+            if digit is not None:
+                number = digit
+                break
+        for idx in range(len(line), 0, -1):
+            digit = get_digit(idx - 1, line)
+            if digit is not None:
+                number += digit
+                break
+        if number == "":
+            raise ValueError("No digit in line %r" % line)
+        return int(number)
+
     def get_total(self, get_digit):
         tot = 0
         for line in self.data:
-            number = ""
-            for idx in range(len(line)):
-                digit = get_digit(idx, line)
-                if digit is not None:
-                    number = digit
-                    break
-            for idx in range(len(line), 0, -1):
-                digit = get_digit(idx - 1, line)
-                if digit is not None:
-                    number += digit
-                    break
-            tot += int(number)
+            tot += self.get_number(get_digit, line)
         return tot
 
     def solve1(self):
@@ -58,7 +249,7 @@ class Solver:
             return ch
         for candidate in DIGITS:
             end_idx = idx + len(candidate)
-            if end_idx >= len(line):
+            if end_idx > len(line):
                 continue
             if line[idx:end_idx] == candidate:
                 return DIGITS[candidate]
@@ -67,6 +258,25 @@ class Solver:
     def solve2(self):
         return self.get_total(self.get_digit_or_name)
 
+    def stream(self, lines: Iterable[str]) -> Tuple[int | None, int]:
+        """Solve both parts in a single pass over the lines; part 1 is None
+        if a line has no plain digit."""
+        tot1, tot2 = 0, 0
+        for line in lines:
+            if tot1 is not None:
+                try:
+                    tot1 += self.get_number(self.get_digit_simple, line)
+                except ValueError:
+                    tot1 = None
+            tot2 += self.get_number(self.get_digit_or_name, line)
+        return tot1, tot2
+
+
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
 
 def main():
     solver = Solver()
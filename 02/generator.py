@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+import random
+
+COLORS = ["red", "green", "blue"]
+LIMITS = {"red": 12, "green": 13, "blue": 14}
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Record of 100 * size games, each with up to six extractions."""
+    rng = random.Random(seed)
+    lines = list()
+    total1 = 0
+    total2 = 0
+    for game_id in range(1, max(1, int(100 * size)) + 1):
+        maximums = {color: 0 for color in COLORS}
+        extractions = list()
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(COLORS, rng.randint(1, 3))
+            extraction = list()
+            for color in colors:
+                value = rng.randint(1, 20)
+                maximums[color] = max(maximums[color], value)
+                extraction.append("%d %s" % (value, color))
+            extractions.append(", ".join(extraction))
+        lines.append("Game %d: %s" % (game_id, "; ".join(extractions)))
+
+        if all(maximums[color] <= LIMITS[color] for color in COLORS):
+            total1 += game_id
+        total2 += maximums["red"] * maximums["green"] * maximums["blue"]
+    return "\n".join(lines) + "\n", {1: total1, 2: total2}
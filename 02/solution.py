@@ -1,8 +1,131 @@
 #!/usr/bin/env python
+import bisect
+import os
+import sys
+from array import array
+from typing import Iterable, List, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+
+
+TARGET = {
+    "red": 12,
+    "green": 13,
+    "blue": 14
+}
+COLORS = ("red", "green", "blue")
+
+
+class GameIndex:
+    """Sum of the ids of the games possible with a bag, for many bags at once.
+
+    A game is possible when its maximum of every colour is within the limit
+    of the bag, a dominance query in three dimensions. Bags are answered by
+    increasing red limit while games are added by increasing red maximum
+    to a Fenwick tree over the ranks of their green and blue maximums, so
+    each bag is a prefix sum instead of a scan of every game."""
+
+    def __init__(self, ids: Sequence[int], maximums: Sequence[Sequence[int]]):
+        reds, greens, blues = maximums
+        self.ids = ids
+        self.reds = reds
+        self.order = sorted(range(len(ids)), key=reds.__getitem__)
+        self.green_values = sorted(set(greens))
+        self.blue_values = sorted(set(blues))
+        # Ranks start from 1, as Fenwick tree indices
+        self.green_ranks = [bisect.bisect_left(self.green_values, green) + 1 for green in greens]
+        self.blue_ranks = [bisect.bisect_left(self.blue_values, blue) + 1 for blue in blues]
+
+    def query(self, limits: Sequence[Tuple[int, int, int]]) -> List[int]:
+        """Sum of the possible game ids for each (red, green, blue) limit."""
+        height = len(self.green_values) + 1
+        width = len(self.blue_values) + 1
+        tree = [0] * (height * width)
+        results = [0] * len(limits)
+        added = 0
+        for query in sorted(range(len(limits)), key=lambda query: limits[query][0]):
+            red, green, blue = limits[query]
+            while added < len(self.order) and self.reds[self.order[added]] <= red:
+                game = self.order[added]
+                game_id = self.ids[game]
+                g = self.green_ranks[game]
+                while g < height:
+                    b = self.blue_ranks[game]
+                    while b < width:
+                        tree[g * width + b] += game_id
+                        b += b & -b
+                    g += g & -g
+                added += 1
+            total = 0
+            g = bisect.bisect_right(self.green_values, green)
+            while g > 0:
+                b = bisect.bisect_right(self.blue_values, blue)
+                while b > 0:
+                    total += tree[g * width + b]
+                    b -= b & -b
+                g -= g & -g
+            results[query] = total
+        return results
+
 
 class Solver:
 
     def __init__(self):
+        self.ids = array("q")
+        # Maximum number of cubes of each colour shown in each game
+        self.maximums = tuple(array("q") for _ in COLORS)
+
+    @staticmethod
+    def _parse_line(line) -> Tuple[int, List[int]]:
+        game_raw, sets_raw = line.strip().split(": ")
+        game_id = int(game_raw[len("Game "):])
+        maximums = dict.fromkeys(COLORS, 0)
+        for extraction in sets_raw.split("; "):
+            for num_and_color in extraction.split(", "):
+                num, color = num_and_color.split(" ")
+                maximums[color] = max(maximums[color], int(num))
+        return game_id, [maximums[color] for color in COLORS]
+
+    def parse(self, file):
+        self.ids = array("q")
+        self.maximums = tuple(array("q") for _ in COLORS)
+        with inputs.open_text(file) as hand:
+            for line in hand:
+                game_id, maximums = self._parse_line(line)
+                self.ids.append(game_id)
+                for column, value in zip(self.maximums, maximums):
+                    column.append(value)
+
+    def sum_possible_ids(self, limits: Sequence[Tuple[int, int, int]]) -> List[int]:
+        """Sum of the ids of the possible games for each (red, green, blue) bag."""
+        return GameIndex(self.ids, self.maximums).query(limits)
+
+    def solve1(self):
+        return self.sum_possible_ids([tuple(TARGET[color] for color in COLORS)])[0]
+
+    def solve2(self):
+        reds, greens, blues = self.maximums
+        return sum(red * green * blue for red, green, blue in zip(reds, greens, blues))
+
+    def stream(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines."""
+        limits = [TARGET[color] for color in COLORS]
+        result1, result2 = 0, 0
+        for line in lines:
+            game_id, (red, green, blue) = self._parse_line(line)
+            if red <= limits[0] and green <= limits[1] and blue <= limits[2]:
+                result1 += game_id
+            result2 += red * green * blue
+        return result1, result2
+
+
+class ReferenceSolver(Solver):
+    """Keeps every extraction as a dict and checks them one by one."""
+
+    def __init__(self):
+        super().__init__()
         self.data = None
 
     def _parse_extractions(self, raw_line):
@@ -16,53 +139,69 @@ class Solver:
             extractions.append(single_extraction)
         return extractions
 
+    def _parse_line(self, line):
+        line = line.strip()
+        game_raw, sets_raw = line.split(": ")
+        game_id = int(game_raw[len("Game "):])
+        extractions = self._parse_extractions(sets_raw)
+        return game_id, extractions
+
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
-                line = line.strip()
-                game_raw, sets_raw = line.split(": ")
-                game_id = int(game_raw[len("Game "):])
-                extractions = self._parse_extractions(sets_raw)
-                self.data.append((game_id, extractions))
+                self.data.append(self._parse_line(line))
 
-    def solve1(self):
-        target = {
-            "red": 12,
-            "green": 13,
-            "blue": 14
-        }
-
-        def are_all_possible(results):
-            for extraction_res in results:
-                for color, max_val in target.items():
-                    extracted = extraction_res.get(color, 0)
-                    if extracted > max_val:
-                        return False
-            return True
+    @staticmethod
+    def are_all_possible(results):
+        for extraction_res in results:
+            for color, max_val in TARGET.items():
+                extracted = extraction_res.get(color, 0)
+                if extracted > max_val:
+                    return False
+        return True
+
+    @staticmethod
+    def get_min_cubes(game_extractions):
+        res = {"red": 0, "green": 0, "blue": 0}
+        for game_extraction in game_extractions:
+            for color in res.keys():
+                res[color] = max(res[color], game_extraction.get(color, 0))
+        return res
+
+    def get_power(self, extractions):
+        min_cubes = self.get_min_cubes(extractions)
+        return min_cubes["red"] * min_cubes["green"] * min_cubes["blue"]
 
+    def solve1(self):
         result = 0
         for game_id, extractions in self.data:
-            if are_all_possible(extractions):
+            if self.are_all_possible(extractions):
                 result += game_id
         return result
 
     def solve2(self):
-
-        def get_min_cubes(game_extractions):
-            res = {"red": 0, "green": 0, "blue": 0}
-            for game_extraction in game_extractions:
-                for color in res.keys():
-                    res[color] = max(res[color], game_extraction.get(color, 0))
-            return res
-
         result = 0
         for game_id, extractions in self.data:
-            min_cubes = get_min_cubes(extractions)
-            cubes_power = min_cubes["red"] * min_cubes["green"] * min_cubes["blue"]
-            result += cubes_power
+            result += self.get_power(extractions)
         return result
 
+    def stream(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines."""
+        result1, result2 = 0, 0
+        for line in lines:
+            game_id, extractions = self._parse_line(line)
+            if self.are_all_possible(extractions):
+                result1 += game_id
+            result2 += self.get_power(extractions)
+        return result1, result2
+
+
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
 
 def main():
     solver = Solver()
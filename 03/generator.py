@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+import random
+
+SYMBOLS = "*#+$/=%@&-"
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Square engine schematic with side 140 * sqrt(size)."""
+    rng = random.Random(seed)
+    side = max(10, int(140 * size ** 0.5))
+    lines = list()
+    for _ in range(side):
+        line = ""
+        while len(line) < side:
+            roll = rng.random()
+            if roll < 0.12:
+                number = str(rng.randint(1, 999))
+                if len(line) + len(number) > side:
+                    line += "."
+                    continue
+                line += number
+                # Numbers in the same row are always separated
+                if len(line) < side:
+                    line += "."
+            elif roll < 0.17:
+                line += rng.choice(SYMBOLS)
+            else:
+                line += "."
+        lines.append(line)
+    return "\n".join(lines) + "\n", dict()
@@ -1,13 +1,197 @@
 #!/usr/bin/env python
+import bisect
+import os
+import re
+import sys
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.graph import Graph
+from aoc.grid import Grid
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional, only needed by the numpy engine
+    np = None
+
+
+NUMBER = re.compile(rb"[0-9]+")
+SYMBOL = re.compile(rb"[^.0-9\n]")
+NO_LABEL = -1
+
+
+class Schematic:
+    """Numbers and symbols of a schematic, labelled in one pass over its grid.
+
+    Every digit cell holds the id of its number in labels, every symbol
+    cell its own id in symbol_ids (NO_LABEL elsewhere). The adjacency
+    graph links each symbol to the distinct numbers around it, so the
+    numbers next to a symbol are a slice of a flat array."""
+
+    def __init__(self, grid: Grid):
+        cells = grid.cells
+        stride = grid.stride
+        size = grid.size
+        self.grid = grid
+        self.values = array("q")
+        self.labels = array("i", [NO_LABEL]) * size
+        for match in NUMBER.finditer(cells):
+            start, end = match.span()
+            self.labels[start:end] = array("i", [len(self.values)]) * (end - start)
+            self.values.append(int(match.group()))
+
+        self.symbols = array("q")
+        self.symbol_ids = array("i", [NO_LABEL]) * size
+        labels = self.labels
+        offsets = (-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1)
+        edges = list()
+        for match in SYMBOL.finditer(cells):
+            index = match.start()
+            symbol = len(self.symbols)
+            self.symbols.append(index)
+            self.symbol_ids[index] = symbol
+            numbers = set()
+            for offset in offsets:
+                neighbour = index + offset
+                # Off the sides of a row lies a newline, never labelled
+                if 0 <= neighbour < size and labels[neighbour] != NO_LABEL:
+                    numbers.add(labels[neighbour])
+            edges.extend((symbol, number) for number in sorted(numbers))
+        self.adjacency = Graph.from_edges(len(self.symbols), edges)
+
+        self.is_part = bytearray(len(self.values))
+        for _, number in edges:
+            self.is_part[number] = 1
+
+    def get_adjacent_numbers(self, index: int) -> List[int]:
+        """Values of the numbers around the symbol at cell index."""
+        symbol = self.symbol_ids[index]
+        if symbol == NO_LABEL:
+            return list()
+        return [self.values[number] for number in self.adjacency.neighbours(symbol)]
+
+    def numbers_adjacent_to(self, character: bytes) -> Dict[int, List[int]]:
+        """Values of the numbers around each symbol character, by cell index."""
+        cells = self.grid.cells
+        code = character[0]
+        return {
+            index: self.get_adjacent_numbers(index)
+            for index in self.symbols
+            if cells[index] == code
+        }
+
+    def sum_part_numbers(self) -> int:
+        return sum(value for value, is_part in zip(self.values, self.is_part) if is_part)
+
+    def sum_gear_ratios(self) -> int:
+        result = 0
+        for numbers in self.numbers_adjacent_to(b"*").values():
+            if len(numbers) == 2:
+                result += numbers[0] * numbers[1]
+        return result
+
+
+class Row:
+    """A row of the schematic and the numbers on it, sorted by column."""
+    __slots__ = ("cells", "starts", "ends", "values")
+
+    def __init__(self, cells: bytes):
+        self.cells = cells
+        self.starts = list()
+        self.ends = list()
+        self.values = list()
+        for match in NUMBER.finditer(cells):
+            start, end = match.span()
+            self.starts.append(start)
+            self.ends.append(end)
+            self.values.append(int(match.group()))
+
+    def has_symbol(self, start: int, end: int) -> bool:
+        return SYMBOL.search(self.cells, max(0, start), end) is not None
+
+    def get_numbers_around(self, column: int) -> List[int]:
+        """Values of the numbers touching the columns from column - 1 to column + 1."""
+        numbers = list()
+        idx = bisect.bisect_right(self.starts, column + 1) - 1
+        while idx >= 0 and self.ends[idx] >= column:
+            numbers.append(self.values[idx])
+            idx -= 1
+        return numbers
+
+
+def _sum_middle_row(rows: List[Row]) -> Tuple[int, int]:
+    """Part numbers and gear ratios of the middle of three consecutive rows."""
+    _, row, _ = rows
+    neighbours = [item for item in rows if item is not None]
+    part_numbers = 0
+    for start, end, value in zip(row.starts, row.ends, row.values):
+        if any(item.has_symbol(start - 1, end + 1) for item in neighbours):
+            part_numbers += value
+    gear_ratios = 0
+    column = row.cells.find(b"*")
+    while column != -1:
+        numbers = [number for item in neighbours for number in item.get_numbers_around(column)]
+        if len(numbers) == 2:
+            gear_ratios += numbers[0] * numbers[1]
+        column = row.cells.find(b"*", column + 1)
+    return part_numbers, gear_ratios
+
 
 class Solver:
 
+    def __init__(self):
+        self.schematic = None
+
+    def parse(self, file):
+        self.schematic = Schematic(Grid.from_source(file))
+
+    def solve1(self):
+        return self.schematic.sum_part_numbers()
+
+    def solve2(self):
+        return self.schematic.sum_gear_ratios()
+
+    def stream(self, lines: Iterable[bytes | str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines, keeping three rows.
+
+        Each row is solved once it is in the middle of the window, with
+        the rows above and below it (None past the borders)."""
+        result1, result2 = 0, 0
+        window = [None, None, None]
+        for line in lines:
+            if isinstance(line, str):
+                line = line.encode()
+            line = line.rstrip(b"\r\n")
+            if len(line) == 0:
+                continue
+            window.append(Row(line))
+            del window[0]
+            if window[1] is not None:
+                part_numbers, gear_ratios = _sum_middle_row(window)
+                result1 += part_numbers
+                result2 += gear_ratios
+        window.append(None)
+        del window[0]
+        if window[1] is not None:
+            part_numbers, gear_ratios = _sum_middle_row(window)
+            result1 += part_numbers
+            result2 += gear_ratios
+        return result1, result2
+
+
+class ReferenceSolver:
+    """Scans the neighbourhood of every number for symbols."""
+
     def __init__(self):
         self.data = None
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 self.data.append(line)
@@ -35,12 +219,14 @@ class Solver:
 
     def get_adjacent_symbols(self, x, y_start, y_end):
         line_idx_start = max(0, y_start - 1)
-        line_idx_end = min(y_end, len(self.data) - 1)
+        line_idx_end = min(y_end, len(self.data[x]) - 1)
         if self.is_symbol(self.data[x][line_idx_start]):
             yield x, line_idx_start
         if self.is_symbol(self.data[x][line_idx_end]):
             yield x, line_idx_end
-        for data_idx in [max(0, x - 1), min(len(self.data) - 1, x + 1)]:
+        for data_idx in [x - 1, x + 1]:
+            if data_idx < 0 or data_idx >= len(self.data):
+                continue
             for line_idx in range(line_idx_start, line_idx_end + 1):
                 if self.is_symbol(self.data[data_idx][line_idx]):
                     yield data_idx, line_idx
@@ -86,6 +272,89 @@ class Solver:
         return result
 
 
+class NumpySolver:
+    """Finds the part numbers with array operations on the whole schematic:
+    a symbol mask dilated by shifted ORs, and the runs of digit cells."""
+
+    def __init__(self):
+        self.cells = None
+
+    def parse(self, file):
+        grid = Grid.from_source(file)
+        rows = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.stride)
+        # The newline column stays, as a separator that ends the digit runs of each row
+        self.cells = rows.copy()
+        self.cells[:, grid.width] = ord(".")
+
+    def _get_numbers(self):
+        """Values of the numbers and the flat indices of their digit cells, grouped by number."""
+        flat = self.cells.ravel()
+        is_digit = (flat >= ord("0")) & (flat <= ord("9"))
+        edges = np.diff(is_digit.astype(np.int8), prepend=np.int8(0))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts
+        digit_cells = np.flatnonzero(is_digit)
+        numbers = np.repeat(np.arange(len(starts)), lengths)
+        # Start of each number among the digit cells
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.intp)
+        if len(starts) == 0:
+            return np.zeros(0, dtype=np.int64), digit_cells, numbers, offsets
+        contributions = (flat[digit_cells].astype(np.int64) - ord("0")) * 10 ** (ends[numbers] - 1 - digit_cells)
+        return np.add.reduceat(contributions, offsets), digit_cells, numbers, offsets
+
+    def _get_padded(self, values, fill):
+        height, width = values.shape
+        padded = np.full((height + 2, width + 2), fill, dtype=values.dtype)
+        padded[1:-1, 1:-1] = values
+        return padded
+
+    def solve1(self):
+        cells = self.cells
+        height, width = cells.shape
+        is_digit = (cells >= ord("0")) & (cells <= ord("9"))
+        is_symbol = ~is_digit & (cells != ord("."))
+        padded = self._get_padded(is_symbol, False)
+        near_symbol = np.zeros_like(is_symbol)
+        for dy in range(3):
+            for dx in range(3):
+                near_symbol |= padded[dy:dy + height, dx:dx + width]
+        values, digit_cells, _, offsets = self._get_numbers()
+        if len(values) == 0:
+            return 0
+        is_part = np.logical_or.reduceat(near_symbol.ravel()[digit_cells], offsets)
+        return int(values[is_part].sum())
+
+    def solve2(self):
+        cells = self.cells
+        values, digit_cells, numbers, _ = self._get_numbers()
+        labels = np.full(cells.size, NO_LABEL, dtype=np.int64)
+        labels[digit_cells] = numbers
+        labels = self._get_padded(labels.reshape(cells.shape), NO_LABEL)
+        ys, xs = np.nonzero(cells == ord("*"))
+        around = np.stack([
+            labels[ys + 1 + dy, xs + 1 + dx]
+            for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy != 0 or dx != 0
+        ], axis=1)
+        around.sort(axis=1)
+        # Distinct numbers around each star: the first labelled one and every change after it
+        distinct = (around[:, 0] != NO_LABEL) + (around[:, 1:] != around[:, :-1]).sum(axis=1)
+        gears = around[distinct == 2]
+        if len(gears) == 0:
+            return 0
+        second = gears[:, -1]
+        first = np.where(gears == NO_LABEL, second[:, None], gears).min(axis=1)
+        return int((values[first] * values[second]).sum())
+
+
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+if np is not None:
+    ENGINES["numpy"] = NumpySolver
+
+
 def main():
     solver = Solver()
     solver.parse("input")
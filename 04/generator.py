@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """200 * size scratchcards with 10 winning numbers and 25 numbers each.
+
+    Matches never point past the last card."""
+    rng = random.Random(seed)
+    n_cards = max(1, int(200 * size))
+    lines = list()
+    matches = list()
+    for card in range(n_cards):
+        good = min(rng.choice([0, 0, 0, 1, 2, 3, 4, 5, 6, 8, 10]), n_cards - card - 1)
+        values = rng.sample(range(1, 100), 35 - good)
+        winning = values[:10]
+        numbers = winning[:good] + values[10:]
+        rng.shuffle(numbers)
+        rng.shuffle(winning)
+        lines.append("Card %3d: %s | %s" % (
+            card + 1,
+            " ".join("%2d" % value for value in winning),
+            " ".join("%2d" % value for value in numbers),
+        ))
+        matches.append(good)
+
+    total1 = sum(2 ** (good - 1) for good in matches if good > 0)
+    copies = [1] * n_cards
+    for card, good in enumerate(matches):
+        for other in range(card + 1, card + good + 1):
+            copies[other] += copies[card]
+    return "\n".join(lines) + "\n", {1: total1, 2: sum(copies)}
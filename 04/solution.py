@@ -1,25 +1,118 @@
 #!/usr/bin/env python
+import collections
+import os
+import sys
+from typing import Iterable, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+
+
+def _count_points(matches: Iterable[int]) -> Tuple[int, int]:
+    """Points and number of scratchcards, from the matches of each card.
+
+    The copies won by a card go to a range of the following ones, so they
+    are added to a difference array at both ends of the range: the copies
+    of a card are the running sum of the differences. Differences are only
+    kept for the next cards, at most as many as the winning numbers."""
+    points, cards = 0, 0
+    # Change of the won copies at each of the next cards, from the current one
+    differences = collections.deque()
+    won = 0
+    for good in matches:
+        if len(differences) > 0:
+            won += differences.popleft()
+        copies = 1 + won
+        cards += copies
+        if good > 0:
+            points += 1 << (good - 1)
+            while len(differences) < good + 1:
+                differences.append(0)
+            differences[0] += copies
+            differences[good] -= copies
+    return points, cards
+
 
 class Solver:
 
+    def __init__(self):
+        # Bitmask of the winning numbers and of the numbers of each card
+        self.winning = list()
+        self.numbers = list()
+        self.totals = None
+
+    @staticmethod
+    def _parse_line(line) -> Tuple[int, int]:
+        _, numbers_raw = line.strip().split(": ")
+        first_row, second_row = numbers_raw.split(" | ")
+        winning = 0
+        for number in first_row.split():
+            winning |= 1 << int(number)
+        numbers = 0
+        for number in second_row.split():
+            numbers |= 1 << int(number)
+        return winning, numbers
+
+    def parse(self, file):
+        self.winning = list()
+        self.numbers = list()
+        with inputs.open_text(file) as hand:
+            for line in hand:
+                winning, numbers = self._parse_line(line)
+                self.winning.append(winning)
+                self.numbers.append(numbers)
+
+    def get_totals(self) -> Tuple[int, int]:
+        if self.totals is None:
+            matches = ((winning & numbers).bit_count() for winning, numbers in zip(self.winning, self.numbers))
+            self.totals = _count_points(matches)
+        return self.totals
+
+    def solve1(self):
+        return self.get_totals()[0]
+
+    def solve2(self):
+        return self.get_totals()[1]
+
+    def stream(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines."""
+        return _count_points(
+            (winning & numbers).bit_count() for winning, numbers in map(self._parse_line, lines)
+        )
+
+
+class ReferenceSolver:
+    """Intersects the sets of numbers of each card, and adds the copies it
+    wins to each of the following cards one by one."""
+
     def __init__(self):
         self.data = None
 
+    @staticmethod
+    def _parse_line(line):
+        line = line.strip()
+        _, numbers_raw = line.split(": ")
+        first_row, second_row = numbers_raw.split(" | ")
+        first_numbers = list(map(int, first_row.split()))
+        second_numbers = list(map(int, second_row.split()))
+        return first_numbers, second_numbers
+
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
-                line = line.strip()
-                _, numbers_raw = line.split(": ")
-                first_row, second_row = numbers_raw.split(" | ")
-                first_numbers = list(map(int, first_row.split()))
-                second_numbers = list(map(int, second_row.split()))
-                self.data.append((first_numbers, second_numbers))
+                self.data.append(self._parse_line(line))
+
+    @staticmethod
+    def count_matches(scratchcard):
+        winning_numbers, numbers_in_card = scratchcard
+        return len(set(numbers_in_card) & set(winning_numbers))
 
     def solve1(self):
         result = 0
-        for winning_numbers, numbers_in_card in self.data:
-            good = len(set(numbers_in_card) & set(winning_numbers))
+        for scratchcard in self.data:
+            good = self.count_matches(scratchcard)
             if good > 0:
                 result += 2 ** (good - 1)
         return result
@@ -27,12 +120,38 @@ class Solver:
     def solve2(self):
         scratchcards = [1] * len(self.data)
         for i, scratchcard in enumerate(self.data):
-            winning_numbers, numbers_in_card = scratchcard
-            good = len(set(numbers_in_card) & set(winning_numbers))
+            good = self.count_matches(scratchcard)
             for j in range(i, i + good):
                 scratchcards[j + 1] += scratchcards[i]
         return sum(scratchcards)
 
+    def stream(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines.
+
+        The copies won by a card only go to the following ones, so only
+        the copies of the next cards, at most as many as the winning
+        numbers, are kept."""
+        result1, result2 = 0, 0
+        # Copies won so far by each of the next cards
+        next_copies = collections.deque()
+        for line in lines:
+            good = self.count_matches(self._parse_line(line))
+            if good > 0:
+                result1 += 2 ** (good - 1)
+            copies = 1 + (next_copies.popleft() if len(next_copies) > 0 else 0)
+            result2 += copies
+            while len(next_copies) < good:
+                next_copies.append(0)
+            for j in range(good):
+                next_copies[j] += copies
+        return result1, result2
+
+
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
 
 def main():
     solver = Solver()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+import random
+
+CATEGORIES = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+MAX_VALUE = 2 ** 32
+
+# Expected growth of each phase, as an exponent of size
+# Splitting seed ranges may yield up to seeds * ranges ranges
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 2}
+
+
+def _random_cuts(rng, n_cuts):
+    return sorted(rng.sample(range(1, MAX_VALUE), n_cuts))
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Almanac with 10 * size seed ranges and 40 * size ranges per map.
+
+    The source ranges of a map never overlap, as the solver expects."""
+    rng = random.Random(seed)
+    n_seeds = max(1, int(10 * size))
+    n_ranges = max(1, int(40 * size))
+
+    seeds = list()
+    for start in _random_cuts(rng, n_seeds):
+        seeds.append((start, rng.randint(1, MAX_VALUE // (8 * n_seeds))))
+    rng.shuffle(seeds)
+    sections = ["seeds: " + " ".join("%d %d" % seed_range for seed_range in seeds)]
+
+    for source, target in zip(CATEGORIES, CATEGORIES[1:]):
+        cuts = [0] + _random_cuts(rng, 2 * n_ranges) + [MAX_VALUE]
+        lines = list()
+        for i in range(0, len(cuts) - 1, 2):
+            s_start = cuts[i]
+            v_range = cuts[i + 1] - s_start
+            d_start = rng.randint(0, MAX_VALUE - v_range)
+            lines.append("%d %d %d" % (d_start, s_start, v_range))
+        rng.shuffle(lines)
+        sections.append("\n".join(["%s-to-%s map:" % (source, target)] + lines))
+    return "\n\n".join(sections) + "\n", dict()
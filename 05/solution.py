@@ -1,6 +1,13 @@
 #!/usr/bin/env python
 import bisect
 import collections
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.intervals import IntervalSet
 
 
 class Solver:
@@ -10,7 +17,7 @@ class Solver:
         self.maps = dict()
 
     def parse(self, file):
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             seeds_line = next(hand)
             seeds_line = seeds_line.strip().split(": ")[1]
             self.seeds = list(map(int, seeds_line.split(" ")))
@@ -60,6 +67,33 @@ class Solver:
                 lowest_result = min(lowest_result, source_value)
         return lowest_result
 
+    def solve2(self):
+        ranges = IntervalSet()
+        for i in range(len(self.seeds) // 2):
+            start, r_range = self.seeds[2 * i], self.seeds[2 * i + 1]
+            ranges.add(start, start + r_range)
+        source = "seed"
+        while source != "location":
+            target, values = self.maps[source]
+            new_ranges = IntervalSet()
+            for d_start, s_start, v_range in values:
+                s_end = s_start + v_range
+                moved = ranges.clip(s_start, s_end).shift(d_start - s_start)
+                ranges.remove(s_start, s_end)
+                for start, end in moved:
+                    new_ranges.add(start, end)
+            # Values outside of every range map to themselves
+            for start, end in ranges:
+                new_ranges.add(start, end)
+            source = target
+            ranges = new_ranges
+        return ranges.min()
+
+
+class ReferenceSolver(Solver):
+    """Maps the seed ranges with a bisect over the sorted map ranges, the
+    original algorithm, fixed for the ranges that start in a gap."""
+
     def solve2(self):
         ranges = collections.deque()
         for i in range(len(self.seeds) // 2):
@@ -72,16 +106,20 @@ class Solver:
             while len(ranges) > 0:
                 current_start, current_range = ranges.pop()
                 idx = bisect.bisect_right(values, current_start, key=lambda el: el[1]) - 1
-                if idx < 0:
-                    new_ranges.append((current_start, current_range))
+                current_end = current_start + current_range
+                if idx < 0 or values[idx][1] + values[idx][2] <= current_start:
+                    # In a gap between map ranges: unmapped up to the next map range, if it reaches it
+                    # (the original code left the whole range unmapped)
+                    if idx + 1 < len(values) and values[idx + 1][1] < current_end:
+                        gap = values[idx + 1][1] - current_start
+                        new_ranges.append((current_start, gap))
+                        ranges.append((current_start + gap, current_range - gap))
+                    else:
+                        new_ranges.append((current_start, current_range))
                     continue
                 # s_start <= current_start < current_end
                 d_start, s_start, v_range = values[idx]
                 s_end = s_start + v_range
-                current_end = current_start + current_range
-                if s_end <= current_start:
-                    new_ranges.append((current_start, current_range))
-                    continue
                 # s_start <= current_start < s_end
                 start_delta = current_start - s_start
                 if current_end <= s_end:
@@ -96,6 +134,12 @@ class Solver:
         return min(map(lambda el: el[0], ranges))
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+# Closed form: size only makes the numbers bigger
+GROWTH = {"parse": 0, "solve1": 0, "solve2": 0}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Four races whose durations grow linearly with size.
+
+    Every record can be beaten, so both parts always have an answer."""
+    rng = random.Random(seed)
+    times = list()
+    distances = list()
+    for _ in range(4):
+        duration = rng.randint(int(7 * size) + 7, int(100 * size) + 7)
+        best = (duration // 2) * (duration - duration // 2)
+        times.append(duration)
+        distances.append(rng.randint(best // 4, best - 1))
+    lines = [
+        "Time:      " + "  ".join("%4d" % value for value in times),
+        "Distance:  " + "  ".join("%4d" % value for value in distances),
+    ]
+    return "\n".join(lines) + "\n", dict()
@@ -1,5 +1,11 @@
 #!/usr/bin/env python
 import math
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
 
 
 class Solver:
@@ -9,7 +15,7 @@ class Solver:
         self.distances = None
 
     def parse(self, file):
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             time_raw = hand.readline()[len("Time:"):].strip()
             distance_raw = hand.readline()[len("Distance:"):].strip()
             self.times = list(map(int, time_raw.split()))
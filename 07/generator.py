@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+import random
+
+CARDS = "AKQJT98765432"
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """1000 * size hands with random bids."""
+    rng = random.Random(seed)
+    lines = list()
+    for _ in range(max(1, int(1000 * size))):
+        # Draw from a few card values now and then, to get all hand types
+        pool = CARDS if rng.random() < 0.5 else rng.sample(CARDS, rng.randint(1, 4))
+        cards = "".join(rng.choice(pool) for _ in range(5))
+        lines.append("%s %d" % (cards, rng.randint(1, 1000)))
+    return "\n".join(lines) + "\n", dict()
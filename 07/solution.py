@@ -1,8 +1,14 @@
 #!/usr/bin/env python
-
+import os
+import sys
 from collections import Counter
 from typing import List
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+
+
 CARDS = "AKQJT98765432"
 CARDS_TO_VALUE = {card: -idx for idx, card in enumerate(CARDS)}
 
@@ -94,6 +100,7 @@ def get_hand_type_joking(cards: str) -> int:
 
 
 class CardHand:
+    __slots__ = ("cards", "hand_type")
 
     def __init__(self, cards: List[int], hand_type: int):
         self.cards = cards
@@ -126,7 +133,7 @@ class Solver:
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip().split(" ")
                 cards, bid = line
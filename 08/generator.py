@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+import math
+import random
+import string
+
+MULTIPLIERS = [2, 3, 5, 7, 11, 13]
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _get_name(idx: int) -> str:
+    # Inner nodes never end with A or Z, so they are never starts or ends
+    last = string.ascii_uppercase[1:-1]
+    name = last[idx % len(last)]
+    idx //= len(last)
+    for _ in range(2):
+        name = string.ascii_uppercase[idx % 26] + name
+        idx //= 26
+    while idx > 0:
+        name = string.ascii_uppercase[idx % 26] + name
+        idx //= 26
+    return name
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Six ghost loops over instructions of length 31 * size.
+
+    Each ghost walks a chain of m * L nodes whose last node ends with Z
+    and loops back onto the start's successors, so the first Z is reached
+    after m * L steps and then again every m * L steps."""
+    rng = random.Random(seed)
+    length = max(1, int(31 * size))
+    steps = "".join(rng.choice("LR") for _ in range(length))
+
+    nodes = dict()
+    # Skip the names starting with AA, reserved to AAA and ZZZ
+    counter = 24
+    starts = list()
+    for ghost, multiplier in enumerate(MULTIPLIERS):
+        if ghost == 0:
+            start, end = "AAA", "ZZZ"
+        else:
+            # One block of names per ghost, so that no two ghosts share a prefix
+            prefix = _get_name(len(string.ascii_uppercase[1:-1]) * ghost)[:-1]
+            start, end = prefix + "A", prefix + "Z"
+        chain = list()
+        for _ in range(multiplier * length - 1):
+            chain.append(_get_name(counter))
+            counter += 1
+        chain.append(end)
+        starts.append((start, chain))
+
+    all_chain_nodes = [node for _, chain in starts for node in chain]
+    for start, chain in starts:
+        # Node chain[i] is reached after i + 1 steps and leaves with steps[i + 1]
+        for i, node in enumerate(chain):
+            following = chain[(i + 1) % len(chain)]
+            decoy = rng.choice(all_chain_nodes)
+            if steps[(i + 1) % length] == "L":
+                nodes[node] = (following, decoy)
+            else:
+                nodes[node] = (decoy, following)
+        decoy = rng.choice(all_chain_nodes)
+        if steps[0] == "L":
+            nodes[start] = (chain[0], decoy)
+        else:
+            nodes[start] = (decoy, chain[0])
+
+    items = list(nodes.items())
+    rng.shuffle(items)
+    lines = [steps, ""]
+    for node, (left, right) in items:
+        lines.append("%s = (%s, %s)" % (node, left, right))
+    periods = [multiplier * length for multiplier in MULTIPLIERS]
+    return "\n".join(lines) + "\n", {1: periods[0], 2: math.lcm(*periods)}
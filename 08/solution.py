@@ -1,16 +1,73 @@
 #!/usr/bin/env python
 import math
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.graph import Graph, NodeIndex
 
 
 class Solver:
 
     def __init__(self):
-        self.steps = None
-        self.data = None
+        self.turns = None
+        self.nodes = None
+        self.graph = None
+
+    def parse(self, file):
+        self.nodes = NodeIndex()
+        edges = list()
+        with inputs.open_text(file) as hand:
+            # Index of the edge to follow at each step: 0 for left, 1 for right
+            self.turns = [0 if step == "L" else 1 for step in hand.readline().strip()]
+            hand.readline()
+            for line in hand:
+                line = line.strip().split(" = ")
+                source, targets_raw = line
+                left, right = targets_raw[1:-1].split(", ")
+                source = self.nodes.add(source)
+                edges.append((source, self.nodes.add(left)))
+                edges.append((source, self.nodes.add(right)))
+        self.graph = Graph.from_edges(len(self.nodes), edges)
+
+    def _walk(self, location: int, is_end) -> int:
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        turns = self.turns
+        n_turns = len(turns)
+        steps_done = 0
+        while not is_end[location]:
+            location = targets[offsets[location] + turns[steps_done % n_turns]]
+            steps_done += 1
+        return steps_done
+
+    def solve1(self):
+        is_end = [False] * len(self.nodes)
+        is_end[self.nodes["ZZZ"]] = True
+        return self._walk(self.nodes["AAA"], is_end)
+
+    def _get_location_periods(self, location: int, is_end) -> int:
+        if is_end[location]:
+            return 0
+        return self._walk(location, is_end)
+
+    def solve2(self):
+        is_end = [name.endswith("Z") for name in self.nodes.names]
+        periods = list()
+        for node, name in enumerate(self.nodes.names):
+            if name.endswith("A"):
+                periods.append(self._get_location_periods(node, is_end))
+        return math.lcm(*periods)
+
+
+class ReferenceSolver(Solver):
+    """Walks a dict of node names, the original algorithm."""
 
     def parse(self, file):
         self.data = dict()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             self.steps = hand.readline().strip()
             hand.readline()
             for line in hand:
@@ -55,6 +112,12 @@ class Solver:
         return math.lcm(*periods)
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _get_differences(values):
+    return [b - a for a, b in zip(values, values[1:])]
+
+
+def _is_well_formed(values):
+    # The solver stops at the first level whose two last values are equal
+    # (part 1) or whose two first values are zero (part 2)
+    while any(value != values[0] for value in values):
+        if values[-1] == values[-2] or (values[0] == 0 and values[1] == 0):
+            return False
+        values = _get_differences(values)
+    return True
+
+
+def generate(size: float = 1, seed: int = 0):
+    """200 * size histories of 21 values sampled from random polynomials."""
+    rng = random.Random(seed)
+    lines = list()
+    total1 = 0
+    total2 = 0
+    while len(lines) < max(1, int(200 * size)):
+        degree = rng.randint(1, 10)
+        coefficients = [rng.randint(-9, 9) for _ in range(degree + 1)]
+
+        def poly(x):
+            return sum(c * x ** i for i, c in enumerate(coefficients))
+
+        values = [poly(x) for x in range(21)]
+        if not _is_well_formed(values):
+            continue
+        lines.append(" ".join(map(str, values)))
+        total1 += poly(21)
+        total2 += poly(-1)
+    return "\n".join(lines) + "\n", {1: total1, 2: total2}
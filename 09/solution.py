@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 import functools
-from typing import List
+import os
+import sys
+from typing import Iterable, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
 
 
 class HistorySolver:
@@ -73,7 +79,7 @@ class Solver:
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 values = line.strip().split(" ")
                 self.data.append(list(map(int, values)))
@@ -94,6 +100,15 @@ class Solver:
             result += res
         return result
 
+    def stream(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines."""
+        result1, result2 = 0, 0
+        for line in lines:
+            values = list(map(int, line.strip().split(" ")))
+            result1 += HistorySolver(values).solve()
+            result2 += HistorySolver2(values).solve()
+        return result1, result2
+
 
 def main():
     solver = Solver()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+import random
+
+SCALE = 2
+MARGIN = 1
+
+DIRECTIONS_TO_PIPE = {
+    frozenset({(-1, 0), (1, 0)}): "|",
+    frozenset({(0, -1), (0, 1)}): "-",
+    frozenset({(-1, 0), (0, 1)}): "L",
+    frozenset({(-1, 0), (0, -1)}): "J",
+    frozenset({(1, 0), (0, -1)}): "7",
+    frozenset({(1, 0), (0, 1)}): "F",
+}
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _get_columns(rng, width, height):
+    # Each column is an interval of rows overlapping the previous one, so
+    # the union is a simply connected polyomino whose border is a simple loop
+    top, bottom = height // 3, 2 * height // 3
+    jump = max(1, height // 4)
+    columns = list()
+    for _ in range(width):
+        while True:
+            new_top = min(max(0, top + rng.randint(-jump, jump)), height - 1)
+            new_bottom = min(max(1, bottom + rng.randint(-jump, jump)), height)
+            if new_top < new_bottom and max(top, new_top) < min(bottom, new_bottom):
+                break
+        top, bottom = new_top, new_bottom
+        columns.append((top, bottom))
+    return columns
+
+
+def _get_loop(columns):
+    corners = list()
+    for j, (top, _) in enumerate(columns):
+        corners.append((top, j))
+        corners.append((top, j + 1))
+    for j in range(len(columns) - 1, -1, -1):
+        _, bottom = columns[j]
+        corners.append((bottom, j + 1))
+        corners.append((bottom, j))
+    corners = [(y * SCALE + MARGIN, x * SCALE + MARGIN) for y, x in corners]
+
+    loop = list()
+    for i, (y, x) in enumerate(corners):
+        next_y, next_x = corners[(i + 1) % len(corners)]
+        dy = (next_y > y) - (next_y < y)
+        dx = (next_x > x) - (next_x < x)
+        while (y, x) != (next_y, next_x):
+            loop.append((y, x))
+            y, x = y + dy, x + dx
+    return loop
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Pipe maze of side about 140 * sqrt(size) with a single big loop.
+
+    The loop is the border of a random column-convex shape, drawn on a
+    doubled grid; every other tile is filled with junk pipes."""
+    rng = random.Random(seed)
+    coarse = max(2, int(70 * size ** 0.5))
+    columns = _get_columns(rng, coarse, coarse)
+    loop = _get_loop(columns)
+
+    side = coarse * SCALE + 2 * MARGIN + 1
+    grid = [[rng.choice("|-LJ7F..") for _ in range(side)] for _ in range(side)]
+    for i, (y, x) in enumerate(loop):
+        prev_y, prev_x = loop[i - 1]
+        next_y, next_x = loop[(i + 1) % len(loop)]
+        directions = frozenset({(prev_y - y, prev_x - x), (next_y - y, next_x - x)})
+        grid[y][x] = DIRECTIONS_TO_PIPE[directions]
+
+    # Junk next to the start must not look connected to it
+    start_y, start_x = rng.choice(loop)
+    grid[start_y][start_x] = "S"
+    loop_set = set(loop)
+    for dy, dx in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        if (start_y + dy, start_x + dx) not in loop_set:
+            grid[start_y + dy][start_x + dx] = "."
+
+    # Pick's theorem gives the tiles strictly inside the loop
+    area = SCALE ** 2 * sum(bottom - top for top, bottom in columns)
+    inside = area - len(loop) // 2 + 1
+    content = "\n".join("".join(line) for line in grid) + "\n"
+    return content, {1: len(loop) // 2, 2: inside}
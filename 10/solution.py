@@ -1,20 +1,51 @@
 #!/usr/bin/env python
+import os
+import sys
 
-POINT_START = "S"
-POINT_GROUND = "."
-PIPE_NORTH_SOUTH = "|"
-PIPE_EAST_WEST = "-"
-PIPE_NORTH_EAST = "L"
-PIPE_NORTH_WEST = "J"
-PIPE_SOUTH_WEST = "7"
-PIPE_SOUTH_EAST = "F"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from aoc import inputs
+from aoc.grid import Grid, NEWLINE
+
+POINT_START = ord("S")
+POINT_GROUND = ord(".")
+
+# Points are cell indices of the grid and directions are offsets between
+# them, named after the attributes of Grid
+PIPE_TO_DIRECTIONS = {
+    "|": ("up", "down"),
+    "-": ("right", "left"),
+    "L": ("up", "right"),
+    "J": ("up", "left"),
+    "7": ("down", "left"),
+    "F": ("down", "right")
+}
+
+
+def get_direction_wrt(x, y):
+    return x - y
+
+
+def get_point_at(point, direction):
+    return point + direction
+
+
+def get_opposite(direction):
+    return -direction
+
+
+def is_orthogonal(v1, v2):
+    # Vertical offsets are a multiple of the stride, horizontal ones are 1
+    return abs(v1) != abs(v2)
+
+
+# The reference engine keeps the original (y, x) points and directions
 WEST = (0, -1)
 EAST = (0, 1)
 NORTH = (-1, 0)
 SOUTH = (1, 0)
 
-PIPE_TO_DIRECTIONS = {
+PIPE_TO_YX_DIRECTIONS = {
     "|": (NORTH, SOUTH),
     "-": (EAST, WEST),
     "L": (NORTH, EAST),
@@ -24,19 +55,19 @@ PIPE_TO_DIRECTIONS = {
 }
 
 
-def get_direction_wrt(x, y):
+def get_yx_direction_wrt(x, y):
     return x[0] - y[0], x[1] - y[1]
 
 
-def get_point_at(point, direction):
+def get_yx_point_at(point, direction):
     return point[0] + direction[0], point[1] + direction[1]
 
 
-def get_opposite(direction):
+def get_yx_opposite(direction):
     return -1 * direction[0], -1 * direction[1]
 
 
-def is_orthogonal(v1, v2):
+def is_yx_orthogonal(v1, v2):
     ps = v1[0] * v2[0] + v1[1] * v2[1]
     return ps == 0
 
@@ -44,22 +75,33 @@ def is_orthogonal(v1, v2):
 def rotate_right(v):
     return -v[1], v[0]
 
+
 def rotate_left(v):
     return v[1], -v[0]
 
+
 class Navigator:
 
-    def __init__(self, data):
-        self.data = data
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.pipe_to_directions = {
+            ord(pipe): (getattr(grid, first), getattr(grid, second))
+            for pipe, (first, second) in PIPE_TO_DIRECTIONS.items()
+        }
+
+    def get_pipe(self, point):
+        if point < 0 or point >= self.grid.size or self.grid.cells[point] == NEWLINE:
+            return None
+        return self.grid.cells[point]
 
     def _go_along(self, point, direction):
         prev = point
         current = get_point_at(point, direction)
-        pipe_type = self.data.get(current)
+        pipe_type = self.get_pipe(current)
         if pipe_type is None or pipe_type == POINT_START or pipe_type == POINT_GROUND:
             return None
         incoming_direction = get_direction_wrt(prev, current)
-        exit_directions = PIPE_TO_DIRECTIONS.get(pipe_type)
+        exit_directions = self.pipe_to_directions.get(pipe_type)
 
         if incoming_direction == exit_directions[0]:
             exit_direction = exit_directions[1]
@@ -70,12 +112,12 @@ class Navigator:
 
     def get_pipes_connected_to_start(self, start):
         possible_directions = list()
-        for direction in [NORTH, SOUTH, EAST, WEST]:
+        for direction in [self.grid.up, self.grid.down, self.grid.right, self.grid.left]:
             candidate = get_point_at(start, direction)
-            pipe_type = self.data.get(candidate)
-            if pipe_type not in PIPE_TO_DIRECTIONS:
+            pipe_type = self.get_pipe(candidate)
+            if pipe_type not in self.pipe_to_directions:
                 continue
-            valid_directions = PIPE_TO_DIRECTIONS[pipe_type]
+            valid_directions = self.pipe_to_directions[pipe_type]
             if get_opposite(direction) in valid_directions:
                 target = get_direction_wrt(candidate, start)
                 possible_directions.append(target)
@@ -115,32 +157,141 @@ class Navigator:
 class Solver:
 
     def __init__(self):
-        self.data = None
+        self.grid = None
         self.start = None
-        self.max_x = -1
-        self.max_y = -1
+
+    def parse(self, file):
+        self.grid = Grid.from_source(file)
+        self.start = self.grid.find(b"S")
+
+    def solve1(self):
+        navigator = Navigator(self.grid)
+        distance = 0
+        for _ in navigator.navigate_loop(self.start):
+            distance += 1
+        return distance
+
+    def solve2(self):
+        navigator = Navigator(self.grid)
+        loop = navigator.get_loop(self.start)
+        loop_set = set(loop)
+        up, down, left, right = self.grid.up, self.grid.down, self.grid.left, self.grid.right
+        rotations_right = {up: left, left: down, down: right, right: up}
+        rotations_left = {up: right, right: down, down: left, left: up}
+
+        # The first point of the loop in reading order is entered from the left
+        first_point = min(loop_set)
+        start_idx = loop.index(first_point)
+        inside_direction = right
+
+        # Get direction orthogonal to inside_direction
+        direction = 1
+        current_point = loop[start_idx]
+        next_point = loop[(start_idx + direction) % len(loop)]
+        loop_direction = get_direction_wrt(next_point, current_point)
+        if not is_orthogonal(loop_direction, inside_direction):
+            direction = -1
+            next_point = loop[(start_idx + direction) % len(loop)]
+            loop_direction = get_direction_wrt(next_point, current_point)
+            #print("Next v2", next_point, inside_direction)
+
+        inside_points = set()
+        for dx in range(len(loop)):
+            current_point = loop[(start_idx + direction * dx) % len(loop)]
+            #print(current_point, self.grid.cells[current_point])
+            inside_point = get_point_at(current_point, inside_direction)
+            if inside_point not in loop_set:
+                inside_points.add(inside_point)
+
+            next_point = loop[(start_idx + direction * (dx + 1)) % len(loop)]
+            next_loop_direction = get_direction_wrt(next_point, current_point)
+            if next_loop_direction != loop_direction:
+                # Rotate
+                if next_loop_direction == rotations_right[loop_direction]:
+                    inside_direction = rotations_right[inside_direction]
+                else:
+                    inside_direction = rotations_left[inside_direction]
+                inside_point = get_point_at(current_point, inside_direction)
+                if inside_point not in loop_set:
+                    inside_points.add(inside_point)
+                # Go along
+                loop_direction = next_loop_direction
+
+
+        actual_inside = set()
+        border = inside_points
+        while len(border) > 0:
+            point = border.pop()
+            actual_inside.add(point)
+            for new_point in self.grid.neighbours(point):
+                if new_point not in loop_set and new_point not in actual_inside:
+                    border.add(new_point)
+
+        return len(actual_inside)
+
+
+class ReferenceNavigator(Navigator):
+    """Navigator over a dict of (y, x) points, the original one."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def _go_along(self, point, direction):
+        prev = point
+        current = get_yx_point_at(point, direction)
+        pipe_type = self.data.get(current)
+        if pipe_type is None or pipe_type == "S" or pipe_type == ".":
+            return None
+        incoming_direction = get_yx_direction_wrt(prev, current)
+        exit_directions = PIPE_TO_YX_DIRECTIONS.get(pipe_type)
+
+        if incoming_direction == exit_directions[0]:
+            exit_direction = exit_directions[1]
+        else:
+            exit_direction = exit_directions[0]
+
+        return current, exit_direction
+
+    def get_pipes_connected_to_start(self, start):
+        possible_directions = list()
+        for direction in [NORTH, SOUTH, EAST, WEST]:
+            candidate = get_yx_point_at(start, direction)
+            pipe_type = self.data.get(candidate)
+            if pipe_type not in PIPE_TO_YX_DIRECTIONS:
+                continue
+            valid_directions = PIPE_TO_YX_DIRECTIONS[pipe_type]
+            if get_yx_opposite(direction) in valid_directions:
+                target = get_yx_direction_wrt(candidate, start)
+                possible_directions.append(target)
+        return possible_directions
+
+
+class ReferenceSolver(Solver):
+    """Walks a dict of (y, x) points, the original algorithm."""
 
     def parse(self, file):
         self.data = dict()
-        with open(file) as hand:
+        self.max_x = -1
+        self.max_y = -1
+        with inputs.open_text(file) as hand:
             for y, line in enumerate(hand):
                 line = line.strip()
                 self.max_y = max(self.max_y, y)
                 self.max_x = len(line) - 1
                 for x, el in enumerate(line):
                     self.data[(y, x)] = el
-                    if el == POINT_START:
+                    if el == "S":
                         self.start = (y, x)
 
     def solve1(self):
-        navigator = Navigator(self.data)
+        navigator = ReferenceNavigator(self.data)
         distance = 0
         for _ in navigator.navigate_loop(self.start):
             distance += 1
         return distance
 
     def solve2(self):
-        navigator = Navigator(self.data)
+        navigator = ReferenceNavigator(self.data)
         loop = navigator.get_loop(self.start)
         loop_set = set(loop)
 
@@ -151,8 +302,8 @@ class Solver:
             for x in range(self.max_x + 1):
                 if (y, x) in loop_set:
                     start_idx = loop.index((y, x))
-                    outside_direction = get_direction_wrt(prev, (y, x))
-                    inside_direction = get_opposite(outside_direction)
+                    outside_direction = get_yx_direction_wrt(prev, (y, x))
+                    inside_direction = get_yx_opposite(outside_direction)
                     break
                 prev = (y, x)
             if start_idx is not None:
@@ -162,43 +313,40 @@ class Solver:
         direction = 1
         current_point = loop[start_idx]
         next_point = loop[(start_idx + direction) % len(loop)]
-        loop_direction = get_direction_wrt(next_point, current_point)
-        if not is_orthogonal(loop_direction, inside_direction):
+        loop_direction = get_yx_direction_wrt(next_point, current_point)
+        if not is_yx_orthogonal(loop_direction, inside_direction):
             direction = -1
             next_point = loop[(start_idx + direction) % len(loop)]
-            loop_direction = get_direction_wrt(next_point, current_point)
-            #print("Next v2", next_point, inside_direction)
+            loop_direction = get_yx_direction_wrt(next_point, current_point)
 
         inside_points = set()
         for dx in range(len(loop)):
             current_point = loop[(start_idx + direction * dx) % len(loop)]
-            #print(current_point, self.data[current_point])
-            inside_point = get_point_at(current_point, inside_direction)
+            inside_point = get_yx_point_at(current_point, inside_direction)
             if inside_point not in loop_set:
                 inside_points.add(inside_point)
 
             next_point = loop[(start_idx + direction * (dx + 1)) % len(loop)]
-            next_loop_direction = get_direction_wrt(next_point, current_point)
+            next_loop_direction = get_yx_direction_wrt(next_point, current_point)
             if next_loop_direction != loop_direction:
                 # Rotate
                 if next_loop_direction == rotate_right(loop_direction):
                     inside_direction = rotate_right(inside_direction)
                 else:
                     inside_direction = rotate_left(inside_direction)
-                inside_point = get_point_at(current_point, inside_direction)
+                inside_point = get_yx_point_at(current_point, inside_direction)
                 if inside_point not in loop_set:
                     inside_points.add(inside_point)
                 # Go along
                 loop_direction = next_loop_direction
 
-
         actual_inside = set()
         border = inside_points
         while len(border) > 0:
             point = border.pop()
             actual_inside.add(point)
             for direction in [NORTH, SOUTH, WEST, EAST]:
-                new_point = get_point_at(point, direction)
+                new_point = get_yx_point_at(point, direction)
                 if self.data.get(new_point) is None:
                     continue
                 if new_point not in loop_set and new_point not in actual_inside:
@@ -207,6 +355,10 @@ class Solver:
         return len(actual_inside)
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
 
 
 def main():
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+# Pairwise distances can be summed in linear time after sorting
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _sum_distances(coordinates, rate):
+    # Sum of pairwise distances on one axis after the expansion of empty lines
+    occupied = set(coordinates)
+    expanded = dict()
+    shift = 0
+    for value in range(max(coordinates) + 1):
+        if value not in occupied:
+            shift += rate - 1
+        expanded[value] = value + shift
+    values = sorted(expanded[value] for value in coordinates)
+    total = 0
+    prefix = 0
+    for i, value in enumerate(values):
+        total += i * value - prefix
+        prefix += value
+    return total
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Galaxy image of side 140 * sqrt(size) with about 2% galaxies.
+
+    A few rows and columns are kept empty so that they get expanded."""
+    rng = random.Random(seed)
+    side = max(2, int(140 * size ** 0.5))
+    empty_rows = set(rng.sample(range(side), side // 15))
+    empty_columns = set(rng.sample(range(side), side // 15))
+    galaxies = list()
+    lines = list()
+    for y in range(side):
+        line = ""
+        for x in range(side):
+            if y not in empty_rows and x not in empty_columns and rng.random() < 0.02:
+                line += "#"
+                galaxies.append((x, y))
+            else:
+                line += "."
+        lines.append(line)
+
+    answers = dict()
+    if len(galaxies) > 0:
+        xs = [x for x, _ in galaxies]
+        ys = [y for _, y in galaxies]
+        for part, rate in [(1, 2), (2, 1000000)]:
+            answers[part] = _sum_distances(xs, rate) + _sum_distances(ys, rate)
+    return "\n".join(lines) + "\n", answers
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """1000 * size condition records built from a valid arrangement.
+
+    Each record starts from a random arrangement of its groups, then part
+    of the springs are hidden behind a question mark."""
+    rng = random.Random(seed)
+    lines = list()
+    for _ in range(max(1, int(1000 * size))):
+        groups = [rng.randint(1, 6) for _ in range(rng.randint(1, 6))]
+        springs = "." * rng.randint(0, 3)
+        for i, group in enumerate(groups):
+            springs += "#" * group
+            if i < len(groups) - 1:
+                springs += "." * rng.randint(1, 3)
+        springs += "." * rng.randint(0, 3)
+        hidden = "".join(
+            "?" if rng.random() < 0.5 else spring
+            for spring in springs
+        )
+        lines.append("%s %s" % (hidden, ",".join(map(str, groups))))
+    return "\n".join(lines) + "\n", dict()
@@ -1,5 +1,12 @@
 #!/usr/bin/env python
 import functools
+import os
+import sys
+from typing import Iterable, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
 
 
 class SpringGroup:
@@ -34,14 +41,24 @@ class Solver:
     def __init__(self):
         self.data = None
 
+    @staticmethod
+    def _parse_line(line):
+        line = line.strip()
+        springs, groups_str = line.split(" ")
+        groups = tuple(map(int, groups_str.split(",")))
+        return springs, groups
+
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
-                line = line.strip()
-                springs, groups_str = line.split(" ")
-                groups = tuple(map(int, groups_str.split(",")))
-                self.data.append((springs, groups))
+                self.data.append(self._parse_line(line))
+
+    @staticmethod
+    def count_unfolded(springs, groups):
+        springs = "?".join([springs] * 5)
+        groups = groups * 5
+        return SpringGroup(springs, groups).count_arrangements()
 
     def solve1(self):
         result = 0
@@ -55,12 +72,20 @@ class Solver:
         result = 0
         for spring_line in self.data:
             springs, groups = spring_line
-            springs = "?".join([springs] * 5)
-            groups = groups * 5
-            counter = SpringGroup(springs, groups)
-            result += counter.count_arrangements()
+            result += self.count_unfolded(springs, groups)
         return result
 
+    def stream(self, lines: Iterable[str]) -> Tuple[int, int]:
+        """Solve both parts in a single pass over the lines."""
+        result1, result2 = 0, 0
+        for line in lines:
+            springs, groups = self._parse_line(line)
+            result1 += SpringGroup(springs, groups).count_arrangements()
+            result2 += self.count_unfolded(springs, groups)
+            # The cache is shared by all the groups, drop the entries of this line
+            SpringGroup.count_arrangements.cache_clear()
+        return result1, result2
+
 
 def main():
     solver = Solver()
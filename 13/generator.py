@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _mirror_length(length, split):
+    return min(split + 1, length - split - 1)
+
+
+def _make_pattern(rng):
+    height = rng.randint(5, 17)
+    width = rng.randint(5, 17)
+    # Exact vertical reflection after column split_v, smudged horizontal
+    # reflection after row split_h; the vertical mirror never reaches the
+    # right border, leaving room for the smudge
+    split_v = rng.randint(0, (width - 3) // 2)
+    split_h = rng.randint(0, height - 2)
+    reach_v = _mirror_length(width, split_v)
+    reach_h = _mirror_length(height, split_h)
+
+    grid = [[rng.choice("#.") for _ in range(width)] for _ in range(height)]
+    for row in grid:
+        for k in range(reach_v):
+            row[split_v + 1 + k] = row[split_v - k]
+    for k in range(reach_h):
+        grid[split_h + 1 + k] = list(grid[split_h - k])
+
+    # The smudge lies outside of the vertical mirror, so it stays exact
+    row = split_h + 1 + rng.randint(0, reach_h - 1)
+    column = rng.randint(split_v + 1 + reach_v, width - 1)
+    grid[row][column] = "#" if grid[row][column] == "." else "."
+    return grid
+
+
+def generate(size: float = 1, seed: int = 0):
+    """100 * size mirror patterns, each with a reflection and a smudged one.
+
+    Half of the patterns are transposed, so both axes are exercised."""
+    rng = random.Random(seed)
+    patterns = list()
+    for _ in range(max(1, int(100 * size))):
+        grid = _make_pattern(rng)
+        if rng.random() < 0.5:
+            grid = [list(column) for column in zip(*grid)]
+        patterns.append("\n".join("".join(row) for row in grid))
+    return "\n\n".join(patterns) + "\n", dict()
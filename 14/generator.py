@@ -0,0 +1,16 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+# The number of spins before a cycle shows up is not bound by size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": None}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Platform of side 100 * sqrt(size) with cube and rounded rocks."""
+    rng = random.Random(seed)
+    side = max(2, int(100 * size ** 0.5))
+    lines = list()
+    for _ in range(side):
+        lines.append("".join(rng.choices(".#O", weights=[65, 15, 20], k=side)))
+    return "\n".join(lines) + "\n", dict()
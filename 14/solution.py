@@ -1,4 +1,11 @@
 #!/usr/bin/env python
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+
 
 def _compact(data):
     return "\n".join(
@@ -13,7 +20,7 @@ class Solver:
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 self.data.append(line)
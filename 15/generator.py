@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+import random
+import string
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Initialization sequence of 4000 * size steps over a set of labels."""
+    rng = random.Random(seed)
+    n_steps = max(1, int(4000 * size))
+    labels = list()
+    for _ in range(max(1, n_steps // 8)):
+        length = rng.randint(2, 6)
+        labels.append("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    steps = list()
+    for _ in range(n_steps):
+        label = rng.choice(labels)
+        if rng.random() < 0.3:
+            steps.append(label + "-")
+        else:
+            steps.append("%s=%d" % (label, rng.randint(1, 9)))
+    return ",".join(steps) + "\n", dict()
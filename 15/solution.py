@@ -1,5 +1,11 @@
 #!/usr/bin/env python
 import collections
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
 
 
 class Box:
@@ -7,6 +13,7 @@ class Box:
     (same as a dict in modern python actually XD)"""
 
     class BoxItem:
+        __slots__ = ("label", "focal_power", "prev", "next")
 
         def __init__(self, label, focal_power):
             self.label = label
@@ -95,7 +102,7 @@ class Solver:
         self.data = None
 
     def parse(self, file):
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             line = hand.readline().strip()
             self.data = line.split(",")
 
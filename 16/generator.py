@@ -0,0 +1,16 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+# Part 2 explores the grid from every tile of the border
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1.5}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Contraption of side 110 * sqrt(size) with about 10% mirrors and splitters."""
+    rng = random.Random(seed)
+    side = max(2, int(110 * size ** 0.5))
+    lines = list()
+    for _ in range(side):
+        lines.append("".join(rng.choices("./\\|-", weights=[90, 3, 3, 2, 2], k=side)))
+    return "\n".join(lines) + "\n", dict()
@@ -1,6 +1,20 @@
 #!/usr/bin/env python
 import functools
+import os
+import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.grid import Grid, NEWLINE
+
+EMPTY = ord(".")
+SLASH = ord("/")
+BACKSLASH = ord("\\")
+SPLITTER_HORIZONTAL = ord("-")
+SPLITTER_VERTICAL = ord("|")
+
+# The reference engine keeps the original (x, y) points and directions
 MIRROR_MAPPINGS = {
     "/": {
         (1, 0): (0, -1),
@@ -24,15 +38,126 @@ def move_towards(point, direction):
 
 
 class Solver:
+    """Beams are (cell index, direction offset) pairs on the grid; they
+    start from the cell just outside the grid."""
 
     def __init__(self):
-        self.data = None
+        self.grid = None
+        self.mirror_mappings = dict()
         self.height = 0
         self.width = 0
 
+    def parse(self, file):
+        self.grid = Grid.from_source(file)
+        up, down, left, right = self.grid.up, self.grid.down, self.grid.left, self.grid.right
+        self.mirror_mappings = {
+            SLASH: {right: up, left: down, up: right, down: left},
+            BACKSLASH: {right: down, left: up, down: right, up: left},
+        }
+        self.height = self.grid.height
+        self.width = self.grid.width
+
+    @functools.lru_cache(maxsize=None)
+    def _get_beam_exploration(self, initial_beam):
+        cells = self.grid.cells
+        size = self.grid.size
+        horizontal = (self.grid.left, self.grid.right)
+        vertical = (self.grid.up, self.grid.down)
+
+        explored = set()
+        new_beams = set()
+        current_beam = initial_beam
+        while True:
+            if current_beam in explored:
+                break
+            explored.add(current_beam)
+
+            current_pos, current_dir = current_beam
+            new_pos = current_pos + current_dir
+            if new_pos < 0 or new_pos >= size or cells[new_pos] == NEWLINE:
+                break
+
+            new_beams = set()
+            point = cells[new_pos]
+            if point == EMPTY:
+                current_beam = (new_pos, current_dir)
+                continue
+            # Break
+            if point in self.mirror_mappings:
+                new_direction = self.mirror_mappings[point][current_dir]
+                new_beam = (new_pos, new_direction)
+                new_beams.add(new_beam)
+            elif point == SPLITTER_HORIZONTAL:
+                if current_dir in horizontal:
+                    new_beam = (new_pos, current_dir)
+                    new_beams.add(new_beam)
+                else:
+                    beam_1 = (new_pos, self.grid.right)
+                    beam_2 = (new_pos, self.grid.left)
+                    new_beams.add(beam_1)
+                    new_beams.add(beam_2)
+            elif point == SPLITTER_VERTICAL:
+                if current_dir in vertical:
+                    new_beam = (new_pos, current_dir)
+                    new_beams.add(new_beam)
+                else:
+                    beam_1 = (new_pos, self.grid.down)
+                    beam_2 = (new_pos, self.grid.up)
+                    new_beams.add(beam_1)
+                    new_beams.add(beam_2)
+            break
+
+        points = set()
+        for beam in explored:
+            point, _ = beam
+            points.add(point)
+
+        return points, new_beams
+
+    def _get_tiles_explored(self, initial_beam):
+        beams = {initial_beam}
+        points = set()
+        explored = set()
+        while len(beams) > 0:
+            beam = beams.pop()
+            if beam in explored:
+                continue
+            beam_points, new_beams = self._get_beam_exploration(beam)
+            points.update(beam_points)
+            beams.update(new_beams)
+            explored.add(beam)
+        return len(points) - 1
+
+    def solve1(self):
+        return self._get_tiles_explored((self.grid.index(-1, 0), self.grid.right))
+
+    def solve2(self):
+        best_result = 0
+        # TOP-DOWN
+        direction_down = self.grid.down
+        direction_up = self.grid.up
+        for x in range(self.width):
+            result = self._get_tiles_explored((self.grid.index(x, -1), direction_down))
+            best_result = max(best_result, result)
+            result = self._get_tiles_explored((self.grid.index(x, self.height), direction_up))
+            best_result = max(best_result, result)
+        # LEFT-RIGHT
+        direction_right = self.grid.right
+        direction_left = self.grid.left
+        for y in range(self.height):
+            result = self._get_tiles_explored((self.grid.index(-1, y), direction_right))
+            best_result = max(best_result, result)
+            result = self._get_tiles_explored((self.grid.index(self.width, y), direction_left))
+            best_result = max(best_result, result)
+        return best_result
+
+
+class ReferenceSolver(Solver):
+    """Beams are ((x, y), direction) pairs on a list of rows, the original algorithm."""
+
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 self.data.append(line)
@@ -94,20 +219,6 @@ class Solver:
 
         return points, new_beams
 
-    def _get_tiles_explored(self, initial_beam):
-        beams = {initial_beam}
-        points = set()
-        explored = set()
-        while len(beams) > 0:
-            beam = beams.pop()
-            if beam in explored:
-                continue
-            beam_points, new_beams = self._get_beam_exploration(beam)
-            points.update(beam_points)
-            beams.update(new_beams)
-            explored.add(beam)
-        return len(points) - 1
-
     def solve1(self):
         return self._get_tiles_explored(((-1, 0), (1, 0)))
 
@@ -132,6 +243,12 @@ class Solver:
         return best_result
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """City map of side 141 * sqrt(size) with heat losses from 1 to 9."""
+    rng = random.Random(seed)
+    side = max(5, int(141 * size ** 0.5))
+    lines = list()
+    for _ in range(side):
+        lines.append("".join(rng.choice("123456789") for _ in range(side)))
+    return "\n".join(lines) + "\n", dict()
@@ -1,14 +1,16 @@
 #!/usr/bin/env python
 import heapq
-from typing import Tuple
+import os
+import sys
+from typing import List, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-DIRECTION_TO_STR = {
-    (1, 0): ">",
-    (-1, 0): "<",
-    (0, 1): "V",
-    (0, -1): "^"
-}
+from aoc import inputs
+from aoc import metrics
+from aoc.grid import Grid, NEWLINE
+
+DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
 
 
 def min_null_safe(a: int | None, b: int | None) -> int:
@@ -20,9 +22,10 @@ def min_null_safe(a: int | None, b: int | None) -> int:
 
 
 class Status:
+    __slots__ = ("point", "heat_loss", "strait_steps", "direction", "_prev")
 
-    def __init__(self, point: Tuple[int, int], heat_loss: int, strait_steps: int,
-                 direction: Tuple[int, int], previous: 'Status' = None):
+    def __init__(self, point: int, heat_loss: int, strait_steps: int,
+                 direction: int, previous: 'Status' = None):
         self.point = point
         self.heat_loss = heat_loss
         self.strait_steps = strait_steps
@@ -32,15 +35,16 @@ class Status:
     def values(self):
         return self.point, self.heat_loss, self.strait_steps, self.direction
 
-    def print(self):
+    def print(self, grid: Grid):
+        direction_to_str = {grid.right: ">", grid.left: "<", grid.down: "V", grid.up: "^"}
         item = self
-        max_x, max_y = self.point
+        max_x, max_y = grid.coords(self.point)
         data = list()
         for _ in range(max_y + 1):
             data.append([' '] * (max_x + 1))
         while item is not None:
-            x, y = item.point
-            data[y][x] = DIRECTION_TO_STR.get(item.direction)
+            x, y = grid.coords(item.point)
+            data[y][x] = direction_to_str.get(item.direction)
             item = item._prev
 
         print("\n".join(
@@ -50,16 +54,16 @@ class Status:
 
 class StatusQueue:
 
-    def __init__(self, target: Tuple[int, int]):
+    def __init__(self, distances: List[int]):
         self.queue = list()
-        self.target_x, self.target_y = target
+        # Manhattan distance from each cell to the target
+        self.distances = distances
         self._count = 0
         heapq.heapify(self.queue)
 
     def _get_priority(self, item: Status) -> int:
         point, heat_loss, _, _ = item.values()
-        x, y = point
-        expected_loss_score = self.target_x - x + self.target_y - y + heat_loss
+        expected_loss_score = self.distances[point] + heat_loss
         return expected_loss_score
 
     def pop(self) -> Tuple[int, Status]:
@@ -76,10 +80,25 @@ class StatusQueue:
         return len(self.queue)
 
 
+class ReferenceStatusQueue(StatusQueue):
+    """Queue of (x, y) points, prioritised by their distance to the target."""
+
+    def __init__(self, target: Tuple[int, int]):
+        super().__init__(list())
+        self.target_x, self.target_y = target
+
+    def _get_priority(self, item: Status) -> int:
+        point, heat_loss, _, _ = item.values()
+        x, y = point
+        expected_loss_score = self.target_x - x + self.target_y - y + heat_loss
+        return expected_loss_score
+
+
 class ExploredPoints:
 
-    def __init__(self, use_ultra_crucible: bool):
+    def __init__(self, use_ultra_crucible: bool, directions: Tuple[int, ...]):
         self.explored = dict()
+        self.directions = directions
         self.use_ultra_crucible = use_ultra_crucible
         self.max_steps = 3 if not use_ultra_crucible else 10
 
@@ -87,10 +106,7 @@ class ExploredPoints:
         point, heat_loss, strait_steps, direction = status.values()
         if point not in self.explored:
             self.explored[point] = {
-                (1, 0): [None] * (self.max_steps + 1),
-                (-1, 0): [None] * (self.max_steps + 1),
-                (0, 1): [None] * (self.max_steps + 1),
-                (0, -1): [None] * (self.max_steps + 1),
+                direction: [None] * (self.max_steps + 1) for direction in self.directions
             }
         costs = self.explored[point][direction]
         explored_cost = costs[strait_steps]
@@ -111,13 +127,115 @@ class ExploredPoints:
 class Solver:
 
     def __init__(self):
-        self.data = None
+        self.grid = None
+        self.heat = None
+        self.turns = dict()
         self.width = 0
         self.height = 0
+        # Link every state to the previous one, to print the best path;
+        # otherwise explored states are freed as soon as they are popped
+        self.trace_path = False
+
+    def parse(self, file):
+        self.grid = Grid.from_source(file)
+        # Heat loss of each cell, at the same index as in the grid
+        self.heat = bytes(self.grid.cells).translate(DIGIT_VALUES)
+        up, down, left, right = self.grid.up, self.grid.down, self.grid.left, self.grid.right
+        # Direction -> (turn left, turn right)
+        self.turns = {right: (up, down), left: (down, up), down: (right, left), up: (left, right)}
+        self.width = self.grid.width
+        self.height = self.grid.height
+
+    def _get_distances_to(self, target):
+        target_x, target_y = self.grid.coords(target)
+        distances = list()
+        for index in range(self.grid.size):
+            x, y = self.grid.coords(index)
+            distances.append(target_x - x + target_y - y)
+        return distances
+
+    def _get_directions(self, point, strait_steps, direction, use_ultra_crucible):
+        cells = self.grid.cells
+        size = self.grid.size
+        max_steps_straight = 3 if not use_ultra_crucible else 10
+        if strait_steps < max_steps_straight:
+            new_point = point + direction
+            if 0 <= new_point < size and cells[new_point] != NEWLINE:
+                yield new_point, direction
+        min_steps_turn = 0 if not use_ultra_crucible else 4
+        if strait_steps >= min_steps_turn:
+            for new_direction in self.turns[direction]:
+                new_point = point + new_direction
+                if 0 <= new_point < size and cells[new_point] != NEWLINE:
+                    yield new_point, new_direction
+
+    def _solve(self, use_ultra_crucible: bool):
+        target = self.grid.index(self.width - 1, self.height - 1)
+        positions = StatusQueue(self._get_distances_to(target))
+        for starting_direction in [self.grid.right, self.grid.down]:
+            positions.add(Status(0, 0, 0, starting_direction))
+        best_result = None
+        best_solution = None
+        explored = ExploredPoints(use_ultra_crucible, self.grid.offsets)
+        collect_metrics = metrics.enabled
+        trace_path = self.trace_path
+        n_popped, n_pruned_loss, n_pruned_explored = 0, 0, 0
+        while len(positions) > 0:
+            if collect_metrics:
+                metrics.observe("frontier_size", len(positions))
+                n_popped += 1
+            best_possible_heat_loss, current = positions.pop()
+            point, heat_loss, strait_steps, direction = current.values()
+            if point == target:
+                # Arrived at target
+                if use_ultra_crucible and strait_steps < 4:
+                    # Invalid solution
+                    continue
+                best_result = min_null_safe(best_result, heat_loss)
+                if heat_loss == best_result:
+                    best_solution = current
+                continue
+            if best_result is not None and best_possible_heat_loss >= best_result:
+                # Too much heat loss
+                n_pruned_loss += 1
+                continue
+            if explored.mark_explored(current):
+                # Point was already explored with better status
+                n_pruned_explored += 1
+                continue
+            previous = current if trace_path else None
+            # Get new directions
+            for block_and_direction in self._get_directions(point, strait_steps, direction, use_ultra_crucible):
+                new_point, new_direction = block_and_direction
+                new_loss = heat_loss + self.heat[new_point]
+                new_strait_steps = strait_steps
+                if new_direction == direction:
+                    new_strait_steps += 1
+                else:
+                    new_strait_steps = 1
+                positions.add(Status(new_point, new_loss, new_strait_steps, new_direction, previous=previous))
+
+        if collect_metrics:
+            metrics.count("states_pushed", positions._count)
+            metrics.count("states_popped", n_popped)
+            metrics.count("pruned_heat_loss", n_pruned_loss)
+            metrics.count("pruned_explored", n_pruned_explored)
+        # best_solution.print(self.grid)
+        return best_result
+
+    def solve1(self):
+        return self._solve(use_ultra_crucible=False)
+
+    def solve2(self):
+        return self._solve(use_ultra_crucible=True)
+
+
+class ReferenceSolver(Solver):
+    """Searches (x, y) points of a list of rows, the original algorithm."""
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 line = list(map(int, line))
@@ -149,12 +267,11 @@ class Solver:
 
     def _solve(self, use_ultra_crucible: bool):
         target = (self.width - 1, self.height - 1)
-        positions = StatusQueue(target)
+        positions = ReferenceStatusQueue(target)
         for starting_direction in [(1, 0), (0, 1)]:
             positions.add(Status((0, 0), 0, 0, starting_direction))
         best_result = None
-        best_solution = None
-        explored = ExploredPoints(use_ultra_crucible)
+        explored = ExploredPoints(use_ultra_crucible, ((1, 0), (-1, 0), (0, 1), (0, -1)))
         while len(positions) > 0:
             best_possible_heat_loss, current = positions.pop()
             point, heat_loss, strait_steps, direction = current.values()
@@ -164,8 +281,6 @@ class Solver:
                     # Invalid solution
                     continue
                 best_result = min_null_safe(best_result, heat_loss)
-                if heat_loss == best_result:
-                    best_solution = current
                 continue
             if best_result is not None and best_possible_heat_loss >= best_result:
                 # Too much heat loss
@@ -185,14 +300,13 @@ class Solver:
                     new_strait_steps = 1
                 positions.add(Status(new_point, new_loss, new_strait_steps, new_direction, previous=current))
 
-        # best_solution.print()
         return best_result
 
-    def solve1(self):
-        return self._solve(use_ultra_crucible=False)
 
-    def solve2(self):
-        return self._solve(use_ultra_crucible=True)
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
 
 
 def main():
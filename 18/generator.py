@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+import random
+
+STEP_TO_DIRECTION = {
+    (0, 1): "R",
+    (1, 0): "D",
+    (0, -1): "L",
+    (-1, 0): "U",
+}
+DIRECTION_TO_NUMBER = {"R": "0", "D": "1", "L": "2", "U": "3"}
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _get_columns(rng, n_columns, n_rows):
+    # Overlapping row intervals: a simply connected shape with no pinches
+    top, bottom = n_rows // 3, 2 * n_rows // 3
+    jump = max(1, n_rows // 4)
+    columns = list()
+    for _ in range(n_columns):
+        while True:
+            new_top = min(max(0, top + rng.randint(-jump, jump)), n_rows - 1)
+            new_bottom = min(max(1, bottom + rng.randint(-jump, jump)), n_rows)
+            if new_top < new_bottom and max(top, new_top) < min(bottom, new_bottom):
+                break
+        top, bottom = new_top, new_bottom
+        columns.append((top, bottom))
+    return columns
+
+
+def _get_polygon(rng, n_columns, n_rows, min_stride, max_stride):
+    """Return the movements along the border of a random shape, clockwise."""
+    columns = _get_columns(rng, n_columns, n_rows)
+    xs = [0]
+    for _ in range(n_columns):
+        xs.append(xs[-1] + rng.randint(min_stride, max_stride))
+    ys = [0]
+    for _ in range(n_rows):
+        ys.append(ys[-1] + rng.randint(min_stride, max_stride))
+
+    corners = list()
+    for j, (top, _) in enumerate(columns):
+        corners.append((xs[j], ys[top]))
+        corners.append((xs[j + 1], ys[top]))
+    for j in range(n_columns - 1, -1, -1):
+        _, bottom = columns[j]
+        corners.append((xs[j + 1], ys[bottom]))
+        corners.append((xs[j], ys[bottom]))
+
+    movements = list()
+    for i, (x, y) in enumerate(corners):
+        next_x, next_y = corners[(i + 1) % len(corners)]
+        if (x, y) == (next_x, next_y):
+            continue
+        if next_x != x:
+            step = (0, 1 if next_x > x else -1)
+            stride = abs(next_x - x)
+        else:
+            step = (1 if next_y > y else -1, 0)
+            stride = abs(next_y - y)
+        direction = STEP_TO_DIRECTION[step]
+        if len(movements) > 0 and movements[-1][0] == direction:
+            movements[-1] = (direction, movements[-1][1] + stride)
+        else:
+            movements.append((direction, stride))
+    if movements[0][0] == movements[-1][0]:
+        direction, stride = movements.pop()
+        movements[0] = (direction, movements[0][1] + stride)
+    return movements
+
+
+def _get_lagoon_size(movements):
+    # Shoelace formula plus the half of the trench outside of the polygon
+    x, y = 0, 0
+    area = 0
+    perimeter = 0
+    steps = {value: key for key, value in STEP_TO_DIRECTION.items()}
+    for direction, stride in movements:
+        dy, dx = steps[direction]
+        new_x, new_y = x + dx * stride, y + dy * stride
+        area += x * new_y - new_x * y
+        perimeter += stride
+        x, y = new_x, new_y
+    return abs(area) // 2 + perimeter // 2 + 1
+
+
+def _split(rng, movements, target):
+    # Split straight movements in two, until there are target of them
+    movements = list(movements)
+    while len(movements) < target:
+        candidates = [i for i, (_, stride) in enumerate(movements) if stride > 1]
+        i = rng.choice(candidates)
+        direction, stride = movements[i]
+        first = rng.randint(1, stride - 1)
+        movements[i:i + 1] = [(direction, first), (direction, stride - first)]
+    return movements
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Dig plan whose two polygons have about 30 * size columns each.
+
+    The plan in the colours may not have collinear consecutive movements,
+    so the short plan gets its movements split until the counts match."""
+    rng = random.Random(seed)
+    n_columns = max(2, int(30 * size))
+    # Colours only have five hexadecimal digits for the stride, so the
+    # whole shape must fit in 16 ** 5 meters
+    max_stride = (16 ** 5 - 1) // (2 * n_columns)
+    while True:
+        small = _get_polygon(rng, n_columns, n_columns, 2, 12)
+        large = _get_polygon(rng, 2 * n_columns, 2 * n_columns, max(1, max_stride // 60), max_stride)
+        if len(small) <= len(large) <= sum(stride for _, stride in small):
+            break
+    answers = {1: _get_lagoon_size(small), 2: _get_lagoon_size(large)}
+    small = _split(rng, small, len(large))
+
+    lines = list()
+    for (direction, stride), (color_direction, color_stride) in zip(small, large):
+        color = "%05x%s" % (color_stride, DIRECTION_TO_NUMBER[color_direction])
+        lines.append("%s %d (#%s)" % (direction, stride, color))
+    return "\n".join(lines) + "\n", answers
@@ -1,5 +1,12 @@
 #!/usr/bin/env python
-from typing import Tuple, List, Iterable
+import os
+import sys
+from typing import Dict, Tuple, List, Iterable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.intervals import IntervalSet
 
 DIRECTIONS = {
     "U": (0, -1),
@@ -67,6 +74,10 @@ def scalar_prod(a: int, v: List[int]) -> List[int]:
     return [a * el for el in v]
 
 
+def count_cubes(sections: IntervalSet) -> int:
+    return sections.size() + len(sections)
+
+
 def get_neighbours(point):
     x, y = point
     yield x - 1, y
@@ -82,7 +93,7 @@ class Solver:
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 direction, meters, color = line.split(" ")
@@ -109,80 +120,66 @@ class Solver:
                     border.add(point)
         return len(lagoon) + len(trench)
 
-    def get_vertices(self, movements: List[Tuple[str, int]]) -> List[Tuple[int, int]]:
-        vertices = set()
+    def get_borders(self, movements: List[Tuple[str, int]]) -> Dict[int, IntervalSet]:
+        """Vertical borders of the trench, by x, as the intervals between the y of their ends."""
+        borders = dict()
         current = (0, 0)
-        vertices.add(current)
         for movement in movements:
             direction, stride = movement
             direction_v = DIRECTIONS[direction]
             direction_v = scalar_prod(stride, direction_v)
-            current = vector_sum(current, direction_v)
-            vertices.add(current)
-        vertices = list(vertices)
-        vertices.sort()
-        return vertices
-
-    def _get_content_fast(self, vertices) -> int:
-        # Split by levels
-        levels = dict()
-        for vertex in vertices:
-            x, y = vertex
-            if x not in levels:
-                levels[x] = list()
-            levels[x].append(y)
-        for level in levels.values():
-            level.sort()
-
-        current_cubes = list()
+            following = vector_sum(current, direction_v)
+            x, y = current
+            if direction_v[0] == 0 and stride > 0:
+                level = borders.get(x, IntervalSet())
+                # Toggled, so that a border retracing another at the same x cancels it out
+                borders[x] = level ^ IntervalSet([(min(y, following[1]), max(y, following[1]))])
+            current = following
+        return dict(sorted(borders.items()))
+
+    def _get_content_fast(self, borders: Dict[int, IntervalSet]) -> int:
+        # Sections of the lagoon crossing the current column, between the y of their borders:
+        # the section [start, end) holds the end - start + 1 cubes from start to end
+        current_cubes = IntervalSet()
         prev_x = None
         lagoon = 0
-        for x, level in levels.items():
-            # Increase size
+        for x, level in borders.items():
+            # Increase size, up to the column before this level
             if prev_x is not None:
-                height = x - prev_x
-                for section in current_cubes:
-                    lagoon += (section[1] - section[0] + 1) * height
-            # Get new sections
-            for i in range(len(level) // 2):
-                section = [level[2*i], level[2*i + 1]]
-                current_cubes.append(section)
-            current_cubes.sort()
-            # Merge and subtract
-            new_cubes = list()
-            for cube in current_cubes:
-                current_start, current_end = cube
-                if len(new_cubes) == 0:
-                    new_cubes.append([current_start, current_end])
-                    continue
-                prev_start, prev_end = new_cubes[-1]
-                if current_start > prev_end:
-                    new_cubes.append([current_start, current_end])
-                elif current_start == prev_end:
-                    new_cubes[-1][1] = current_end
-                else:
-                    # current_start < prev_end
-                    new_cubes.pop()
-                    if prev_end < current_end:
-                        prev_end, current_end = current_end, prev_end
-                    added = 0
-                    if current_start > prev_start:
-                        new_cubes.append([prev_start, current_start])
-                        added += 1
-                    if prev_end > current_end:
-                        new_cubes.append([current_end, prev_end])
-                        added += 1
-                    lagoon += (current_end - current_start - added + 1)
+                lagoon += count_cubes(current_cubes) * (x - prev_x - 1)
+            # The borders at this level open new sections and close or shrink the current ones
+            new_cubes = current_cubes ^ level
+            # The column of the level holds the cubes of both the old and the new sections
+            lagoon += count_cubes(current_cubes | new_cubes)
             current_cubes = new_cubes
             prev_x = x
 
         return lagoon
 
+    def get_movements(self, part: int) -> List[Tuple[str, int]]:
+        if part == 1:
+            return [(direction, meters) for direction, meters, _ in self.data]
+        return [decode(color) for _, _, color in self.data]
+
+    def solve1(self):
+        return self._get_content_fast(self.get_borders(self.get_movements(1)))
+
+    def solve2(self):
+        return self._get_content_fast(self.get_borders(self.get_movements(2)))
+
+
+class ReferenceSolver(Solver):
+    """Fills the lagoon cube by cube for part 1, the original algorithm.
+
+    Part 2 is too large to fill, and the original sweep over the vertices
+    is not a usable reference: it loses borders whose ends share a vertex.
+    It is counted instead with the shoelace formula and Pick's theorem, a
+    new oracle, independent of the interval sweep of the optimized engine."""
+
     def solve1(self):
         current = (0, 0)
         trench = {current}
-        for movement in self.data:
-            direction, meters, _ = movement
+        for direction, meters in self.get_movements(1):
             direction_v = DIRECTIONS[direction]
             for _ in range(meters):
                 current = vector_sum(current, direction_v)
@@ -190,13 +187,22 @@ class Solver:
         return self._get_content_slow(trench)
 
     def solve2(self):
-        movements = list()
-        for movement in self.data:
-            _, _, color = movement
-            direction, meters = decode(color)
-            movements.append((direction, meters))
-        vertices = self.get_vertices(movements)
-        return self._get_content_fast(vertices)
+        x, y = 0, 0
+        double_area = 0
+        perimeter = 0
+        for direction, meters in self.get_movements(2):
+            dx, dy = scalar_prod(meters, DIRECTIONS[direction])
+            double_area += x * (y + dy) - (x + dx) * y
+            perimeter += meters
+            x, y = x + dx, y + dy
+        # Interior points by Pick's theorem, plus the trench itself
+        return (abs(double_area) - perimeter) // 2 + 1 + perimeter
+
+
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
 
 
 def main():
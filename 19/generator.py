@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+import random
+import string
+
+ATTRIBUTES = "xmas"
+MAX_RATING = 4000
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _get_name(rng, used):
+    while True:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 3)))
+        if name not in used and name != "in":
+            used.add(name)
+            return name
+
+
+def _count_accepted(workflows, name, box):
+    """Count the accepted combinations inside box, a dict of closed ranges."""
+    if name == "R":
+        return 0
+    if name == "A":
+        result = 1
+        for start, end in box.values():
+            result *= end - start + 1
+        return result
+    result = 0
+    box = dict(box)
+    for attrib, uneq, value, target in workflows[name][:-1]:
+        start, end = box[attrib]
+        if uneq == "<":
+            passing, failing = (start, min(end, value - 1)), (max(start, value), end)
+        else:
+            passing, failing = (max(start, value + 1), end), (start, min(end, value))
+        if passing[0] <= passing[1]:
+            result += _count_accepted(workflows, target, dict(box, **{attrib: passing}))
+        if failing[0] > failing[1]:
+            return result
+        box[attrib] = failing
+    return result + _count_accepted(workflows, workflows[name][-1], box)
+
+
+def _is_accepted(workflows, part):
+    name = "in"
+    while name not in ("A", "R"):
+        rules = workflows[name]
+        name = rules[-1]
+        for attrib, uneq, value, target in rules[:-1]:
+            if (part[attrib] < value) if uneq == "<" else (part[attrib] > value):
+                name = target
+                break
+    return name == "A"
+
+
+def generate(size: float = 1, seed: int = 0):
+    """About 550 * size workflows arranged as a tree, and 200 * size parts.
+
+    Every workflow is the target of exactly one rule and, as in the puzzle,
+    the rules of "in" only lead to other workflows."""
+    rng = random.Random(seed)
+    n_workflows = max(1, int(550 * size))
+    used = set()
+    workflows = dict()
+    # The conditions always split the ratings left to a workflow in two
+    # non-empty ranges, so that no path through the tree is contradictory
+    pending = [("in", {attrib: (1, MAX_RATING) for attrib in ATTRIBUTES})]
+    while len(pending) > 0:
+        name, box = pending.pop(rng.randrange(len(pending)))
+        n_rules = rng.randint(2, 4)
+        rules = list()
+        for i in range(n_rules):
+            grow = len(workflows) + len(pending) < n_workflows and rng.random() < 0.7
+            if name == "in" or grow:
+                target = _get_name(rng, used)
+            else:
+                target = rng.choice("AR")
+            splittable = [attrib for attrib in ATTRIBUTES if box[attrib][0] < box[attrib][1]]
+            if i == n_rules - 1 or len(splittable) == 0:
+                rules.append(target)
+                if target not in ("A", "R"):
+                    pending.append((target, box))
+                break
+            attrib = rng.choice(splittable)
+            start, end = box[attrib]
+            uneq = rng.choice("<>")
+            if uneq == "<":
+                value = rng.randint(start + 1, end)
+                passing, failing = (start, value - 1), (value, end)
+            else:
+                value = rng.randint(start, end - 1)
+                passing, failing = (value + 1, end), (start, value)
+            rules.append((attrib, uneq, value, target))
+            if target not in ("A", "R"):
+                pending.append((target, dict(box, **{attrib: passing})))
+            box = dict(box, **{attrib: failing})
+        workflows[name] = rules
+
+    lines = list()
+    items = list(workflows.items())
+    rng.shuffle(items)
+    for name, rules in items:
+        raw_rules = ["%s%s%d:%s" % rule for rule in rules[:-1]] + [rules[-1]]
+        lines.append("%s{%s}" % (name, ",".join(raw_rules)))
+    lines.append("")
+
+    total1 = 0
+    for _ in range(max(1, int(200 * size))):
+        part = {attrib: rng.randint(1, MAX_RATING) for attrib in ATTRIBUTES}
+        lines.append("{%s}" % ",".join("%s=%d" % item for item in part.items()))
+        if _is_accepted(workflows, part):
+            total1 += sum(part.values())
+
+    box = {attrib: (1, MAX_RATING) for attrib in ATTRIBUTES}
+    return "\n".join(lines) + "\n", {1: total1, 2: _count_accepted(workflows, "in", box)}
@@ -1,9 +1,34 @@
 #!/usr/bin/env python
 import abc
 import json
+import os
+import sys
 from typing import Dict, List, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from aoc import inputs
+from aoc.artifacts import ArtifactCache
+from aoc.intervals import Box
+
+
+RATINGS = "xmas"
+RATING_RANGE = (1, 4001)
+
+
+def split_by_rule(box: Box, attrib: str, uneq: str, value: int) -> Tuple[Box | None, Box | None]:
+    """Split the parts in box into those that pass the rule and those that do not."""
+    dimension = RATINGS.index(attrib)
+    if uneq == "<":
+        passed, failed = box.split(dimension, value)
+    elif uneq == ">":
+        failed, passed = box.split(dimension, value + 1)
+    else:
+        raise Exception(f"Invalid value {uneq}")
+    return passed, failed
+
+
+# The reference engine keeps the original conditions, as lists of intervals with open ends
 def less_or_equal_null_safe(a, b):
     if a is None or b is None:
         return True
@@ -58,7 +83,9 @@ class FixedCondition(Condition):
         return self.value
 
     def is_always_false(self) -> bool:
-        return self.value
+        # The original returned self.value, which dropped the paths through
+        # workflows that only have a default rule
+        return not self.value
 
     def __invert__(self):
         return FixedCondition(not self.value)
@@ -151,9 +178,11 @@ class Solver:
     def __init__(self):
         self.workflows = list()
         self.parts = list()
+        self.artifacts = ArtifactCache("19", __file__)
 
     def parse(self, file):
-        with open(file) as hand:
+        self.artifacts.bind(file)
+        with inputs.open_text(file) as hand:
             read_workflows = True
             for line in hand:
                 line = line.strip()
@@ -181,6 +210,78 @@ class Solver:
                     self.parts.append(part)
 
     def _get_acceptance_rules(self):
+        return self.artifacts.get("acceptance_rules", (), self._compute_acceptance_rules)
+
+    def _compute_acceptance_rules(self):
+        # Each rule is the box of the ratings that follow it
+        to_workflow = dict()
+        for workflow in self.workflows:
+            name, rules = workflow
+            rules_not_passed = Box([RATING_RANGE] * len(RATINGS))
+            for rule in rules[:-1]:
+                attrib, uneq, value, target_wf = rule
+                if target_wf not in to_workflow:
+                    to_workflow[target_wf] = list()
+                if rules_not_passed is None:
+                    break
+                rules_to_pass, rules_not_passed = split_by_rule(rules_not_passed, attrib, uneq, value)
+                if rules_to_pass is not None:
+                    to_workflow[target_wf].append((name, rules_to_pass))
+            target_wf = rules[-1]
+            if target_wf not in to_workflow:
+                to_workflow[target_wf] = list()
+            if rules_not_passed is not None:
+                to_workflow[target_wf].append((name, rules_not_passed))
+
+        border = set()
+        for wf, rule in to_workflow["A"]:
+            border.add((wf, rule, ("A",)))
+
+        final_rules = list()
+        while len(border) > 0:
+            current, rule_to_use, wf_used = border.pop()
+            for wf, rule in to_workflow.get(current, list()):
+                new_rule = rule & rule_to_use
+                if new_rule is None:
+                    continue
+
+                used = [current]
+                used.extend(wf_used)
+                if wf == "in":
+                    final_rules.append((tuple(used), new_rule))
+                else:
+                    border.add((wf, new_rule, tuple(used)))
+        return final_rules
+
+    def solve1(self):
+        final_rules = self._get_acceptance_rules()
+
+        result = 0
+        for part in self.parts:
+            ratings = tuple(part[key] for key in RATINGS)
+            for wfs_and_rule in final_rules:
+                wfs, rule = wfs_and_rule
+                if ratings in rule:
+                    for value in part.values():
+                        result += value
+                    break
+        return result
+
+    def solve2(self):
+        final_rules = self._get_acceptance_rules()
+        result = 0
+        for wfs_and_rule in final_rules:
+            wfs, rule = wfs_and_rule
+            result += rule.volume()
+        return result
+
+
+class ReferenceSolver(Solver):
+    """Combines the rules as conditions on lists of intervals, the original
+    algorithm, fixed for the workflows that only have a default rule."""
+
+    def _get_acceptance_rules(self):
+        # Not shared with the artifact cache, which holds the boxes of the optimized engine
         to_workflow = dict()
         for workflow in self.workflows:
             name, rules = workflow
@@ -252,6 +353,12 @@ class Solver:
         return result
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+import math
+import random
+import string
+
+# Expected growth of each phase, as an exponent of size
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 1}
+
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for d in range(2, int(n ** 0.5) + 1):
+        if n % d == 0:
+            return False
+    return True
+
+
+def _get_primes(n_bits: int):
+    return [n for n in range(2 ** (n_bits - 1) + 1, 2 ** n_bits, 2) if _is_prime(n)]
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Network of 4 * size binary counters feeding a final conjunction.
+
+    Each counter is a chain of flip-flops plus a hub conjunction that
+    resets it when it reaches a prime period, as in the puzzle; the hub
+    then sends a low pulse to its inverter, which feeds the module before
+    rx."""
+    rng = random.Random(seed)
+    n_counters = max(1, int(4 * size))
+    n_bits = 12
+    while len(_get_primes(n_bits)) < n_counters:
+        n_bits += 1
+    periods = rng.sample(_get_primes(n_bits), n_counters)
+
+    names = set()
+
+    def new_name():
+        while True:
+            name = "".join(rng.choice(string.ascii_lowercase) for _ in range(3))
+            if name not in names and name != "rx":
+                names.add(name)
+                return name
+
+    final = new_name()
+    modules = list()
+    firsts = list()
+    for period in periods:
+        flip_flops = [new_name() for _ in range(n_bits)]
+        hub = new_name()
+        inverter = new_name()
+        firsts.append(flip_flops[0])
+        hub_targets = [flip_flops[0]]
+        for bit, flip_flop in enumerate(flip_flops):
+            targets = list()
+            if bit < n_bits - 1:
+                targets.append(flip_flops[bit + 1])
+            if period & (1 << bit):
+                targets.append(hub)
+            elif bit > 0:
+                hub_targets.append(flip_flop)
+            rng.shuffle(targets)
+            modules.append(("%" + flip_flop, targets))
+        hub_targets.append(inverter)
+        rng.shuffle(hub_targets)
+        modules.append(("&" + hub, hub_targets))
+        modules.append(("&" + inverter, [final]))
+    modules.append(("&" + final, ["rx"]))
+    rng.shuffle(modules)
+    modules.insert(0, ("broadcaster", firsts))
+
+    lines = ["%s -> %s" % (module, ", ".join(targets)) for module, targets in modules]
+    return "\n".join(lines) + "\n", {2: math.lcm(*periods)}
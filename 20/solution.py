@@ -2,9 +2,115 @@
 
 import collections
 import math
+import os
+import sys
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc import metrics
+from aoc.graph import Graph, NodeIndex
+
+
+BUTTON = "button"
+BROADCASTER, FLIP_FLOP, CONJUNCTION, OUTPUT = range(4)
+MODULE_TYPES = {"broadcaster": BROADCASTER, "%": FLIP_FLOP, "&": CONJUNCTION}
 
 
 class ModulesEvaluator:
+    """Modules are the nodes of a graph. A pulse is a single int, the id of
+    the edge it travels on times two plus one if it is high, so that a
+    module sends all its pulses with one extend; conjunctions remember the
+    last pulse of each input edge."""
+
+    def __init__(self, nodes: NodeIndex, types: List[int], graph: Graph, inputs: Graph):
+        self.nodes = nodes
+        self.types = types
+        self.graph = graph
+        self.inputs = inputs
+        self.monitored_modules = set()
+
+    def get_initial_status(self):
+        flip_flops = [0] * len(self.nodes)
+        last_pulses = [0] * len(self.graph.targets)
+        # Number of inputs of each conjunction whose last pulse was low
+        low_inputs = [self.inputs.degree(mod) for mod in range(len(self.nodes))]
+        return flip_flops, last_pulses, low_inputs
+
+    def eval(self, status):
+        if status is None:
+            status = self.get_initial_status()
+        flip_flops, last_pulses, low_inputs = status
+        types = self.types
+        offsets = self.graph.offsets
+        targets = self.graph.targets
+        activations = collections.deque()
+        activations.append(2 * self.graph.offsets[self.nodes[BUTTON]])
+        n_sent, n_high_sent = 0, 0
+        monitored = {el: False for el in self.monitored_modules}
+        while len(activations) > 0:
+            pulse = activations.popleft()
+            edge = pulse >> 1
+            high_pulse = pulse & 1
+            mod = targets[edge]
+            # Increase counts
+            n_sent += 1
+            n_high_sent += high_pulse
+            if mod in monitored and not high_pulse:
+                monitored[mod] = True
+            # Process
+            mod_type = types[mod]
+            if mod_type == OUTPUT:
+                continue
+            if mod_type == BROADCASTER:
+                sent = high_pulse
+            elif mod_type == FLIP_FLOP:
+                if high_pulse:
+                    continue
+                sent = flip_flops[mod] = 1 - flip_flops[mod]
+            else:
+                if last_pulses[edge] != high_pulse:
+                    last_pulses[edge] = high_pulse
+                    low_inputs[mod] += -1 if high_pulse else 1
+                sent = 1 if low_inputs[mod] > 0 else 0
+            activations.extend(range(2 * offsets[mod] + sent, 2 * offsets[mod + 1], 2))
+        n_low_sent = n_sent - n_high_sent
+        if metrics.enabled:
+            metrics.count("presses")
+            metrics.observe("pulses_per_press", n_sent)
+        return (n_high_sent, n_low_sent), status, monitored
+
+    def get_ancestors_evaluator(self, node: int):
+        ancestors = set(self.inputs.dfs(node))
+        sub_types = [mod_type if mod in ancestors else OUTPUT for mod, mod_type in enumerate(self.types)]
+        return ModulesEvaluator(self.nodes, sub_types, self.graph, self.inputs)
+
+    @classmethod
+    def build(cls, modules_list):
+        nodes = NodeIndex()
+        types = dict()
+        # The button is a node too, so that its pulse has an edge like the others
+        edges = [(nodes.add(BUTTON), nodes.add("broadcaster"))]
+        for mod_with_targets in modules_list:
+            mod, targets = mod_with_targets
+            if mod == "broadcaster":
+                mod_name = mod
+                mod_type = mod
+            else:
+                mod_type = mod[0]
+                mod_name = mod[1:]
+            source = nodes.add(mod_name)
+            types[source] = MODULE_TYPES[mod_type]
+            for target in targets:
+                edges.append((source, nodes.add(target)))
+        graph = Graph.from_edges(len(nodes), edges)
+        types = [types.get(mod, OUTPUT) for mod in range(len(nodes))]
+        return ModulesEvaluator(nodes, types, graph, graph.reversed())
+
+
+class ReferenceModulesEvaluator:
+    """Modules in dicts by name and pulses as tuples, the original evaluator."""
 
     def __init__(self, modules, module_to_inputs):
         self.modules = modules
@@ -81,7 +187,7 @@ class ModulesEvaluator:
         sub_mod_to_inputs = dict()
         for el, inputs in self.module_to_inputs.items():
             sub_mod_to_inputs[el] = inputs
-        return ModulesEvaluator(modules=sub_modules, module_to_inputs=sub_mod_to_inputs)
+        return ReferenceModulesEvaluator(modules=sub_modules, module_to_inputs=sub_mod_to_inputs)
 
     @classmethod
     def build(cls, modules_list):
@@ -100,7 +206,7 @@ class ModulesEvaluator:
                 if target not in module_to_inputs:
                     module_to_inputs[target] = list()
                 module_to_inputs[target].append(mod_name)
-        return ModulesEvaluator(modules, module_to_inputs)
+        return cls(modules, module_to_inputs)
 
 
 class Solver:
@@ -110,7 +216,7 @@ class Solver:
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 mod, targets = line.split(" -> ", maxsplit=2)
@@ -131,7 +237,7 @@ class Solver:
             pulses_low += sent_low
         return pulses_high * pulses_low
 
-    def get_period(self, root_evaluator: ModulesEvaluator, node: str):
+    def get_period(self, root_evaluator: ModulesEvaluator, node: int):
         evaluator = root_evaluator.get_ancestors_evaluator(node)
         evaluator.monitored_modules.add(node)
         status = None
@@ -150,6 +256,33 @@ class Solver:
     def solve2(self):
         evaluator = ModulesEvaluator.build(self.data)
 
+        dd_node = evaluator.inputs.neighbours(evaluator.nodes["rx"])[0]
+        periods = list()
+        for node in evaluator.inputs.neighbours(dd_node):
+            period = self.get_period(evaluator, node)
+            periods.append(period)
+
+        return math.lcm(*periods)
+
+
+class ReferenceSolver(Solver):
+    """Evaluates the modules by name, the original algorithm."""
+
+    def _press_btn(self, times: int) -> int:
+        evaluator = ReferenceModulesEvaluator.build(self.data)
+        status = None
+        pulses_high = 0
+        pulses_low = 0
+        for i in range(times):
+            pulses_sent, status, _ = evaluator.eval(status)
+            sent_high, sent_low = pulses_sent
+            pulses_high += sent_high
+            pulses_low += sent_low
+        return pulses_high * pulses_low
+
+    def solve2(self):
+        evaluator = ReferenceModulesEvaluator.build(self.data)
+
         dd_node = evaluator.module_to_inputs["rx"][0]
         periods = list()
         for node in evaluator.module_to_inputs[dd_node]:
@@ -159,6 +292,12 @@ class Solver:
         return math.lcm(*periods)
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+import random
+
+# The solver walks 26501365 steps, which is w // 2 modulo w only for these
+# map sides
+VALID_SIDES = [131, 393]
+
+# Expected growth of each phase, as an exponent of size
+# Only two map sides are valid, so there is no curve to fit
+GROWTH = {"parse": None, "solve1": None, "solve2": None}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Square garden with a side of 131, or 393 from size 9 on.
+
+    The start is in the middle; its row and column, the border and a
+    diamond halfway to the border are free of rocks, as in the puzzle.
+    Garden plots that cannot be reached are filled with rocks."""
+    rng = random.Random(seed)
+    side = VALID_SIDES[0]
+    for candidate in VALID_SIDES:
+        if candidate <= 131 * size ** 0.5:
+            side = candidate
+    center = side // 2
+
+    grid = list()
+    for y in range(side):
+        row = list()
+        for x in range(side):
+            distance = abs(x - center) + abs(y - center)
+            free = (
+                x == center or y == center
+                or x in (0, side - 1) or y in (0, side - 1)
+                or center - 2 <= distance <= center + 1
+            )
+            row.append("." if free or rng.random() >= 0.12 else "#")
+        grid.append(row)
+
+    reachable = {(center, center)}
+    current = [(center, center)]
+    while len(current) > 0:
+        x, y = current.pop()
+        for nx, ny in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]:
+            if 0 <= nx < side and 0 <= ny < side and grid[ny][nx] == "." and (nx, ny) not in reachable:
+                reachable.add((nx, ny))
+                current.append((nx, ny))
+    for y in range(side):
+        for x in range(side):
+            if (x, y) not in reachable:
+                grid[y][x] = "#"
+    grid[center][center] = "S"
+    return "\n".join("".join(row) for row in grid) + "\n", dict()
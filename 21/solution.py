@@ -1,43 +1,56 @@
 #!/usr/bin/env python
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc import metrics
+from aoc.artifacts import ArtifactCache
+from aoc.grid import Grid, NEWLINE
+
+ROCK = ord("#")
 
 
 class Solver:
 
     def __init__(self):
-        self.data = None
+        self.grid = None
         self.start = None
         self.height = 0
         self.width = 0
+        self.artifacts = ArtifactCache("21", __file__)
 
     def parse(self, file):
-        self.data = list()
-        with open(file) as hand:
-            for line in hand:
-                line = line.strip()
-                self.data.append(line)
-                if "S" in line:
-                    self.start = (line.index("S"), len(self.data) - 1)
-        self.height = len(self.data)
-        self.width = len(self.data[0])
-
-    def _get_neighbours(self, point):
-        x, y = point
-        for point in [
-            (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)
-        ]:
-            new_x, new_y = point
-            if 0 <= new_x < self.width and 0 <= new_y < self.height and self.data[new_y][new_x] != "#":
-                yield point
-
-    def explore(self, start):
+        self.artifacts.bind(file)
+        self.grid = Grid.from_source(file)
+        self.start = self.grid.coords(self.grid.find(b"S"))
+        self.height = self.grid.height
+        self.width = self.grid.width
+
+    def _get_neighbours(self, index):
+        cells = self.grid.cells
+        size = self.grid.size
+        for offset in self.grid.offsets:
+            neighbour = index + offset
+            if 0 <= neighbour < size and cells[neighbour] != NEWLINE and cells[neighbour] != ROCK:
+                yield neighbour
+
+    def get_distances(self, start):
+        return self.artifacts.get("distances", (start,), lambda: self._compute_distances(start))
+
+    def _compute_distances(self, start):
+        # Distances are keyed by cell index
+        start = self.grid.index(*start)
         point_to_min_steps = {
             start: 0,
         }
         current = {start}
         steps = 0
-        n_even = 1
-        n_odd = 0
+        collect_metrics = metrics.enabled
         while len(current) > 0:
+            if collect_metrics:
+                metrics.observe("bfs_frontier_size", len(current))
             steps += 1
             new_values = set()
             for el in current:
@@ -45,12 +58,18 @@ class Solver:
                     if point in point_to_min_steps:
                         continue
                     point_to_min_steps[point] = steps
-                    if steps % 2 == 0:
-                        n_even += 1
-                    else:
-                        n_odd += 1
                     new_values.add(point)
             current = new_values
+        return point_to_min_steps
+
+    def explore(self, start):
+        n_even = 0
+        n_odd = 0
+        for steps in self.get_distances(start).values():
+            if steps % 2 == 0:
+                n_even += 1
+            else:
+                n_odd += 1
         return n_even, n_odd
 
     def get_even_odd_maps(self, tot_steps):
@@ -69,16 +88,15 @@ class Solver:
         return side_explored, total_width, even_squares, odd_squares
 
     def get_reachable(self, start, steps):
-        current = {start}
-        for _ in range(steps):
-            new_values = set()
-            for el in current:
-                for point in self._get_neighbours(el):
-                    new_values.add(point)
-            current = new_values
-            if len(current) == 0:
-                break
-        return current
+        # The garden is bipartite: a plot is reachable in exactly steps if it is
+        # at most that far and at the same parity, by walking back and forth
+        distances = self.get_distances(start)
+        if steps > 0 and len(distances) == 1:
+            return set()
+        reachable = {point for point, distance in distances.items() if distance <= steps and distance % 2 == steps % 2}
+        if metrics.enabled:
+            metrics.observe("reachable_plots", len(reachable))
+        return reachable
 
     def count_reachable(self, points_with_steps):
         reachable = set()
@@ -145,6 +163,72 @@ class Solver:
         return explored
 
 
+class ReferenceSolver(Solver):
+    """Walks (x, y) points of a list of rows step by step, the original algorithm."""
+
+    def parse(self, file):
+        self.data = list()
+        with inputs.open_text(file) as hand:
+            for line in hand:
+                line = line.strip()
+                self.data.append(line)
+                if "S" in line:
+                    self.start = (line.index("S"), len(self.data) - 1)
+        self.height = len(self.data)
+        self.width = len(self.data[0])
+
+    def _get_neighbours(self, point):
+        x, y = point
+        for point in [
+            (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)
+        ]:
+            new_x, new_y = point
+            if 0 <= new_x < self.width and 0 <= new_y < self.height and self.data[new_y][new_x] != "#":
+                yield point
+
+    def explore(self, start):
+        point_to_min_steps = {
+            start: 0,
+        }
+        current = {start}
+        steps = 0
+        n_even = 1
+        n_odd = 0
+        while len(current) > 0:
+            steps += 1
+            new_values = set()
+            for el in current:
+                for point in self._get_neighbours(el):
+                    if point in point_to_min_steps:
+                        continue
+                    point_to_min_steps[point] = steps
+                    if steps % 2 == 0:
+                        n_even += 1
+                    else:
+                        n_odd += 1
+                    new_values.add(point)
+            current = new_values
+        return n_even, n_odd
+
+    def get_reachable(self, start, steps):
+        current = {start}
+        for _ in range(steps):
+            new_values = set()
+            for el in current:
+                for point in self._get_neighbours(el):
+                    new_values.add(point)
+            current = new_values
+            if len(current) == 0:
+                break
+        return current
+
+
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
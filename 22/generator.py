@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+import random
+
+# Expected growth of each phase, as an exponent of size
+# Every brick may bring down all the bricks above it
+GROWTH = {"parse": 1, "solve1": 1, "solve2": 2}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Snapshot of 1400 * size bricks over a 10 * sqrt(size) wide square.
+
+    The bricks are first stacked as they would settle, then lifted by
+    offsets that never decrease from one brick to the next, so they never
+    intersect in the snapshot."""
+    rng = random.Random(seed)
+    n_bricks = max(1, int(1400 * size))
+    side = max(3, int(10 * size ** 0.5))
+    heights = dict()
+    bricks = list()
+    for _ in range(n_bricks):
+        axis = rng.randrange(3)
+        length = rng.randint(1, 4) if axis == 2 else rng.randint(1, min(5, side))
+        x = rng.randint(0, side - (length if axis == 0 else 1))
+        y = rng.randint(0, side - (length if axis == 1 else 1))
+        cells = [(x + (i if axis == 0 else 0), y + (i if axis == 1 else 0))
+                 for i in range(length if axis != 2 else 1)]
+        z = 1 + max(heights.get(cell, 0) for cell in cells)
+        top = z + (length - 1 if axis == 2 else 0)
+        for cell in cells:
+            heights[cell] = top
+        end_x, end_y = cells[-1]
+        bricks.append(((x, y, z), (end_x, end_y, top)))
+
+    lines = list()
+    offset = 0
+    for start, end in bricks:
+        offset += rng.randint(0, 3)
+        lines.append("%d,%d,%d~%d,%d,%d" % (
+            start[0], start[1], start[2] + offset, end[0], end[1], end[2] + offset
+        ))
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n", dict()
@@ -1,8 +1,16 @@
 #!/usr/bin/env python
+import os
+import sys
 from typing import Tuple, List
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.artifacts import ArtifactCache
+
 
 class Cube:
+    __slots__ = ("start", "end")
 
     def __init__(self, start: Tuple[int, int, int], end: Tuple[int, int, int]):
         self.start = start
@@ -72,10 +80,12 @@ class Solver:
 
     def __init__(self):
         self.data = None
+        self.artifacts = ArtifactCache("22", __file__)
 
     def parse(self, file):
+        self.artifacts.bind(file)
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 start, end = line.split("~")
@@ -106,6 +116,9 @@ class Solver:
         return falling
 
     def let_the_cubes_fall(self):
+        return self.artifacts.get("settled", (), self._let_the_cubes_fall)
+
+    def _let_the_cubes_fall(self):
         falling = self.get_falling_cubes()
         grid = self.build_grid()
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+import random
+
+N_JUNCTIONS = 6
+
+# Expected growth of each phase, as an exponent of size
+# The map area grows with the square of size, trails only linearly
+GROWTH = {"parse": 2, "solve1": 1, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Hiking map with a 6 x 6 lattice of junctions, 22 * size tiles apart.
+
+    The number of junctions is fixed, since the longest hike is
+    exponential in it; size makes the trails longer instead. Trails are
+    single width and may take a detour halfway, and the slopes around
+    junctions only allow going right or down."""
+    rng = random.Random(seed)
+    spacing = max(16, int(22 * size))
+    margin = spacing // 2
+    quarter = spacing // 4
+    side = 2 * margin + spacing * (N_JUNCTIONS - 1) + 1
+    grid = [["#"] * side for _ in range(side)]
+    positions = [margin + spacing * i for i in range(N_JUNCTIONS)]
+
+    def dig(points):
+        for (x, y), (next_x, next_y) in zip(points, points[1:]):
+            dx = (next_x > x) - (next_x < x)
+            dy = (next_y > y) - (next_y < y)
+            while (x, y) != (next_x, next_y):
+                grid[y][x] = "."
+                x, y = x + dx, y + dy
+            grid[y][x] = "."
+
+    def detour():
+        return rng.choice([-1, 1]) * rng.randint(2, quarter - 2)
+
+    for y in positions:
+        for x, next_x in zip(positions, positions[1:]):
+            bump = detour()
+            dig([(x, y), (x + quarter, y), (x + quarter, y + bump),
+                 (next_x - quarter, y + bump), (next_x - quarter, y), (next_x, y)])
+    for x in positions:
+        for y, next_y in zip(positions, positions[1:]):
+            bump = detour()
+            dig([(x, y), (x, y + quarter), (x + bump, y + quarter),
+                 (x + bump, next_y - quarter), (x, next_y - quarter), (x, next_y)])
+    dig([(positions[0], 0), (positions[0], positions[0])])
+    dig([(positions[-1], positions[-1]), (positions[-1], side - 1)])
+
+    for y in positions:
+        for x in positions:
+            neighbours = [(x + dx, y + dy) for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]]
+            open_neighbours = [(nx, ny) for nx, ny in neighbours if grid[ny][nx] == "."]
+            if len(open_neighbours) < 3:
+                continue
+            for nx, ny in open_neighbours:
+                grid[ny][nx] = ">" if ny == y else "v"
+    return "\n".join("".join(row) for row in grid) + "\n", dict()
@@ -1,14 +1,23 @@
 #!/usr/bin/env python
 import collections
-from typing import Tuple, Set
+import os
+import sys
+from typing import Set, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc import metrics
+from aoc.artifacts import ArtifactCache
+from aoc.graph import Graph, NodeIndex
+from aoc.grid import Grid, NEWLINE
 
-def get_direction(start, end):
-    sx, sy = start
-    ex, ey = end
-    return ex - sx, ey - sy
 
+PATH = ord(".")
+FOREST = ord("#")
+ARROWS = tuple(map(ord, "><v^"))
 
+# The reference engine keeps the original (x, y) points and directions
 ARROW_TO_DIRECTION = {
     ">": (1, 0),
     "<": (-1, 0),
@@ -16,7 +25,15 @@ ARROW_TO_DIRECTION = {
     "^": (0, -1),
 }
 
+
+def get_direction(start, end):
+    sx, sy = start
+    ex, ey = end
+    return ex - sx, ey - sy
+
+
 class Path:
+    __slots__ = ("start", "end", "length", "conjunctions")
 
     def __init__(self, start, end, length, conjunctions=None):
         self.start = start
@@ -31,48 +48,41 @@ class Path:
 class Solver:
 
     def __init__(self):
-        self.data = None
+        self.grid = None
         self.source = None
         self.target = None
         self.width = 0
         self.height = 0
+        self.arrow_to_direction = dict()
         self.ignore_slopes = False
+        self.artifacts = ArtifactCache("23", __file__)
 
     def parse(self, file):
-        self.data = list()
-        with open(file) as hand:
-            for line in hand:
-                line = line.strip()
-                self.data.append(line)
-        for x, el in enumerate(self.data[0]):
-            if el == ".":
-                self.source = (x, 0)
-        for x, el in enumerate(self.data[-1]):
-            if el == ".":
-                self.target = (x, len(self.data) - 1)
-        self.width = len(self.data[0])
-        self.height = len(self.data)
-
-    def _get_neighbours(self, point: Tuple[int, int], prev: Tuple[int, int] | None) -> Set[Tuple[int, int]]:
-        x, y = point
+        self.artifacts.bind(file)
+        self.grid = Grid.from_source(file)
+        # Points are cell indices of the grid
+        self.source = self.grid.cells.rfind(b".", 0, self.grid.width)
+        self.target = self.grid.cells.rfind(b".", self.grid.index(0, self.grid.height - 1))
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.arrow_to_direction = dict(zip(ARROWS, (self.grid.right, self.grid.left, self.grid.down, self.grid.up)))
+
+    def _get_neighbours(self, point: int, prev: int | None) -> Set[int]:
+        cells = self.grid.cells
+        size = self.grid.size
         neighbours = set()
-        for candidate in [(x-1, y), (x+1, y), (x, y+1), (x, y-1)]:
-            if candidate == prev:
+        for direction in self.grid.offsets:
+            candidate = point + direction
+            if candidate == prev or candidate < 0 or candidate >= size:
                 continue
-            cx, cy = candidate
-            if cx < 0 or cx >= self.width or cy < 0 or cy >= self.height:
+            cell = cells[candidate]
+            if cell == NEWLINE or cell == FOREST:
                 continue
-            if self.ignore_slopes:
-                if self.data[cy][cx] != "#":
-                    neighbours.add(candidate)
-            else:
-                if self.data[cy][cx] == ".":
-                    neighbours.add(candidate)
-                elif self.data[cy][cx] != "#" and get_direction(point, candidate) == ARROW_TO_DIRECTION[self.data[cy][cx]]:
-                    neighbours.add(candidate)
+            if self.ignore_slopes or cell == PATH or self.arrow_to_direction[cell] == direction:
+                neighbours.add(candidate)
         return neighbours
 
-    def get_path(self, start: Tuple[int, int], prev: Tuple[int, int] | None) -> Path:
+    def get_path(self, start: int, prev: int | None) -> Path:
         elements = list()
         elements.append(start)
 
@@ -92,6 +102,9 @@ class Solver:
                 return Path(start, end, len(elements), neighbours)
 
     def explore(self):
+        return self.artifacts.get("junctions", (self.ignore_slopes,), self._explore)
+
+    def _explore(self):
         paths = dict()
         current = {(None, self.source)}
         while len(current) > 0:
@@ -105,12 +118,7 @@ class Solver:
         return paths
 
     def _get_max_possible_length(self):
-        total_length = 0
-        for line in self.data:
-            for el in line:
-                if el != "#":
-                    total_length += 1
-        return total_length
+        return self.grid.size - self.grid.count(FOREST) - self.grid.count(NEWLINE)
 
     def get_required(self, paths, points):
         required = set()
@@ -119,6 +127,155 @@ class Solver:
                 required.add(path.start)
         return required
 
+    def build_graph(self, paths):
+        """Number the paths by their start, as nodes of a graph with an edge
+        to each of their conjunctions; path ends get the following ids so
+        that both can be tracked in the bitmasks of the search."""
+        nodes = NodeIndex(paths)
+        edges = list()
+        for start, path in paths.items():
+            nodes.add(path.end)
+            for conjunction in path.conjunctions:
+                edges.append((nodes[start], nodes[conjunction]))
+        return nodes, Graph.from_edges(len(nodes), edges)
+
+    def get_longest_hike(self):
+        paths = self.explore()
+
+        final_conjunction = None
+        for source, path in paths.items():
+            if path.end == self.target:
+                final_conjunction = source
+                break
+
+        required = list()
+        required.append({final_conjunction})
+        for _ in range(4):
+            r = self.get_required(paths, required[-1])
+            required.append(r)
+
+        assert final_conjunction is not None
+
+        nodes, graph = self.build_graph(paths)
+        offsets = graph.offsets
+        targets = graph.targets
+        lengths = [0] * len(nodes)
+        path_masks = [0] * len(nodes)
+        conjunction_masks = [0] * len(nodes)
+        reaches_final = [False] * len(nodes)
+        for start, path in paths.items():
+            node = nodes[start]
+            lengths[node] = path.length
+            path_masks[node] = (1 << node) | (1 << nodes[path.end])
+            for conjunction in path.conjunctions:
+                conjunction_masks[node] |= 1 << nodes[conjunction]
+            reaches_final[node] = final_conjunction in path.conjunctions
+        required_masks = [sum(1 << nodes[point] for point in points) for points in required]
+        final_length = paths[final_conjunction].length
+
+        current = collections.deque()
+        current.append((nodes[self.source], 0, 0, 0))
+        max_length = -1
+        collect_metrics = metrics.enabled
+        n_popped, n_pruned_visited, n_pruned_required, n_completed = 0, 0, 0, 0
+        while len(current) > 0:
+            if collect_metrics:
+                metrics.observe("stack_size", len(current))
+                n_popped += 1
+            node, length, prev_conjunctions, removed_conjunctions = current.pop()
+            current_length = length + lengths[node]
+            if prev_conjunctions & path_masks[node]:
+                n_pruned_visited += 1
+                continue
+
+            skip = False
+            for possibilities_req in required_masks:
+                if possibilities_req & removed_conjunctions == possibilities_req:
+                    skip = True
+                    break
+            if skip:
+                n_pruned_required += 1
+                continue
+
+            prev_conjunctions |= path_masks[node]
+
+            # Check if we got to the end
+            if reaches_final[node]:
+                path_length = current_length + final_length
+                max_length = max(max_length, path_length - 1)
+                n_completed += 1
+                continue
+
+            removed_conjunctions |= conjunction_masks[node]
+            for edge in range(offsets[node], offsets[node + 1]):
+                conjunction = targets[edge]
+                new_rem_conjunctions = removed_conjunctions & ~(1 << conjunction)
+                current.append((conjunction, current_length, prev_conjunctions, new_rem_conjunctions))
+        if collect_metrics:
+            metrics.count("states_popped", n_popped)
+            metrics.count("pruned_visited", n_pruned_visited)
+            metrics.count("pruned_required", n_pruned_required)
+            metrics.count("completed_hikes", n_completed)
+        return max_length
+
+    def solve1(self):
+        return self.get_longest_hike()
+
+    def solve2(self):
+        self.ignore_slopes = True
+        return self.get_longest_hike()
+
+
+class ReferenceSolver(Solver):
+    """Searches the junctions of (x, y) points with sets of visited and
+    removed junctions, the original algorithm."""
+
+    def parse(self, file):
+        self.data = list()
+        with inputs.open_text(file) as hand:
+            for line in hand:
+                line = line.strip()
+                self.data.append(line)
+        for x, el in enumerate(self.data[0]):
+            if el == ".":
+                self.source = (x, 0)
+        for x, el in enumerate(self.data[-1]):
+            if el == ".":
+                self.target = (x, len(self.data) - 1)
+        self.width = len(self.data[0])
+        self.height = len(self.data)
+
+    def _get_neighbours(self, point: Tuple[int, int], prev: Tuple[int, int] | None) -> Set[Tuple[int, int]]:
+        x, y = point
+        neighbours = set()
+        for candidate in [(x-1, y), (x+1, y), (x, y+1), (x, y-1)]:
+            if candidate == prev:
+                continue
+            cx, cy = candidate
+            if cx < 0 or cx >= self.width or cy < 0 or cy >= self.height:
+                continue
+            if self.ignore_slopes:
+                if self.data[cy][cx] != "#":
+                    neighbours.add(candidate)
+            else:
+                if self.data[cy][cx] == ".":
+                    neighbours.add(candidate)
+                elif self.data[cy][cx] != "#" and get_direction(point, candidate) == ARROW_TO_DIRECTION[self.data[cy][cx]]:
+                    neighbours.add(candidate)
+        return neighbours
+
+    def explore(self):
+        # Not shared with the artifact cache, which holds the junctions of the optimized engine
+        return self._explore()
+
+    def _get_max_possible_length(self):
+        total_length = 0
+        for line in self.data:
+            for el in line:
+                if el != "#":
+                    total_length += 1
+        return total_length
+
     def get_longest_hike(self):
         paths = self.explore()
 
@@ -171,12 +328,11 @@ class Solver:
                 current.append((conjunction, length + path.length, new_conjunctions, new_rem_conjunctions))
         return max_length
 
-    def solve1(self):
-        return self.get_longest_hike()
 
-    def solve2(self):
-        self.ignore_slopes = True
-        return self.get_longest_hike()
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
 
 
 def main():
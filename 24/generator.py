@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+import random
+
+SPEED_POOL = 300
+# Below size 1, too few hailstones share a speed for the solver to single
+# out the rock speed (it fails on most seeds at size 0.5 and below)
+MIN_SIZE = 1
+
+# Expected growth of each phase, as an exponent of size
+# Part 1 checks every pair of hailstones
+GROWTH = {"parse": 1, "solve1": 2, "solve2": 1}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """300 * size hailstones that are all hit by the same integer rock;
+    sizes below MIN_SIZE raise ValueError.
+
+    Speeds are drawn from a small pool so that many hailstones share a
+    speed along each axis, which the solver relies on; hailstone speeds
+    never match the rock speed (or its opposite) and never stand still on
+    the x axis."""
+    if size < MIN_SIZE:
+        raise ValueError(f"Size {size:g} is below the minimum size {MIN_SIZE} of day 24")
+    rng = random.Random(seed)
+    rock = [rng.randint(10 ** 14, 4 * 10 ** 14) for _ in range(3)]
+    rock_speed = [rng.choice([-1, 1]) * rng.randint(10, SPEED_POOL) for _ in range(3)]
+
+    times = rng.sample(range(10 ** 11, 10 ** 12), int(300 * size))
+    lines = list()
+    for time in times:
+        speed = list()
+        for axis in range(3):
+            while True:
+                value = rng.randint(-SPEED_POOL, SPEED_POOL)
+                if abs(value) != abs(rock_speed[axis]) and not (axis == 0 and value == 0):
+                    break
+            speed.append(value)
+        point = [rock[axis] + (rock_speed[axis] - speed[axis]) * time for axis in range(3)]
+        lines.append("%d, %d, %d @ %d, %d, %d" % (*point, *speed))
+    return "\n".join(lines) + "\n", {2: sum(rock)}
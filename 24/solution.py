@@ -1,10 +1,16 @@
 #!/usr/bin/env python
 import collections
 import math
+import os
+import sys
 from typing import Tuple, List, Set
 
 from modint import ChineseRemainderConstructor
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+
 
 def factorize(n: int) -> List[int]:
     res = [1]
@@ -29,6 +35,7 @@ def dot_prod(n: int, point: Tuple[int, ...]) -> Tuple[int, ...]:
 
 
 class HailstoneTrajectory:
+    __slots__ = ("start", "speed", "line_xy", "line_xz", "plane_x")
 
     def __init__(self, start, speed, line_xy, line_xz, plane_x):
         self.start = start
@@ -95,7 +102,7 @@ class Solver:
 
     def parse(self, file):
         self.data = list()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 point, speed = line.split(" @ ")
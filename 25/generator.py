@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+import random
+import string
+
+# Expected growth of each phase, as an exponent of size
+# Each contraction is linear and a trial contracts every node
+GROWTH = {"parse": 1, "solve1": 2}
+
+
+def generate(size: float = 1, seed: int = 0):
+    """Wiring diagram of 1500 * size components split in two clusters.
+
+    Every component has at least four wires inside its own cluster and
+    exactly three wires join the two clusters."""
+    rng = random.Random(seed)
+    n_nodes = max(10, int(1500 * size))
+
+    names = set()
+    while len(names) < n_nodes:
+        length = 3 if n_nodes < 26 ** 3 // 2 else 4
+        names.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    names = list(names)
+    rng.shuffle(names)
+    n_first = rng.randint(n_nodes // 3, 2 * n_nodes // 3)
+    clusters = [names[:n_first], names[n_first:]]
+
+    edges = set()
+
+    def connect(a, b):
+        if a != b and (b, a) not in edges:
+            edges.add((a, b))
+
+    for cluster in clusters:
+        # A random spanning tree first, then at least four wires per node
+        for i in range(1, len(cluster)):
+            connect(cluster[i], cluster[rng.randrange(i)])
+        for node in cluster:
+            for _ in range(4):
+                connect(node, rng.choice(cluster))
+    for _ in range(3):
+        while True:
+            edge = (rng.choice(clusters[0]), rng.choice(clusters[1]))
+            if edge not in edges:
+                edges.add(edge)
+                break
+
+    node_to_targets = dict()
+    for source, target in edges:
+        if rng.random() < 0.5:
+            source, target = target, source
+        node_to_targets.setdefault(source, list()).append(target)
+    lines = ["%s: %s" % (source, " ".join(targets)) for source, targets in node_to_targets.items()]
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n", {1: len(clusters[0]) * len(clusters[1])}
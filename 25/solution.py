@@ -1,9 +1,46 @@
 #!/usr/bin/env python
-import collections
+import os
 import random
-from typing import Tuple
-
-
+import sys
+from typing import List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc import inputs
+from aoc.graph import Graph, NodeIndex
+
+
+class Components:
+    """Union-find of the nodes merged by the contraction."""
+
+    def __init__(self, size: int):
+        self.parents = list(range(size))
+        self.sizes = [1] * size
+        self.count = size
+
+    def find(self, node: int) -> int:
+        parents = self.parents
+        root = node
+        while parents[root] != root:
+            root = parents[root]
+        while parents[node] != root:
+            parents[node], node = root, parents[node]
+        return root
+
+    def merge(self, node1: int, node2: int) -> bool:
+        root1 = self.find(node1)
+        root2 = self.find(node2)
+        if root1 == root2:
+            return False
+        if self.sizes[root1] < self.sizes[root2]:
+            root1, root2 = root2, root1
+        self.parents[root2] = root1
+        self.sizes[root1] += self.sizes[root2]
+        self.count -= 1
+        return True
+
+
+# The reference engine keeps the original edges, between node names joined by "-"
 class EdgesStore:
 
     def __init__(self):
@@ -32,12 +69,64 @@ class Solver:
 
     def __init__(self):
         self.nodes = None
-        self.edges = None
+        self.graph = None
+
+    def parse(self, file):
+        self.nodes = NodeIndex()
+        edges = list()
+        with inputs.open_text(file) as hand:
+            for line in hand:
+                line = line.strip()
+                source, targets = line.split(": ", maxsplit=2)
+                targets = targets.split(" ")
+                source = self.nodes.add(source)
+                for target in targets:
+                    edges.append((source, self.nodes.add(target)))
+        self.graph = Graph.from_edges(len(self.nodes), edges, undirected=True)
+
+    def get_edges(self) -> List[Tuple[int, int]]:
+        return [(source, target) for source, target in self.graph.iter_edges() if source < target]
+
+    def contract(self, edges: List[Tuple[int, int]]):
+        # https://en.wikipedia.org/wiki/Karger%27s_algorithm
+        # Contracting the edges in a random order, skipping those inside a merged node,
+        # is the same as picking a random remaining edge at each step
+        components = Components(len(self.nodes))
+        order = list(range(len(edges)))
+        random.shuffle(order)
+        for edge in order:
+            if components.count <= 2:
+                break
+            source, target = edges[edge]
+            components.merge(source, target)
+
+        cut = 0
+        for source, target in edges:
+            if components.find(source) != components.find(target):
+                cut += 1
+
+        prod = 1
+        for node in range(len(self.nodes)):
+            if components.find(node) == node:
+                prod *= components.sizes[node]
+
+        return cut, prod
+
+    def solve1(self):
+        edges = self.get_edges()
+        size, res = self.contract(edges)
+        while size > 3:
+            size, res = self.contract(edges)
+        return res
+
+
+class ReferenceSolver(Solver):
+    """Contracts a random edge of a list of named edges at each step, the original algorithm."""
 
     def parse(self, file):
         self.nodes = dict()
         self.edges = set()
-        with open(file) as hand:
+        with inputs.open_text(file) as hand:
             for line in hand:
                 line = line.strip()
                 source, targets = line.split(": ", maxsplit=2)
@@ -80,6 +169,12 @@ class Solver:
         return res
 
 
+ENGINES = {
+    "reference": ReferenceSolver,
+    "optimized": Solver,
+}
+
+
 def main():
     solver = Solver()
     solver.parse("input")
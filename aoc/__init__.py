@@ -0,0 +1 @@
+"""Shared tooling to run, time and inspect the daily solutions."""
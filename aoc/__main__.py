@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from aoc import artifacts
+from aoc import batch
+from aoc import bench
+from aoc import complexity
+from aoc import days
+from aoc import differential
+from aoc import membench
+from aoc import microbench
+from aoc import profiling
+from aoc import runner
+from aoc import service
+from aoc.parse_cache import ParseCache
+
+STDIN = "-"
+
+
+def _add_selection_arguments(parser):
+    parser.add_argument("--days", default="1-25", help="days to run, e.g. 1-25 or 1,3,10-12")
+    parser.add_argument("--parts", default="1,2", help="parts to solve, e.g. 1,2")
+
+
+def _add_engine_argument(parser):
+    parser.add_argument("--engine", default=None, choices=days.ENGINES,
+                        help="solver engine, days without it use their default one")
+
+
+def _add_parse_cache_arguments(parser):
+    parser.add_argument("--parse-cache", action="store_true",
+                        help="reuse the parsed inputs of previous runs")
+    parser.add_argument("--cache-dir", default=None,
+                        help="directory of the parse cache, by default next to each input")
+    parser.add_argument("--cache-size", type=float, default=256, help="maximum size of the parse cache (MiB)")
+
+
+def _add_artifact_cache_arguments(parser):
+    parser.add_argument("--artifact-cache", default=None,
+                        help="directory where the solvers keep their intermediate results across runs")
+    parser.add_argument("--artifact-cache-size", type=float, default=None,
+                        help="maximum size of the artifact cache (MiB)")
+
+
+def _get_parse_cache(args):
+    if not args.parse_cache:
+        return None
+    return ParseCache(args.cache_dir, int(args.cache_size * 2 ** 20))
+
+
+def _get_profiler(args):
+    if args.profile is None:
+        return None
+    return profiling.Profiler(args.profile, args.profile_dir, args.sample_interval)
+
+
+def cmd_run(args):
+    selected_days = days.parse_selection(args.days, days.DAYS)
+    parts = days.parse_selection(args.parts, days.PARTS)
+    start = time.perf_counter()
+    if args.input == STDIN:
+        if len(selected_days) != 1:
+            print("Reading the input from stdin needs a single day")
+            return 2
+        reports = [runner.run_solver(selected_days[0], sys.stdin.buffer, parts, trace_memory=args.trace_memory,
+                                     collect_metrics=args.metrics is not None, profiler=_get_profiler(args),
+                                     stream=args.stream, engine=args.engine, parallel_parts=args.parallel_parts)]
+    else:
+        reports = runner.run_days(selected_days, parts, input_name=args.input, jobs=args.jobs,
+                                  trace_memory=args.trace_memory, parse_cache=_get_parse_cache(args),
+                                  collect_metrics=args.metrics is not None, profiler=_get_profiler(args),
+                                  stream=args.stream, engine=args.engine, parallel_parts=args.parallel_parts)
+    elapsed = time.perf_counter() - start
+    if args.metrics is not None:
+        with open(args.metrics, "w") as hand:
+            json.dump(runner.get_metrics(reports), hand, indent=2)
+            hand.write("\n")
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print(runner.format_reports(reports))
+        print("Total wall time: %.4fs" % elapsed)
+    return 1 if any(report["error"] is not None for report in reports) else 0
+
+
+def cmd_generate(args):
+    selected_days = days.parse_selection(args.days, days.DAYS)
+    for day in selected_days:
+        if args.size < days.get_min_size(day):
+            print("Day %02d: skipped, the minimum size is %g" % (day, days.get_min_size(day)))
+            continue
+        content, answers = days.load_generator(day).generate(size=args.size, seed=args.seed)
+        name = args.output or "input-size%g-seed%d" % (args.size, args.seed)
+        path = days.get_input_path(day, name)
+        with open(path, "w") as hand:
+            hand.write(content)
+        known = ", ".join("part %d = %d" % item for item in sorted(answers.items()))
+        print("Day %02d: %s (%s)" % (day, path, known or "no known answers"))
+    return 0
+
+
+def cmd_bench(args):
+    selected_days = days.parse_selection(args.days, days.DAYS)
+    parts = days.parse_selection(args.parts, days.PARTS)
+    sizes = bench.parse_sizes(args.sizes)
+    baseline = None
+    if args.baseline is not None and os.path.exists(args.baseline):
+        baseline = bench.load_baseline(args.baseline)
+
+    with tempfile.TemporaryDirectory(prefix="aoc-bench-") as directory:
+        current = bench.run_benchmarks(selected_days, sizes, parts, repeat=args.repeat, seed=args.seed,
+                                       directory=directory, jobs=args.jobs, parse_cache=_get_parse_cache(args),
+                                       engine=args.engine)
+    print(bench.format_benchmark(current, baseline))
+    if args.save is not None:
+        bench.save_baseline(args.save, current)
+
+    # A solver that raises fails the run, with or without a baseline
+    failed = len(current["errors"]) > 0
+    if baseline is None:
+        return 1 if failed else 0
+    regressions = bench.find_regressions(current, baseline, args.threshold, args.min_time)
+    for regression in regressions:
+        if regression["new"] is None:
+            print("REGRESSION %(key)s %(metric)s" % regression)
+        else:
+            print("REGRESSION %(key)s %(metric)s: %(old)g -> %(new)g" % regression)
+    return 1 if failed or len(regressions) > 0 else 0
+
+
+def cmd_microbench(args):
+    names = microbench.select(args.filter)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    rows = microbench.run_benchmarks(names, sizes, repeat=args.repeat, seed=args.seed)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(microbench.format_rows(rows))
+    return 0
+
+
+def cmd_membench(args):
+    rows = membench.run_membench(membench.select(args.filter), count=args.count)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(membench.format_rows(rows))
+    return 0
+
+
+def cmd_batch(args):
+    parts = days.parse_selection(args.parts, days.PARTS)
+    paths = batch.list_inputs(args.directory, args.pattern)
+    failed = False
+    for report in batch.run_batch(args.day, paths, parts, jobs=args.jobs, parse_cache=_get_parse_cache(args),
+                                   stream=args.stream, engine=args.engine, parallel_parts=args.parallel_parts):
+        print(json.dumps(report), flush=True)
+        failed = failed or report["error"] is not None
+    return 1 if failed else 0
+
+
+def cmd_diff(args):
+    selected_days = days.parse_selection(args.days, days.DAYS)
+    if not args.all_days:
+        selected_days = differential.get_checked_days(selected_days)
+    parts = days.parse_selection(args.parts, days.PARTS)
+    sizes = [float(size) for size in args.sizes.split(",")]
+    start, end = args.seeds.split("-") if "-" in args.seeds else (args.seeds, args.seeds)
+    seeds = range(int(start), int(end) + 1)
+    failed = False
+    for row in differential.run_differential(selected_days, sizes, seeds, parts):
+        print(json.dumps(row) if args.json else differential.format_row(row), flush=True)
+        failed = failed or row["failed"]
+    return 1 if failed else 0
+
+
+def cmd_serve(args):
+    if args.unix is None:
+        print("Listening on http://%s:%d" % (args.host, args.port), flush=True)
+    else:
+        print("Listening on %s" % args.unix, flush=True)
+    service.run_service(jobs=args.jobs, max_entries=args.cache_entries, host=args.host, port=args.port,
+                        unix_path=args.unix)
+    return 0
+
+
+def cmd_complexity(args):
+    selected_days = days.parse_selection(args.days, days.DAYS)
+    parts = days.parse_selection(args.parts, days.PARTS)
+    sizes = complexity.get_sizes(args.start, args.factor, args.steps)
+    with tempfile.TemporaryDirectory(prefix="aoc-complexity-") as directory:
+        rows = complexity.analyze(selected_days, sizes, parts, repeat=args.repeat, seed=args.seed,
+                                  directory=directory, budget=args.budget, min_time=args.min_time,
+                                  tolerance=args.tolerance)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(complexity.format_rows(rows))
+    failed = any(row["error"] is not None or row["flagged"] for row in rows)
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m aoc")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="solve the selected days in a single process tree")
+    _add_selection_arguments(run_parser)
+    run_parser.add_argument("--input", default="input", help="name of the input file in each day folder, or - to read it from stdin")
+    run_parser.add_argument("--jobs", type=int, default=1,
+                            help="number of worker processes (0 for one per CPU)")
+    run_parser.add_argument("--trace-memory", action="store_true",
+                            help="trace the peak Python heap of each phase (slower)")
+    run_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    run_parser.add_argument("--parallel-parts", action="store_true",
+                            help="solve the parts of each day at the same time, in processes forked after the parse")
+    run_parser.add_argument("--stream", action="store_true",
+                            help="solve both parts in a single pass over the input, for the days that support it")
+    run_parser.add_argument("--metrics", default=None,
+                            help="collect the counters of the solver hot loops and write them to this JSON file")
+    run_parser.add_argument("--profile", nargs="?", const="cprofile", default=None, choices=profiling.MODES,
+                            help="write a speedscope profile of each phase, with cProfile or by sampling")
+    run_parser.add_argument("--profile-dir", default="profiles", help="directory of the profiles")
+    run_parser.add_argument("--sample-interval", type=float, default=0.001,
+                            help="CPU time between two samples of the sampling profiler (s)")
+    _add_engine_argument(run_parser)
+    _add_parse_cache_arguments(run_parser)
+    _add_artifact_cache_arguments(run_parser)
+    run_parser.set_defaults(func=cmd_run)
+
+    generate_parser = subparsers.add_parser("generate", help="write synthetic inputs for the selected days")
+    generate_parser.add_argument("--days", default="1-25", help="days to generate, e.g. 1-25 or 1,3,10-12")
+    generate_parser.add_argument("--size", type=float, default=1,
+                                 help="scale of the input, 1 is about the size of a puzzle input")
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--output", default=None,
+                                 help="name of the file written in each day folder")
+    generate_parser.set_defaults(func=cmd_generate)
+
+    bench_parser = subparsers.add_parser("bench", help="benchmark the solvers and check for regressions")
+    _add_selection_arguments(bench_parser)
+    bench_parser.add_argument("--sizes", default="0.1,1",
+                              help="generator sizes to run, 'input' stands for the puzzle input")
+    bench_parser.add_argument("--repeat", type=int, default=5, help="runs per day and size")
+    bench_parser.add_argument("--seed", type=int, default=0, help="seed of the generated inputs")
+    bench_parser.add_argument("--jobs", type=int, default=1,
+                              help="concurrent runs; more than one makes the timings noisier")
+    bench_parser.add_argument("--save", default=None, help="write the results to this baseline file")
+    bench_parser.add_argument("--baseline", default=None, help="baseline file to compare against")
+    bench_parser.add_argument("--threshold", type=float, default=0.2,
+                              help="relative slowdown (or memory growth) counted as a regression")
+    bench_parser.add_argument("--min-time", type=float, default=0.005,
+                              help="phases faster than this in the baseline are not compared by time")
+    _add_engine_argument(bench_parser)
+    _add_parse_cache_arguments(bench_parser)
+    _add_artifact_cache_arguments(bench_parser)
+    bench_parser.set_defaults(func=cmd_bench)
+
+    microbench_parser = subparsers.add_parser("microbench", help="time the operations of the shared data structures")
+    microbench_parser.add_argument("--filter", default=None, help="only run the benchmarks whose name contains this")
+    microbench_parser.add_argument("--sizes", default="100,10000", help="sizes of the structures, e.g. 100,10000")
+    microbench_parser.add_argument("--repeat", type=int, default=5, help="rounds per benchmark, the best one is kept")
+    microbench_parser.add_argument("--seed", type=int, default=0, help="seed of the random data")
+    microbench_parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    microbench_parser.set_defaults(func=cmd_microbench)
+
+    membench_parser = subparsers.add_parser("membench",
+                                            help="measure the bytes per instance of the small solver objects")
+    membench_parser.add_argument("--filter", default=None, help="only measure the objects whose name contains this")
+    membench_parser.add_argument("--count", type=int, default=100000, help="instances allocated per object")
+    membench_parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    membench_parser.set_defaults(func=cmd_membench)
+
+    batch_parser = subparsers.add_parser("batch", help="solve every input of a directory, printing JSON lines")
+    batch_parser.add_argument("day", type=int, choices=days.DAYS)
+    batch_parser.add_argument("directory", help="directory with one input file per account")
+    batch_parser.add_argument("--pattern", default="*", help="only solve the files matching this glob")
+    batch_parser.add_argument("--parts", default="1,2", help="parts to solve, e.g. 1,2")
+    batch_parser.add_argument("--jobs", type=int, default=0,
+                              help="number of worker processes (0 for one per CPU)")
+    batch_parser.add_argument("--parallel-parts", action="store_true",
+                              help="solve the parts of each input at the same time, in processes forked after the parse")
+    batch_parser.add_argument("--stream", action="store_true",
+                              help="solve both parts in a single pass over each input, if the day supports it")
+    _add_engine_argument(batch_parser)
+    _add_parse_cache_arguments(batch_parser)
+    batch_parser.set_defaults(func=cmd_batch)
+
+    diff_parser = subparsers.add_parser("diff", help="check that the engines of each day agree on generated inputs")
+    _add_selection_arguments(diff_parser)
+    diff_parser.add_argument("--sizes", default="0.1,0.5", help="generator sizes, e.g. 0.1,0.5")
+    diff_parser.add_argument("--seeds", default="0-9", help="range of generator seeds, e.g. 0-9")
+    diff_parser.add_argument("--all-days", action="store_true",
+                             help="also check the days with a single engine against the known answers")
+    diff_parser.add_argument("--json", action="store_true", help="print one JSON line per case")
+    diff_parser.set_defaults(func=cmd_diff)
+
+    serve_parser = subparsers.add_parser("serve", help="answer solve requests over HTTP from warm workers")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8023)
+    serve_parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    serve_parser.add_argument("--jobs", type=int, default=0,
+                              help="number of worker processes (0 for one per CPU)")
+    serve_parser.add_argument("--cache-entries", type=int, default=1024, help="number of results kept")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    complexity_parser = subparsers.add_parser("complexity",
+                                              help="fit how the time of each phase grows with the input size")
+    _add_selection_arguments(complexity_parser)
+    complexity_parser.add_argument("--start", type=float, default=0.05, help="smallest generator size")
+    complexity_parser.add_argument("--factor", type=float, default=2, help="ratio between consecutive sizes")
+    complexity_parser.add_argument("--steps", type=int, default=5, help="maximum number of sizes per day")
+    complexity_parser.add_argument("--repeat", type=int, default=3,
+                                   help="runs per size, the fastest one is kept")
+    complexity_parser.add_argument("--seed", type=int, default=0, help="seed of the generated inputs")
+    complexity_parser.add_argument("--budget", type=float, default=10,
+                                   help="stop growing a day once a run takes longer than this (s)")
+    complexity_parser.add_argument("--min-time", type=float, default=0.001,
+                                   help="timings below this are too noisy to be fitted")
+    complexity_parser.add_argument("--tolerance", type=float, default=0.3,
+                                   help="slack allowed above the declared exponent")
+    complexity_parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    complexity_parser.set_defaults(func=cmd_complexity)
+
+    return parser
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if getattr(args, "jobs", None) == 0:
+        args.jobs = os.cpu_count() or 1
+    # Passed through the environment, so that worker processes and solvers see them too
+    if getattr(args, "artifact_cache", None) is not None:
+        os.environ[artifacts.DIRECTORY_VARIABLE] = os.path.abspath(args.artifact_cache)
+    if getattr(args, "artifact_cache_size", None) is not None:
+        os.environ[artifacts.SIZE_VARIABLE] = str(args.artifact_cache_size)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import pickle
+from typing import Callable, Tuple
+
+from aoc import disk
+from aoc import inputs
+
+DIRECTORY_VARIABLE = "AOC_ARTIFACT_DIR"
+SIZE_VARIABLE = "AOC_ARTIFACT_SIZE"
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+SUFFIX = ".artifact"
+
+_MISSING = object()
+
+
+def get_directory() -> str | None:
+    return os.environ.get(DIRECTORY_VARIABLE) or None
+
+
+def get_max_bytes() -> int:
+    size = os.environ.get(SIZE_VARIABLE)
+    if size is None:
+        return DEFAULT_MAX_BYTES
+    return int(float(size) * 2 ** 20)
+
+
+class ArtifactCache:
+    """Intermediate results of a solver, keyed by the input and by the
+    parameters used to compute them.
+
+    Values are always kept in memory, so that both parts of a run share
+    them. When AOC_ARTIFACT_DIR is set they are also pickled there, for
+    later runs on the same input, and the least recently used ones are
+    removed once the folder exceeds AOC_ARTIFACT_SIZE MiB.
+    Cached values are shared: callers must not modify them."""
+
+    def __init__(self, namespace: str, source: str):
+        self.namespace = namespace
+        # The solver source is part of the key, so that editing it invalidates its artifacts
+        self.source = source
+        self.input_hash = None
+        self.values = dict()
+
+    def bind(self, source) -> None:
+        """Start caching the artifacts of a new input.
+
+        Streams can only be read once, by the parser: their artifacts are
+        only kept in memory."""
+        input_hash = inputs.hash_source(source)
+        self.input_hash = None if input_hash is None else (disk.hash_file(self.source), input_hash)
+        self.values = dict()
+
+    def _get_entry(self, directory: str, name: str, params: Tuple) -> str:
+        digest = hashlib.sha256(repr((self.input_hash, params)).encode()).hexdigest()
+        return os.path.join(directory, "%s-%s-%s%s" % (self.namespace, name, digest, SUFFIX))
+
+    def get(self, name: str, params: Tuple, compute: Callable):
+        """Return the artifact name for params, calling compute on a miss."""
+        key = (name, params)
+        if key in self.values:
+            return self.values[key]
+
+        directory = get_directory()
+        if directory is None or self.input_hash is None:
+            value = compute()
+            self.values[key] = value
+            return value
+
+        entry = self._get_entry(directory, name, params)
+        value = self._load(entry)
+        if value is _MISSING:
+            value = compute()
+            max_bytes = get_max_bytes()
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            if len(data) <= max_bytes:
+                disk.write_atomic(entry, data)
+                disk.evict_least_recent(directory, SUFFIX, max_bytes)
+        self.values[key] = value
+        return value
+
+    @staticmethod
+    def _load(entry: str):
+        try:
+            with open(entry, "rb") as hand:
+                value = pickle.load(hand)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Also raised by artifacts pickled by a solver run as a script, under __main__
+            return _MISSING
+        # Refresh the entry for the LRU eviction
+        os.utime(entry)
+        return value
@@ -0,0 +1,49 @@
+import concurrent.futures
+import fnmatch
+import os
+from typing import Dict, Iterator, List
+
+from aoc import days
+from aoc import runner
+from aoc.parse_cache import ParseCache
+
+
+def list_inputs(directory: str, pattern: str = "*") -> List[str]:
+    """Regular, non hidden files of directory matching pattern."""
+    paths = list()
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if entry.name.startswith(".") or not entry.is_file():
+            continue
+        if fnmatch.fnmatch(entry.name, pattern):
+            paths.append(entry.path)
+    return paths
+
+
+def _init_worker(day: int) -> None:
+    # Imported once per worker, every input solved by the worker reuses it
+    days.load_module(day)
+
+
+def _solve_input(day: int, path: str, parts, parse_cache: ParseCache = None, stream: bool = False,
+                 engine: str = None, parallel_parts: bool = False) -> Dict:
+    report = runner.run_solver(day, path, parts, parse_cache=parse_cache, stream=stream, engine=engine,
+                               parallel_parts=parallel_parts)
+    return dict(input=path, **report)
+
+
+def run_batch(day: int, paths: List[str], parts=days.PARTS, jobs: int = 1,
+              parse_cache: ParseCache = None, stream: bool = False, engine: str = None,
+              parallel_parts: bool = False) -> Iterator[Dict]:
+    """Solve every input of paths with the solver of day, yielding the
+    reports as soon as they are ready, so in completion order."""
+    if jobs <= 1:
+        for path in paths:
+            yield _solve_input(day, path, parts, parse_cache, stream, engine, parallel_parts)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                                initargs=(day,)) as executor:
+        futures = [executor.submit(_solve_input, day, path, parts, parse_cache, stream, engine, parallel_parts)
+                   for path in paths]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
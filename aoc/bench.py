@@ -0,0 +1,160 @@
+import concurrent.futures
+import json
+import os
+import platform
+from typing import Dict, List
+
+from aoc import days
+from aoc import runner
+from aoc.parse_cache import ParseCache
+
+PUZZLE_INPUT = "input"
+BASELINE_VERSION = 1
+
+
+def parse_sizes(value: str) -> List[str]:
+    """Sizes are generator scales, or 'input' for the puzzle input of each day."""
+    sizes = list()
+    for chunk in value.split(","):
+        chunk = chunk.strip()
+        if chunk == "":
+            continue
+        if chunk != PUZZLE_INPUT:
+            chunk = "%g" % float(chunk)
+        sizes.append(chunk)
+    return sizes
+
+
+def prepare_inputs(selected_days: List[int], sizes: List[str], seed: int, directory: str) -> Dict:
+    """Write the generated inputs once and return (day, size) -> path.
+
+    Sizes below the minimum size of a day are skipped for that day."""
+    paths = dict()
+    for day in selected_days:
+        for size in sizes:
+            if size == PUZZLE_INPUT:
+                path = days.get_input_path(day)
+                if not os.path.exists(path):
+                    continue
+            else:
+                if float(size) < days.get_min_size(day):
+                    continue
+                content, _ = days.load_generator(day).generate(size=float(size), seed=seed)
+                path = os.path.join(directory, "%02d-%s-%d" % (day, size, seed))
+                with open(path, "w") as hand:
+                    hand.write(content)
+            paths[(day, size)] = path
+    return paths
+
+
+def get_percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    position = (len(values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def summarize(times: List[float], rss: List[int]) -> Dict:
+    return {
+        "runs": len(times),
+        "median": get_percentile(times, 0.5),
+        "p10": get_percentile(times, 0.1),
+        "p90": get_percentile(times, 0.9),
+        "min": min(times),
+        "max": max(times),
+        "rss": max(rss),
+    }
+
+
+def run_benchmarks(selected_days: List[int], sizes: List[str], parts=days.PARTS, repeat: int = 5,
+                   seed: int = 0, directory: str = None, jobs: int = 1, parse_cache: ParseCache = None,
+                   engine: str = None) -> Dict:
+    """Run every (day, size) repeat times, each run in a fresh process.
+
+    A fresh process per run keeps the peak RSS of a run independent of
+    the others. Keys of the result are 'DD/size/phase'."""
+    paths = prepare_inputs(selected_days, sizes, seed, directory)
+    samples = dict()
+    errors = dict()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as executor:
+        futures = dict()
+        for (day, size), path in paths.items():
+            for _ in range(repeat):
+                future = executor.submit(runner.run_solver, day, path, parts, False, parse_cache,
+                                         engine=engine)
+                futures[future] = (day, size)
+        for future in concurrent.futures.as_completed(futures):
+            day, size = futures[future]
+            report = future.result()
+            if report["error"] is not None:
+                errors["%02d/%s" % (day, size)] = report["error"]
+            for phase in report["phases"]:
+                key = "%02d/%s/%s" % (day, size, phase["phase"])
+                times, rss = samples.setdefault(key, (list(), list()))
+                times.append(phase["time"])
+                rss.append(phase["rss"])
+
+    results = {key: summarize(times, rss) for key, (times, rss) in sorted(samples.items())}
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "seed": seed,
+        "repeat": repeat,
+        "engine": engine,
+        "results": results,
+        "errors": errors,
+    }
+
+
+def load_baseline(path: str) -> Dict:
+    with open(path) as hand:
+        baseline = json.load(hand)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}")
+    return baseline
+
+
+def save_baseline(path: str, benchmark: Dict) -> None:
+    with open(path, "w") as hand:
+        json.dump(benchmark, hand, indent=2, sort_keys=True)
+        hand.write("\n")
+
+
+def find_regressions(current: Dict, baseline: Dict, threshold: float, min_time: float) -> List[Dict]:
+    """Compare medians and peak RSS of the phases measured in both runs.
+
+    Phases faster than min_time in the baseline are too noisy to compare
+    by time, but their memory is still checked. A phase of the baseline
+    that is missing from an input measured again (its solver now raises)
+    is a regression too."""
+    regressions = list()
+    measured = {key.rsplit("/", 1)[0] for key in current["results"]} | set(current["errors"])
+    for key, old in baseline["results"].items():
+        if key not in current["results"] and key.rsplit("/", 1)[0] in measured:
+            regressions.append({"key": key, "metric": "missing", "old": old["median"], "new": None})
+    for key, stats in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        if old["median"] >= min_time and stats["median"] > old["median"] * (1 + threshold):
+            regressions.append({"key": key, "metric": "median", "old": old["median"], "new": stats["median"]})
+        if stats["rss"] > old["rss"] * (1 + threshold):
+            regressions.append({"key": key, "metric": "rss", "old": old["rss"], "new": stats["rss"]})
+    return regressions
+
+
+def format_benchmark(current: Dict, baseline: Dict = None) -> str:
+    lines = ["key                    median (s)    p90 (s)  rss (MiB)  change"]
+    for key, stats in current["results"].items():
+        change = ""
+        if baseline is not None and key in baseline["results"]:
+            old = baseline["results"][key]["median"]
+            if old > 0:
+                change = "%+.1f%%" % (100 * (stats["median"] - old) / old)
+        lines.append("%-20s %12.4f %10.4f %10.1f  %s" % (
+            key, stats["median"], stats["p90"], stats["rss"] / 2 ** 20, change
+        ))
+    for key, error in current["errors"].items():
+        lines.append("%-20s error: %s" % (key, error))
+    return "\n".join(lines)
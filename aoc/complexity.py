@@ -0,0 +1,95 @@
+import math
+from typing import Dict, List, Tuple
+
+from aoc import bench
+from aoc import days
+from aoc import runner
+
+
+def get_sizes(start: float, factor: float, steps: int) -> List[float]:
+    return [start * factor ** i for i in range(steps)]
+
+
+def fit_exponent(points: List[Tuple[float, float]]) -> float | None:
+    """Least squares slope of log(time) over log(size)."""
+    if len({size for size, _ in points}) < 2:
+        return None
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(elapsed) for _, elapsed in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    return covariance / variance
+
+
+def measure_growth(day: int, sizes: List[float], parts=days.PARTS, repeat: int = 1, seed: int = 0,
+                   directory: str = None, budget: float = 10) -> Tuple[Dict, str | None]:
+    """Return phase -> [(size, best time)] for increasing sizes.
+
+    Sizes stop growing once a run of the day takes more than budget
+    seconds, so that super-linear solvers do not run forever; sizes below
+    the minimum size of the day are skipped."""
+    points = dict()
+    for size in sizes:
+        if size < days.get_min_size(day):
+            continue
+        size_label = "%g" % size
+        path = bench.prepare_inputs([day], [size_label], seed, directory)[(day, size_label)]
+        best = dict()
+        for _ in range(repeat):
+            report = runner.run_solver(day, path, parts)
+            if report["error"] is not None:
+                return points, report["error"]
+            for phase in report["phases"]:
+                best[phase["phase"]] = min(best.get(phase["phase"], math.inf), phase["time"])
+        for phase, elapsed in best.items():
+            points.setdefault(phase, list()).append((size, elapsed))
+        if sum(best.values()) > budget:
+            break
+    return points, None
+
+
+def analyze(selected_days: List[int], sizes: List[float], parts=days.PARTS, repeat: int = 1, seed: int = 0,
+            directory: str = None, budget: float = 10, min_time: float = 0.001,
+            tolerance: float = 0.3) -> List[Dict]:
+    """Fit the growth exponent of every phase and compare it to the bound
+    declared in GROWTH by the generator of the day.
+
+    Timings below min_time are dominated by noise and left out of the fit."""
+    rows = list()
+    for day in selected_days:
+        bounds = getattr(days.load_generator(day), "GROWTH", dict())
+        points, error = measure_growth(day, sizes, parts, repeat, seed, directory, budget)
+        if error is not None:
+            rows.append({"day": day, "phase": None, "error": error})
+            continue
+        for phase, phase_points in points.items():
+            measurable = [(size, elapsed) for size, elapsed in phase_points if elapsed >= min_time]
+            exponent = fit_exponent(measurable) if len(measurable) >= 3 else None
+            bound = bounds.get(phase)
+            rows.append({
+                "day": day,
+                "phase": phase,
+                "exponent": exponent,
+                "bound": bound,
+                "flagged": exponent is not None and bound is not None and exponent > bound + tolerance,
+                "points": phase_points,
+                "error": None,
+            })
+    return rows
+
+
+def format_rows(rows: List[Dict]) -> str:
+    lines = ["day  phase    exponent  bound  sizes (s)"]
+    for row in rows:
+        if row["error"] is not None:
+            lines.append("%02d   error: %s" % (row["day"], row["error"]))
+            continue
+        exponent = "n/a" if row["exponent"] is None else "%.2f" % row["exponent"]
+        bound = "-" if row["bound"] is None else "%g" % row["bound"]
+        timings = " ".join("%g:%.4f" % point for point in row["points"])
+        lines.append("%02d   %-7s %9s  %5s  %s%s" % (
+            row["day"], row["phase"], exponent, bound, timings, "  FLAGGED" if row["flagged"] else ""
+        ))
+    return "\n".join(lines)
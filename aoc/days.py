@@ -0,0 +1,107 @@
+import importlib.util
+import os
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAYS = tuple(range(1, 26))
+PARTS = (1, 2)
+
+# Every day has a reference engine, the plain algorithm the faster ones are checked against
+REFERENCE = "reference"
+OPTIMIZED = "optimized"
+# Only registered by the days that have it when numpy is installed
+NUMPY = "numpy"
+ENGINES = (REFERENCE, OPTIMIZED, NUMPY)
+
+
+def get_day_dir(day: int) -> str:
+    return os.path.join(ROOT, "%02d" % day)
+
+
+def get_input_path(day: int, name: str = "input") -> str:
+    return os.path.join(get_day_dir(day), name)
+
+
+def _load(day: int, filename: str, name: str):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    path = os.path.join(get_day_dir(day), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before executing so that pickle can find the solver classes
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def load_module(day: int):
+    """Import NN/solution.py once per process and return the module."""
+    return _load(day, "solution.py", "aoc_day%02d" % day)
+
+
+def load_generator(day: int):
+    """Import NN/generator.py once per process and return the module."""
+    return _load(day, "generator.py", "aoc_gen%02d" % day)
+
+
+def get_engines(day: int) -> Dict[str, type]:
+    """Solver class of each engine of day, from the ENGINES dict of its module.
+
+    A day without ENGINES has a single engine, its Solver, which is both
+    the reference and the optimized one."""
+    module = load_module(day)
+    return getattr(module, "ENGINES", {REFERENCE: module.Solver})
+
+
+def get_solver_class(day: int, engine: str = None):
+    """Solver of the given engine, the default Solver of the day if it has no such engine."""
+    module = load_module(day)
+    if engine is None:
+        return module.Solver
+    return getattr(module, "ENGINES", dict()).get(engine, module.Solver)
+
+
+def get_engine_name(day: int, engine: str = None) -> str:
+    """Name of the engine get_solver_class runs for the given one: the
+    engine itself if the day has it, else the engine of its default Solver."""
+    engines = get_engines(day)
+    if engine in engines:
+        return engine
+    solver_class = load_module(day).Solver
+    return next(name for name, cls in engines.items() if cls is solver_class)
+
+
+def get_min_size(day: int) -> float:
+    """Smallest size the generator of day supports, from the MIN_SIZE of its module."""
+    return getattr(load_generator(day), "MIN_SIZE", 0)
+
+
+def get_parts(day: int) -> List[int]:
+    solver_class = get_solver_class(day)
+    return [part for part in PARTS if hasattr(solver_class, "solve%d" % part)]
+
+
+def parse_selection(value: str, valid) -> List[int]:
+    """Parse selections like '1-25' or '1,3,10-12'."""
+    selected = list()
+    for chunk in value.split(","):
+        chunk = chunk.strip()
+        if chunk == "":
+            continue
+        if "-" in chunk:
+            start, end = chunk.split("-", maxsplit=1)
+            values = range(int(start), int(end) + 1)
+        else:
+            values = [int(chunk)]
+        for item in values:
+            if item not in valid:
+                raise ValueError(f"Invalid value {item}")
+            if item not in selected:
+                selected.append(item)
+    return selected
@@ -0,0 +1,103 @@
+"""Differential checks of the engines of each day on generated inputs.
+
+Every engine of a day solves the same inputs, made by the generator of
+the day with a range of seeds; a case fails when two engines disagree,
+or when an engine disagrees with an answer the generator knows by
+construction, or when an engine raises.
+
+The DIFF_OPTIONS of a generator are passed to it, for inputs that the
+other commands do not make. Each part is solved on its own, so that an
+engine rejecting one part still answers the others; a part rejected by
+every engine is expected when the generator has no answer for it (the
+input is not valid for that part), and does not fail."""
+from typing import Dict, Iterator, List
+
+from aoc import days
+from aoc import runner
+
+GENERATOR = "generator"
+
+
+def _get_engines(day: int) -> List[str]:
+    try:
+        return list(days.get_engines(day))
+    except ImportError:
+        # Missing dependency: the single engine fails on every input, and reports why
+        return [days.REFERENCE]
+
+
+def get_checked_days(selected_days: List[int]) -> List[int]:
+    """The selected days with more than one engine."""
+    return [day for day in selected_days if len(_get_engines(day)) > 1]
+
+
+def check_case(day: int, size: float, seed: int, parts=days.PARTS) -> Dict:
+    generator = days.load_generator(day)
+    content, answers = generator.generate(size=size, seed=seed, **getattr(generator, "DIFF_OPTIONS", dict()))
+    data = content.encode()
+    engines = _get_engines(day)
+    results = dict()
+    errors = dict()
+    for engine in engines:
+        results[engine] = dict()
+        for part in parts:
+            report = runner.run_solver(day, data, (part,), engine=engine)
+            if report["error"] is not None:
+                errors.setdefault(engine, dict())[part] = report["error"]
+            for phase in report["phases"]:
+                if phase["phase"] == "solve%d" % part:
+                    results[engine][part] = phase["result"]
+
+    rejected = [
+        part for part in parts
+        if part not in answers and all(part in errors.get(engine, ()) for engine in engines)
+    ]
+    for engine in list(errors):
+        for part in rejected:
+            errors[engine].pop(part, None)
+        if len(errors[engine]) == 0:
+            del errors[engine]
+
+    mismatches = list()
+    for part in parts:
+        values = {engine: result[part] for engine, result in results.items() if part in result}
+        if part in answers:
+            values[GENERATOR] = answers[part]
+        if len(set(values.values())) > 1:
+            mismatches.append(part)
+    return {
+        "day": day,
+        "size": size,
+        "seed": seed,
+        "results": results,
+        "answers": {part: answers[part] for part in parts if part in answers},
+        "mismatches": mismatches,
+        "rejected": rejected,
+        "errors": errors,
+        "failed": len(mismatches) > 0 or len(errors) > 0,
+    }
+
+
+def run_differential(selected_days: List[int], sizes: List[float], seeds: List[int],
+                     parts=days.PARTS) -> Iterator[Dict]:
+    """Check every day on every (size, seed) input it supports, yielding one row per case."""
+    for day in selected_days:
+        for size in sizes:
+            if size < days.get_min_size(day):
+                continue
+            for seed in seeds:
+                yield check_case(day, size, seed, parts)
+
+
+def format_row(row: Dict) -> str:
+    status = "FAIL" if row["failed"] else "ok"
+    line = "%02d  size %-6g seed %-5d %s" % (row["day"], row["size"], row["seed"], status)
+    for part in row["mismatches"]:
+        values = ["%s=%s" % (engine, result.get(part)) for engine, result in row["results"].items()]
+        if part in row["answers"]:
+            values.append("%s=%s" % (GENERATOR, row["answers"][part]))
+        line += "\n    part %d: %s" % (part, ", ".join(values))
+    for engine, part_errors in row["errors"].items():
+        for part, error in part_errors.items():
+            line += "\n    part %d, %s: %s" % (part, engine, error)
+    return line
@@ -0,0 +1,40 @@
+import hashlib
+import os
+import tempfile
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as hand:
+        for chunk in iter(lambda: hand.read(2 ** 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write and rename, so that concurrent runs never read a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "wb") as hand:
+        hand.write(data)
+    os.replace(temp_path, path)
+
+
+def evict_least_recent(directory: str, suffix: str, max_bytes: int) -> None:
+    """Remove the files with the oldest mtime until the others fit in max_bytes."""
+    entries = list()
+    for item in os.scandir(directory):
+        if item.name.endswith(suffix):
+            stat = item.stat()
+            entries.append((stat.st_mtime, stat.st_size, item.path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
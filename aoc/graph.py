@@ -0,0 +1,201 @@
+"""Directed graphs on dense integer nodes, in compressed sparse rows.
+
+Node names are interned to 0..n-1 by NodeIndex. The edges leaving node i
+are the edge ids offsets[i] to offsets[i + 1] - 1: their targets (and
+weights) are stored contiguously in flat arrays, in the order the edges
+were added, so traversals only index arrays of ints."""
+import heapq
+from array import array
+from typing import Hashable, Iterable, List, Tuple
+
+UNREACHABLE = -1
+TYPECODE = "q"
+
+
+class NodeIndex:
+    """Map hashable node names to dense ints, in order of first use."""
+
+    def __init__(self, names: Iterable[Hashable] = ()):
+        self.ids = dict()
+        self.names = list()
+        for name in names:
+            self.add(name)
+
+    def add(self, name: Hashable) -> int:
+        node = self.ids.get(name)
+        if node is None:
+            node = len(self.names)
+            self.ids[name] = node
+            self.names.append(name)
+        return node
+
+    def name(self, node: int) -> Hashable:
+        return self.names[node]
+
+    def __getitem__(self, name: Hashable) -> int:
+        return self.ids[name]
+
+    def __contains__(self, name: Hashable) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class Graph:
+
+    def __init__(self, offsets: array, targets: array, weights: array | None = None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.size = len(offsets) - 1
+
+    @classmethod
+    def from_edges(cls, size: int, edges: Iterable[Tuple[int, int]], weights: Iterable[int] = None,
+                   undirected: bool = False) -> 'Graph':
+        """Build the graph of size nodes from (source, target) pairs.
+
+        With undirected every edge is also added in the opposite direction."""
+        edges = list(edges)
+        weights = None if weights is None else list(weights)
+        if undirected:
+            edges += [(target, source) for source, target in edges]
+            if weights is not None:
+                weights += weights
+
+        offsets = array(TYPECODE, bytes(8 * (size + 1)))
+        for source, _ in edges:
+            offsets[source + 1] += 1
+        for node in range(size):
+            offsets[node + 1] += offsets[node]
+
+        # Counting sort by source, stable so that each node keeps the order of its edges
+        cursor = offsets[:-1]
+        targets = array(TYPECODE, bytes(8 * len(edges)))
+        sorted_weights = None if weights is None else array(TYPECODE, bytes(8 * len(edges)))
+        for edge, (source, target) in enumerate(edges):
+            position = cursor[source]
+            cursor[source] = position + 1
+            targets[position] = target
+            if sorted_weights is not None:
+                sorted_weights[position] = weights[edge]
+        return cls(offsets, targets, sorted_weights)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def neighbours(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def edges(self, node: int) -> range:
+        return range(self.offsets[node], self.offsets[node + 1])
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def iter_edges(self) -> Iterable[Tuple[int, int]]:
+        offsets = self.offsets
+        targets = self.targets
+        for source in range(self.size):
+            for edge in range(offsets[source], offsets[source + 1]):
+                yield source, targets[edge]
+
+    def reversed(self) -> 'Graph':
+        weights = self.weights
+        return Graph.from_edges(self.size, ((target, source) for source, target in self.iter_edges()),
+                                weights=None if weights is None else weights.tolist())
+
+    def bfs(self, source: int) -> List[int]:
+        """Number of edges on the shortest path to each node, UNREACHABLE if none."""
+        offsets = self.offsets
+        targets = self.targets
+        distances = [UNREACHABLE] * self.size
+        distances[source] = 0
+        frontier = [source]
+        distance = 0
+        while len(frontier) > 0:
+            distance += 1
+            next_frontier = list()
+            for node in frontier:
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    if distances[target] == UNREACHABLE:
+                        distances[target] = distance
+                        next_frontier.append(target)
+            frontier = next_frontier
+        return distances
+
+    def dfs(self, source: int) -> List[int]:
+        """Nodes reachable from source in depth-first preorder."""
+        offsets = self.offsets
+        targets = self.targets
+        visited = bytearray(self.size)
+        order = list()
+        stack = [source]
+        while len(stack) > 0:
+            node = stack.pop()
+            if visited[node]:
+                continue
+            visited[node] = 1
+            order.append(node)
+            # Reversed, so that the first neighbour is visited first
+            for edge in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+                target = targets[edge]
+                if not visited[target]:
+                    stack.append(target)
+        return order
+
+    def dijkstra(self, source: int) -> List[int]:
+        """Weight of the lightest path to each node, UNREACHABLE if none.
+
+        Edges without weights count as 1."""
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        distances = [UNREACHABLE] * self.size
+        queue = [(0, source)]
+        while len(queue) > 0:
+            distance, node = heapq.heappop(queue)
+            if distances[node] != UNREACHABLE:
+                continue
+            distances[node] = distance
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if distances[target] == UNREACHABLE:
+                    weight = 1 if weights is None else weights[edge]
+                    heapq.heappush(queue, (distance + weight, target))
+        return distances
+
+    def components(self) -> List[int]:
+        """Label each node with its connected component, ignoring edge directions.
+
+        Labels are dense, in order of the smallest node of each component."""
+        parents = list(range(self.size))
+
+        def find(node: int) -> int:
+            root = node
+            while parents[root] != root:
+                root = parents[root]
+            while parents[node] != root:
+                parents[node], node = root, parents[node]
+            return root
+
+        for source, target in self.iter_edges():
+            source_root = find(source)
+            target_root = find(target)
+            if source_root != target_root:
+                if source_root < target_root:
+                    parents[target_root] = source_root
+                else:
+                    parents[source_root] = target_root
+
+        labels = [0] * self.size
+        root_to_label = dict()
+        for node in range(self.size):
+            root = find(node)
+            label = root_to_label.get(root)
+            if label is None:
+                label = len(root_to_label)
+                root_to_label[root] = label
+            labels[node] = label
+        return labels
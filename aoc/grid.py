@@ -0,0 +1,94 @@
+"""Rectangular text grids stored in a single buffer of bytes.
+
+Cells are addressed by integer indices, y * stride + x. Rows keep their
+trailing newline, so the stride is width + 1 and a step off the left or
+right side of a row lands on a newline: together with a range check for
+the first and last row, every bounds check is a comparison on integers.
+
+Cells may also be a read-only buffer, such as the mmap of a large input
+file that already ends with a single newline: solvers only index them and
+call find and rfind."""
+from typing import Iterator, Tuple
+
+from aoc import inputs
+
+NEWLINE = ord("\n")
+COUNT_CHUNK = 2 ** 20
+
+
+def _is_normalized(cells) -> bool:
+    return cells.find(b"\r") == -1 and cells[-1:] == b"\n" and cells[-2:-1] != b"\n"
+
+
+class Grid:
+
+    def __init__(self, cells):
+        if isinstance(cells, memoryview) or not _is_normalized(cells):
+            if not isinstance(cells, bytearray):
+                cells = bytearray(cells)
+            if b"\r" in cells:
+                cells = bytearray(cells.replace(b"\r\n", b"\n"))
+            while cells.endswith(b"\n"):
+                del cells[-1]
+            cells.append(NEWLINE)
+        self.cells = cells
+        self.size = len(cells)
+        self.width = cells.find(b"\n")
+        self.stride = self.width + 1
+        if self.size % self.stride != 0:
+            raise ValueError("Rows of the grid have different lengths")
+        self.height = self.size // self.stride
+        self.up = -self.stride
+        self.down = self.stride
+        self.left = -1
+        self.right = 1
+        self.offsets = (self.up, self.down, self.left, self.right)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Grid':
+        return cls(bytearray(data))
+
+    @classmethod
+    def from_source(cls, source) -> 'Grid':
+        """Grid of a path, binary stream or buffer (see aoc.inputs).
+
+        Files are read straight into the cells, without per-line copies,
+        and large ones are memory-mapped."""
+        return cls(inputs.read_bytes(source))
+
+    def __getstate__(self):
+        # An mmap cannot be pickled, store its content
+        state = dict(vars(self))
+        if not isinstance(self.cells, (bytes, bytearray)):
+            state["cells"] = bytes(self.cells)
+        return state
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.stride + x
+
+    def coords(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x, y
+
+    def is_inside(self, index: int) -> bool:
+        return 0 <= index < self.size and self.cells[index] != NEWLINE
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        cells = self.cells
+        size = self.size
+        for offset in self.offsets:
+            neighbour = index + offset
+            if 0 <= neighbour < size and cells[neighbour] != NEWLINE:
+                yield neighbour
+
+    def find(self, value: bytes) -> int:
+        return self.cells.find(value)
+
+    def count(self, value: int) -> int:
+        # In slices, since an mmap has no count
+        cells = self.cells
+        return sum(cells[start:start + COUNT_CHUNK].count(value) for start in range(0, self.size, COUNT_CHUNK))
+
+    def row(self, y: int) -> memoryview:
+        start = y * self.stride
+        return memoryview(self.cells)[start:start + self.width]
@@ -0,0 +1,92 @@
+"""Puzzle inputs given as paths, binary streams or in-memory buffers.
+
+Every Solver.parse accepts a source of any of these kinds: a path, a
+binary file object (for instance sys.stdin.buffer) or a bytes-like object
+(bytes, bytearray, memoryview, mmap). Files larger than MMAP_THRESHOLD are
+memory-mapped by read_bytes instead of being read."""
+import contextlib
+import hashlib
+import io
+import mmap
+import os
+from typing import BinaryIO, Iterator, TextIO
+
+from aoc import disk
+
+MMAP_THRESHOLD = 4 * 2 ** 20
+
+
+def is_path(source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def is_stream(source) -> bool:
+    return not is_path(source) and hasattr(source, "read") and not isinstance(source, mmap.mmap)
+
+
+def read_bytes(source, mmap_threshold: int = None):
+    """The whole content of source, as a bytes-like object.
+
+    Large files are returned as a read-only mmap, which only supports the
+    sequence and find methods of bytes; buffers are returned as they are."""
+    if mmap_threshold is None:
+        mmap_threshold = MMAP_THRESHOLD
+    if is_path(source):
+        with open(source, "rb") as hand:
+            size = os.fstat(hand.fileno()).st_size
+            if size >= mmap_threshold > 0:
+                return mmap.mmap(hand.fileno(), 0, access=mmap.ACCESS_READ)
+            content = bytearray(size)
+            hand.readinto(content)
+            return content
+    if is_stream(source):
+        content = source.read()
+        return content.encode() if isinstance(content, str) else content
+    # Raises TypeError for anything that is not a buffer
+    memoryview(source)
+    return source
+
+
+@contextlib.contextmanager
+def open_text(source) -> Iterator[TextIO]:
+    """Open source as a text stream, to be read line by line like a file."""
+    if is_path(source):
+        with open(source) as hand:
+            yield hand
+    elif is_stream(source):
+        if isinstance(source, io.TextIOBase):
+            yield source
+            return
+        hand = io.TextIOWrapper(source)
+        try:
+            yield hand
+        finally:
+            # Leave the stream of the caller open
+            hand.detach()
+    else:
+        with io.TextIOWrapper(io.BytesIO(source)) as hand:
+            yield hand
+
+
+def iter_lines(source) -> Iterator[str]:
+    """Lines of source, with their newline, read one at a time."""
+    with open_text(source) as hand:
+        yield from hand
+
+
+def open_binary(source) -> BinaryIO:
+    """Open source as a binary stream; streams are returned as they are."""
+    if is_path(source):
+        return open(source, "rb")
+    if is_stream(source):
+        return source
+    return io.BytesIO(source)
+
+
+def hash_source(source) -> str | None:
+    """sha256 of the content of source, None for streams that can be read only once."""
+    if is_path(source):
+        return disk.hash_file(source)
+    if is_stream(source):
+        return None
+    return hashlib.sha256(source).hexdigest()
@@ -0,0 +1,239 @@
+"""Sets of integers as sorted intervals, and boxes made of intervals.
+
+Intervals are half-open, [start, end). An IntervalSet keeps its intervals
+sorted, disjoint and coalesced (no two touch), in two parallel lists of
+starts and ends, so that point operations find their place with bisect.
+
+Only the lookups are O(log n): add, remove and split splice or copy the
+lists, which is O(n) in the number of intervals (a memmove, fast while
+the sets stay small, as in the puzzles)."""
+import bisect
+import itertools
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+
+class IntervalSet:
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self.starts = list()
+        self.ends = list()
+        for start, end in intervals:
+            self.add(start, end)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def __len__(self) -> int:
+        """Number of intervals, see size for the number of integers."""
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.starts == other.starts and self.ends == other.ends
+
+    def __repr__(self) -> str:
+        return "IntervalSet(%s)" % list(self)
+
+    def __contains__(self, value: int) -> bool:
+        idx = bisect.bisect_right(self.starts, value) - 1
+        return idx >= 0 and value < self.ends[idx]
+
+    def copy(self) -> 'IntervalSet':
+        result = IntervalSet()
+        result.starts = self.starts.copy()
+        result.ends = self.ends.copy()
+        return result
+
+    def size(self) -> int:
+        return sum(self.ends) - sum(self.starts)
+
+    def min(self) -> int:
+        return self.starts[0]
+
+    def max(self) -> int:
+        return self.ends[-1] - 1
+
+    def _get_overlapping(self, start: int, end: int) -> Tuple[int, int]:
+        """Range of the intervals that share at least an integer with [start, end)."""
+        return bisect.bisect_right(self.ends, start), bisect.bisect_left(self.starts, end)
+
+    def add(self, start: int, end: int) -> None:
+        """Add [start, end) to the set, in O(n) for the list splice."""
+        if start >= end:
+            return
+        # Intervals that overlap or touch the new one are merged into it
+        lo = bisect.bisect_left(self.ends, start)
+        hi = bisect.bisect_right(self.starts, end)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def remove(self, start: int, end: int) -> None:
+        """Remove [start, end) from the set, in O(n) for the list splice."""
+        if start >= end:
+            return
+        lo, hi = self._get_overlapping(start, end)
+        if lo >= hi:
+            return
+        new_starts = list()
+        new_ends = list()
+        if self.starts[lo] < start:
+            new_starts.append(self.starts[lo])
+            new_ends.append(start)
+        if self.ends[hi - 1] > end:
+            new_starts.append(end)
+            new_ends.append(self.ends[hi - 1])
+        self.starts[lo:hi] = new_starts
+        self.ends[lo:hi] = new_ends
+
+    def clip(self, start: int, end: int) -> 'IntervalSet':
+        """The part of the set inside [start, end)."""
+        result = IntervalSet()
+        if start >= end:
+            return result
+        lo, hi = self._get_overlapping(start, end)
+        if lo >= hi:
+            return result
+        result.starts = self.starts[lo:hi]
+        result.ends = self.ends[lo:hi]
+        result.starts[0] = max(result.starts[0], start)
+        result.ends[-1] = min(result.ends[-1], end)
+        return result
+
+    def split(self, at: int) -> Tuple['IntervalSet', 'IntervalSet']:
+        """The parts of the set below at and from at on, copied in O(n)."""
+        idx = bisect.bisect_right(self.starts, at)
+        lower = IntervalSet()
+        upper = IntervalSet()
+        lower.starts = self.starts[:idx]
+        lower.ends = self.ends[:idx]
+        upper.starts = self.starts[idx:]
+        upper.ends = self.ends[idx:]
+        if idx > 0 and lower.ends[-1] > at:
+            upper.starts.insert(0, at)
+            upper.ends.insert(0, lower.ends[-1])
+            lower.ends[-1] = at
+            if lower.starts[-1] == at:
+                lower.starts.pop()
+                lower.ends.pop()
+        return lower, upper
+
+    def shift(self, delta: int) -> 'IntervalSet':
+        result = IntervalSet()
+        result.starts = [start + delta for start in self.starts]
+        result.ends = [end + delta for end in self.ends]
+        return result
+
+    def _append(self, start: int, end: int) -> None:
+        if len(self.ends) > 0 and self.ends[-1] == start:
+            self.ends[-1] = end
+        else:
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def _combine(self, other: 'IntervalSet', keep: Callable[[bool, bool], bool]) -> 'IntervalSet':
+        """Sweep the boundaries of both sets, keeping the segments where keep is true."""
+        points = sorted(set(itertools.chain(self.starts, self.ends, other.starts, other.ends)))
+        result = IntervalSet()
+        idx1, idx2 = 0, 0
+        for start, end in zip(points, points[1:]):
+            while idx1 < len(self.ends) and self.ends[idx1] <= start:
+                idx1 += 1
+            while idx2 < len(other.ends) and other.ends[idx2] <= start:
+                idx2 += 1
+            in_self = idx1 < len(self.starts) and self.starts[idx1] <= start
+            in_other = idx2 < len(other.starts) and other.starts[idx2] <= start
+            if keep(in_self, in_other):
+                result._append(start, end)
+        return result
+
+    def __or__(self, other: 'IntervalSet') -> 'IntervalSet':
+        return self._combine(other, lambda a, b: a or b)
+
+    def __and__(self, other: 'IntervalSet') -> 'IntervalSet':
+        return self._combine(other, lambda a, b: a and b)
+
+    def __sub__(self, other: 'IntervalSet') -> 'IntervalSet':
+        return self._combine(other, lambda a, b: a and not b)
+
+    def __xor__(self, other: 'IntervalSet') -> 'IntervalSet':
+        return self._combine(other, lambda a, b: a != b)
+
+
+class Box:
+    """Product of one half-open interval per dimension; empty boxes are None."""
+
+    def __init__(self, bounds: Sequence[Tuple[int, int]]):
+        self.bounds = tuple(bounds)
+
+    @classmethod
+    def build(cls, bounds: Sequence[Tuple[int, int]]) -> 'Box | None':
+        for start, end in bounds:
+            if start >= end:
+                return None
+        return cls(bounds)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Box) and self.bounds == other.bounds
+
+    def __hash__(self) -> int:
+        return hash(self.bounds)
+
+    def __repr__(self) -> str:
+        return "Box(%s)" % list(self.bounds)
+
+    def __contains__(self, point: Sequence[int]) -> bool:
+        for value, (start, end) in zip(point, self.bounds):
+            if not start <= value < end:
+                return False
+        return True
+
+    def volume(self) -> int:
+        volume = 1
+        for start, end in self.bounds:
+            volume *= end - start
+        return volume
+
+    def restrict(self, dimension: int, start: int, end: int) -> 'Box | None':
+        """The part of the box with start <= coordinate < end along dimension."""
+        current_start, current_end = self.bounds[dimension]
+        start = max(start, current_start)
+        end = min(end, current_end)
+        if start >= end:
+            return None
+        bounds = list(self.bounds)
+        bounds[dimension] = (start, end)
+        return Box(bounds)
+
+    def split(self, dimension: int, at: int) -> Tuple['Box | None', 'Box | None']:
+        start, end = self.bounds[dimension]
+        return self.restrict(dimension, start, at), self.restrict(dimension, at, end)
+
+    def __and__(self, other: 'Box') -> 'Box | None':
+        bounds = list()
+        for (start1, end1), (start2, end2) in zip(self.bounds, other.bounds):
+            start = max(start1, start2)
+            end = min(end1, end2)
+            if start >= end:
+                return None
+            bounds.append((start, end))
+        return Box(bounds)
+
+    def __sub__(self, other: 'Box') -> List['Box']:
+        """Disjoint boxes covering the points of self that are not in other."""
+        if self & other is None:
+            return [self]
+        pieces = list()
+        current = self
+        for dimension, (start, end) in enumerate(other.bounds):
+            lower, current = current.split(dimension, start)
+            if lower is not None:
+                pieces.append(lower)
+            current, upper = current.split(dimension, end)
+            if upper is not None:
+                pieces.append(upper)
+        return pieces
@@ -0,0 +1,81 @@
+"""Memory taken by the small objects that the solvers allocate by the thousand.
+
+Each object class is instantiated many times with the same arguments, as
+it is and as a twin class without __slots__ (so with a __dict__ for every
+instance, like before the classes were slotted); the bytes allocated per
+instance are measured with tracemalloc."""
+import sys
+import tracemalloc
+from typing import Dict, List
+
+from aoc import days
+
+# name -> (day, class path in the solution module, constructor arguments)
+OBJECTS = {
+    "07.CardHand": (7, "CardHand", ([1, 2, 3, 4, 5], 2)),
+    "15.BoxItem": (15, "Box.BoxItem", ("label", 3)),
+    "17.Status": (17, "Status", (1000, 100, 1, 1)),
+    "22.Cube": (22, "Cube", ((0, 0, 1), (2, 0, 1))),
+    "23.Path": (23, "Path", (1000, 2000, 100, {3000})),
+    "24.HailstoneTrajectory": (24, "HailstoneTrajectory", ((1, 2, 3), (1, 1, 1), (1.0, 1.0), (1.0, 2.0), [1, None])),
+}
+
+
+def select(pattern: str | None) -> List[str]:
+    return [name for name in OBJECTS if pattern is None or pattern in name]
+
+
+def get_class(day: int, path: str) -> type:
+    value = days.load_module(day)
+    for name in path.split("."):
+        value = getattr(value, name)
+    return value
+
+
+def without_slots(cls: type) -> type:
+    """Copy of a slotted class whose instances have a __dict__ instead."""
+    slots = set(getattr(cls, "__slots__", ()))
+    namespace = {
+        name: value for name, value in vars(cls).items()
+        if name not in slots and name not in ("__slots__", "__dict__", "__weakref__")
+    }
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def bytes_per_instance(cls: type, args: tuple, count: int) -> float:
+    # The arguments are shared by all the instances, only the instances are counted
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        instances = [cls(*args) for _ in range(count)]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (end - start - sys.getsizeof(instances)) / count
+
+
+def run_membench(names: List[str], count: int = 100000) -> List[Dict]:
+    rows = list()
+    for name in names:
+        day, path, args = OBJECTS[name]
+        row = {"name": name, "slotted": None, "dict": None, "error": None}
+        try:
+            cls = get_class(day, path)
+            row["slotted"] = bytes_per_instance(cls, args, count)
+            row["dict"] = bytes_per_instance(without_slots(cls), args, count)
+        except Exception as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        rows.append(row)
+    return rows
+
+
+def format_rows(rows: List[Dict]) -> str:
+    lines = ["object                    __dict__ (B)  slotted (B)  saved"]
+    for row in rows:
+        if row["error"] is not None:
+            lines.append("%-24s  error: %s" % (row["name"], row["error"]))
+            continue
+        lines.append("%-24s %13.1f %12.1f %5.0f%%" % (
+            row["name"], row["dict"], row["slotted"], 100 * (1 - row["slotted"] / row["dict"])
+        ))
+    return "\n".join(lines)
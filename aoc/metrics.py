@@ -0,0 +1,49 @@
+"""Counters and histograms reported by the hot loops of the solvers.
+
+Collection is off by default. Loops read `enabled` once, keep their
+counts in locals and report them at the end, so that a disabled run only
+pays for a few boolean checks."""
+from typing import Dict
+
+enabled = False
+
+_counters = dict()
+_histograms = dict()
+
+
+def enable(value: bool = True) -> None:
+    global enabled
+    enabled = value
+
+
+def reset() -> None:
+    _counters.clear()
+    _histograms.clear()
+
+
+def count(name: str, value: int = 1) -> None:
+    _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: int) -> None:
+    """Add value to the histogram name, bucketed by powers of two."""
+    histogram = _histograms.get(name)
+    if histogram is None:
+        histogram = {"count": 0, "sum": 0, "min": value, "max": value, "buckets": dict()}
+        _histograms[name] = histogram
+    histogram["count"] += 1
+    histogram["sum"] += value
+    histogram["min"] = min(histogram["min"], value)
+    histogram["max"] = max(histogram["max"], value)
+    bucket = "<=%d" % (1 << max(0, int(value) - 1).bit_length())
+    histogram["buckets"][bucket] = histogram["buckets"].get(bucket, 0) + 1
+
+
+def snapshot() -> Dict:
+    return {
+        "counters": dict(sorted(_counters.items())),
+        "histograms": {
+            name: dict(histogram, buckets=dict(sorted(histogram["buckets"].items(), key=lambda item: int(item[0][2:]))))
+            for name, histogram in sorted(_histograms.items())
+        },
+    }
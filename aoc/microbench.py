@@ -0,0 +1,154 @@
+"""Micro-benchmarks of the shared data structures, outside of any puzzle.
+
+Each benchmark gets a random generator and a size, prepares its data and
+returns a function to time together with the number of operations that
+one call performs; results are reported per operation."""
+import random
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from aoc.intervals import Box, IntervalSet
+
+QUERIES = 1000
+
+BENCHMARKS = dict()
+
+
+def benchmark(name: str):
+    def register(func: Callable):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _random_intervals(rng: random.Random, size: int) -> List[Tuple[int, int]]:
+    bounds = sorted(rng.sample(range(20 * size), 2 * size))
+    intervals = list(zip(bounds[::2], bounds[1::2]))
+    rng.shuffle(intervals)
+    return intervals
+
+
+def _random_set(rng: random.Random, size: int) -> IntervalSet:
+    return IntervalSet(_random_intervals(rng, size))
+
+
+def _random_box(rng: random.Random, size: int, dimensions: int = 4) -> Box:
+    bounds = list()
+    for _ in range(dimensions):
+        start = rng.randrange(size)
+        bounds.append((start, start + rng.randint(1, size)))
+    return Box(bounds)
+
+
+@benchmark("intervals.add")
+def _bench_add(rng: random.Random, size: int):
+    intervals = _random_intervals(rng, size)
+
+    def run():
+        result = IntervalSet()
+        for start, end in intervals:
+            result.add(start, end)
+    return run, size
+
+
+@benchmark("intervals.remove")
+def _bench_remove(rng: random.Random, size: int):
+    values = _random_set(rng, size)
+    intervals = _random_intervals(rng, size)
+
+    def run():
+        result = values.copy()
+        for start, end in intervals:
+            result.remove(start, end)
+    return run, size
+
+
+@benchmark("intervals.contains")
+def _bench_contains(rng: random.Random, size: int):
+    values = _random_set(rng, size)
+    points = [rng.randrange(20 * size) for _ in range(QUERIES)]
+
+    def run():
+        for point in points:
+            _ = point in values
+    return run, QUERIES
+
+
+@benchmark("intervals.clip")
+def _bench_clip(rng: random.Random, size: int):
+    values = _random_set(rng, size)
+    windows = [(start, start + 40) for start in (rng.randrange(20 * size) for _ in range(QUERIES))]
+
+    def run():
+        for start, end in windows:
+            values.clip(start, end)
+    return run, QUERIES
+
+
+@benchmark("intervals.split")
+def _bench_split(rng: random.Random, size: int):
+    values = _random_set(rng, size)
+    points = [rng.randrange(20 * size) for _ in range(QUERIES)]
+
+    def run():
+        for point in points:
+            values.split(point)
+    return run, QUERIES
+
+
+@benchmark("intervals.union")
+def _bench_union(rng: random.Random, size: int):
+    values1 = _random_set(rng, size)
+    values2 = _random_set(rng, size)
+    return lambda: values1 | values2, 1
+
+
+@benchmark("intervals.difference")
+def _bench_difference(rng: random.Random, size: int):
+    values1 = _random_set(rng, size)
+    values2 = _random_set(rng, size)
+    return lambda: values1 - values2, 1
+
+
+@benchmark("box.intersect")
+def _bench_box_intersect(rng: random.Random, size: int):
+    pairs = [(_random_box(rng, size), _random_box(rng, size)) for _ in range(QUERIES)]
+
+    def run():
+        for box1, box2 in pairs:
+            _ = box1 & box2
+    return run, QUERIES
+
+
+@benchmark("box.subtract")
+def _bench_box_subtract(rng: random.Random, size: int):
+    pairs = [(_random_box(rng, size), _random_box(rng, size)) for _ in range(QUERIES)]
+
+    def run():
+        for box1, box2 in pairs:
+            _ = box1 - box2
+    return run, QUERIES
+
+
+def select(pattern: str | None) -> List[str]:
+    return [name for name in BENCHMARKS if pattern is None or pattern in name]
+
+
+def run_benchmarks(names: List[str], sizes: List[int], repeat: int = 5, seed: int = 0) -> List[Dict]:
+    """Time every benchmark at every size, keeping the best of repeat rounds."""
+    rows = list()
+    for name in names:
+        for size in sizes:
+            func, ops = BENCHMARKS[name](random.Random(seed), size)
+            timer = timeit.Timer(func)
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=repeat, number=number)) / number
+            rows.append({"name": name, "size": size, "ops": ops, "time": best, "per_op": best / ops})
+    return rows
+
+
+def format_rows(rows: List[Dict]) -> str:
+    lines = ["benchmark                   size    per op (us)"]
+    for row in rows:
+        lines.append("%-22s %9d %14.3f" % (row["name"], row["size"], row["per_op"] * 1e6))
+    return "\n".join(lines)
@@ -0,0 +1,85 @@
+import functools
+import hashlib
+import os
+import pickle
+
+from aoc import days
+from aoc import disk
+from aoc import inputs
+
+CACHE_DIRNAME = ".parse-cache"
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+SUFFIX = ".pickle"
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_hash() -> str:
+    """sha256 of the shared aoc modules, whose objects can be part of a parsed state."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(SHARED_DIR)):
+        if name.endswith(".py"):
+            digest.update(name.encode() + b"\0" + disk.hash_file(os.path.join(SHARED_DIR, name)).encode())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Parsed solver state stored as pickle files, keyed by the hash of the
+    input content, of the solver source and of the shared aoc modules.
+
+    Editing a solution.py, or a module of aoc such as grid or intervals,
+    changes its key, so stale entries are never read back; they are
+    eventually evicted, least recently used first, once the directory
+    grows beyond max_bytes. Without a directory each entry is kept next
+    to its input, and inputs that are not files are only cached when a
+    directory is given."""
+
+    def __init__(self, directory: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get_directory(self, source) -> str | None:
+        if self.directory is not None:
+            return self.directory
+        if not inputs.is_path(source):
+            return None
+        return os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIRNAME)
+
+    def get_entry(self, day: int, source, engine: str = None) -> str | None:
+        """Path of the cache entry for the given day, input and engine, None if it cannot be cached."""
+        directory = self.get_directory(source)
+        input_hash = inputs.hash_source(source)
+        if directory is None or input_hash is None:
+            return None
+        digest = hashlib.sha256()
+        with open(os.path.join(days.get_day_dir(day), "solution.py"), "rb") as hand:
+            digest.update(hand.read())
+        digest.update(b"\0" + get_shared_hash().encode() + b"\0")
+        digest.update(input_hash.encode())
+        if engine is not None:
+            digest.update(b"\0" + engine.encode())
+        return os.path.join(directory, "%02d-%s%s" % (day, digest.hexdigest(), SUFFIX))
+
+    def load(self, solver, entry: str) -> bool:
+        """Restore the parsed state into solver, return False on a miss."""
+        try:
+            with open(entry, "rb") as hand:
+                state = pickle.load(hand)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        vars(solver).update(state)
+        # Refresh the entry for the LRU eviction
+        os.utime(entry)
+        return True
+
+    def store(self, solver, entry: str) -> bool:
+        """Save the parsed state of solver, return False if it cannot be pickled."""
+        try:
+            data = pickle.dumps(vars(solver), pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+        disk.write_atomic(entry, data)
+        disk.evict_least_recent(os.path.dirname(entry), SUFFIX, self.max_bytes)
+        return True
@@ -0,0 +1,164 @@
+import cProfile
+import json
+import os
+import pstats
+import signal
+import time
+from typing import Callable, Dict, List, Tuple
+
+MODES = ("cprofile", "sample")
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class _Frames:
+    """Frames shared by the profiles of a speedscope file."""
+
+    def __init__(self):
+        self.frames = list()
+        self.indexes = dict()
+
+    def get(self, name: str, file: str, line: int) -> int:
+        key = (name, file, line)
+        index = self.indexes.get(key)
+        if index is None:
+            index = len(self.frames)
+            self.indexes[key] = index
+            self.frames.append({"name": name, "file": file, "line": line})
+        return index
+
+
+def _build_speedscope(name: str, frames: _Frames, samples: List[List[int]], weights: List[float]) -> Dict:
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "name": name,
+        "exporter": "python -m aoc",
+        "shared": {"frames": frames.frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "seconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def stats_to_speedscope(stats: pstats.Stats, name: str, min_fraction: float = 1e-4) -> Dict:
+    """Rebuild call stacks from the caller/callee edges of cProfile.
+
+    cProfile only knows the time spent below each edge, so the time of a
+    function called from several places is split among the callers in
+    proportion. Recursive calls are folded into their first occurrence
+    and stacks below min_fraction of the total are dropped."""
+    entries = stats.stats
+    children = dict()
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, list()).append((func, edge[3]))
+    total = sum(entry[2] for entry in entries.values())
+    min_weight = total * min_fraction
+
+    frames = _Frames()
+    samples = list()
+    weights = list()
+    roots = [func for func, entry in entries.items() if len(entry[4]) == 0]
+    pending = [(root, 1.0, ()) for root in roots]
+    while len(pending) > 0:
+        func, scale, stack = pending.pop()
+        filename, line, func_name = func
+        stack = stack + ((func, frames.get(func_name, filename, line)),)
+        self_time = entries[func][2] * scale
+        if self_time > 0:
+            samples.append([index for _, index in stack])
+            weights.append(self_time)
+        on_stack = {item for item, _ in stack}
+        for child, edge_time in children.get(func, list()):
+            child_time = entries[child][3]
+            if child in on_stack or child_time <= 0:
+                continue
+            child_scale = scale * edge_time / child_time
+            if child_scale * child_time >= min_weight:
+                pending.append((child, child_scale, stack))
+    return _build_speedscope(name, frames, samples, weights)
+
+
+class Sampler:
+    """Statistical profiler driven by SIGPROF.
+
+    Every interval of CPU time the interrupted Python stack is recorded,
+    up to the frame that started the sampler. Each stack is weighted by the
+    CPU time elapsed since the previous sample, since the kernel timer may
+    fire less often than asked. Only works in the main thread, on platforms
+    with setitimer."""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.weights = dict()
+        self._last_sample = 0
+        self._stop_code = None
+        self._previous_handler = None
+
+    def _handle(self, signum, frame) -> None:
+        now = time.process_time()
+        elapsed = now - self._last_sample
+        self._last_sample = now
+        stack = list()
+        while frame is not None and frame.f_code is not self._stop_code:
+            code = frame.f_code
+            stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        key = tuple(reversed(stack))
+        self.weights[key] = self.weights.get(key, 0) + elapsed
+
+    def run(self, func: Callable):
+        self._stop_code = Sampler.run.__code__
+        self._previous_handler = signal.signal(signal.SIGPROF, self._handle)
+        self._last_sample = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return func()
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+
+    def to_speedscope(self, name: str) -> Dict:
+        frames = _Frames()
+        samples = list()
+        weights = list()
+        for stack, weight in self.weights.items():
+            samples.append([frames.get(*item) for item in stack])
+            weights.append(weight)
+        return _build_speedscope(name, frames, samples, weights)
+
+
+class Profiler:
+    """Profile solver phases and write one speedscope file for each."""
+
+    def __init__(self, mode: str = "cprofile", directory: str = "profiles", interval: float = 0.001):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiler {mode}")
+        self.mode = mode
+        self.directory = directory
+        self.interval = interval
+
+    def run(self, func: Callable, name: str) -> Tuple[object, str]:
+        """Call func under the profiler, return its value and the profile path."""
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                value = profile.runcall(func)
+            finally:
+                profile.create_stats()
+            speedscope = stats_to_speedscope(pstats.Stats(profile), name)
+        else:
+            sampler = Sampler(self.interval)
+            value = sampler.run(func)
+            speedscope = sampler.to_speedscope(name)
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "%s.speedscope.json" % name)
+        with open(path, "w") as hand:
+            json.dump(speedscope, hand)
+        return value, path
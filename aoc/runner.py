@@ -0,0 +1,225 @@
+import concurrent.futures
+import multiprocessing
+import resource
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from aoc import days
+from aoc import inputs
+from aoc import metrics
+from aoc.parse_cache import ParseCache
+from aoc.profiling import Profiler
+
+
+def get_max_rss() -> int:
+    """Peak resident set size of the current process so far, in bytes."""
+    # ru_maxrss is expressed in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(func: Callable, trace_memory: bool = False) -> Tuple[object, Dict]:
+    """Call func and return its result together with time and memory stats.
+
+    The peak of the Python heap is only available with trace_memory,
+    since tracemalloc slows down the measured code noticeably. The rss is
+    the high-water mark of the process, not of func: it includes what
+    the process used before the call."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        value = func()
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return value, {"time": elapsed, "peak": peak, "rss": get_max_rss()}
+
+
+def _parse(solver, day: int, source, parse_cache: ParseCache = None, engine: str = None) -> bool:
+    """Parse source into solver, through the cache if given; True on a cache hit."""
+    entry = None if parse_cache is None else parse_cache.get_entry(day, source, engine)
+    if entry is None:
+        solver.parse(source)
+        return False
+    if parse_cache.load(solver, entry):
+        return True
+    solver.parse(source)
+    parse_cache.store(solver, entry)
+    return False
+
+
+def _run_phase(name: str, func: Callable, trace_memory: bool = False, collect_metrics: bool = False,
+               profiler: Profiler = None) -> Tuple[object, Dict]:
+    """Measure func and attach the metrics and profile requested for it."""
+    metrics.reset()
+    extra = dict()
+    if profiler is not None:
+        def profiled():
+            value, extra["profile"] = profiler.run(func, name)
+            return value
+        value, stats = measure(profiled, trace_memory)
+    else:
+        value, stats = measure(func, trace_memory)
+    if collect_metrics:
+        extra["metrics"] = metrics.snapshot()
+    stats.update(extra)
+    return value, stats
+
+
+def _stream(solver, source, parts) -> List[int]:
+    results = solver.stream(inputs.iter_lines(source))
+    return [results[part - 1] for part in parts]
+
+
+# Solver inherited by the processes forked to solve its parts
+_forked_solver = None
+
+
+def can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _run_forked_part(day: int, part: int, trace_memory: bool, collect_metrics: bool,
+                     profiler: Profiler) -> Tuple[object, Dict]:
+    metrics.enable(collect_metrics)
+    solve = getattr(_forked_solver, "solve%d" % part)
+    return _run_phase("%02d-solve%d" % (day, part), solve, trace_memory, collect_metrics, profiler)
+
+
+def _solve_forked(solver, day: int, parts, trace_memory: bool = False, collect_metrics: bool = False,
+                  profiler: Profiler = None) -> List[Tuple[int, object, Dict]]:
+    """Solve each part in its own forked process, at the same time.
+
+    The processes share the parsed solver copy-on-write instead of
+    receiving a pickled copy; what a part changes in the solver (and its
+    artifact cache, if kept in memory only) is not seen by the others."""
+    global _forked_solver
+    _forked_solver = solver
+    try:
+        context = multiprocessing.get_context("fork")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(parts), mp_context=context) as executor:
+            futures = [
+                executor.submit(_run_forked_part, day, part, trace_memory, collect_metrics, profiler)
+                for part in parts
+            ]
+            return [(part, *future.result()) for part, future in zip(parts, futures)]
+    finally:
+        _forked_solver = None
+
+
+def run_solver(day: int, source, parts=days.PARTS, trace_memory: bool = False,
+               parse_cache: ParseCache = None, collect_metrics: bool = False, profiler: Profiler = None,
+               stream: bool = False, engine: str = None, parallel_parts: bool = False) -> Dict:
+    """Parse source with the solver of day and solve the given parts.
+
+    The source is anything Solver.parse accepts: a path, a binary stream
+    or a bytes-like object (see aoc.inputs). With stream, the days whose
+    solver has a stream method solve both parts in a single pass over the
+    lines instead, reported as one stream phase without a parse. The
+    engine selects one of the solvers of the day (see days.get_engines);
+    the report names the engine that actually ran, which is the default
+    one of the day when it does not have the requested engine.
+    With parallel_parts, where fork is available, the parts are solved
+    concurrently after the parse (see _solve_forked).
+
+    Errors are reported instead of raised, so that one broken day does not
+    stop the others. With collect_metrics every phase also reports the
+    counters and histograms of aoc.metrics, with a profiler the path of
+    its profile (the profiler overhead is part of the measured time)."""
+    report = {"day": day, "engine": engine, "phases": list(), "error": None}
+    metrics.enable(collect_metrics)
+    try:
+        engine = report["engine"] = days.get_engine_name(day, engine)
+        solver = days.get_solver_class(day, engine)()
+        if stream and hasattr(solver, "stream"):
+            result, stats = _run_phase("%02d-stream" % day, lambda: _stream(solver, source, parts),
+                                       trace_memory, collect_metrics, profiler)
+            report["phases"].append(dict(phase="stream", result=result, **stats))
+            return report
+        cached, stats = _run_phase("%02d-parse" % day, lambda: _parse(solver, day, source, parse_cache, engine),
+                                   trace_memory, collect_metrics, profiler)
+        report["phases"].append(dict(phase="parse", result="cached" if cached else None, **stats))
+        parts = [part for part in parts if hasattr(solver, "solve%d" % part)]
+        if parallel_parts and len(parts) > 1 and can_fork():
+            solved = _solve_forked(solver, day, parts, trace_memory, collect_metrics, profiler)
+        else:
+            solved = (
+                (part, *_run_phase("%02d-solve%d" % (day, part), getattr(solver, "solve%d" % part),
+                                   trace_memory, collect_metrics, profiler))
+                for part in parts
+            )
+        for part, result, stats in solved:
+            report["phases"].append(dict(phase="solve%d" % part, result=result, **stats))
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        metrics.enable(False)
+    return report
+
+
+def run_day(day: int, parts=days.PARTS, input_name: str = "input", trace_memory: bool = False,
+            parse_cache: ParseCache = None, collect_metrics: bool = False, profiler: Profiler = None,
+            stream: bool = False, engine: str = None, parallel_parts: bool = False) -> Dict:
+    return run_solver(day, days.get_input_path(day, input_name), parts, trace_memory, parse_cache,
+                      collect_metrics, profiler, stream, engine, parallel_parts)
+
+
+def run_days(selected_days: List[int], parts=days.PARTS, input_name: str = "input",
+             jobs: int = 1, trace_memory: bool = False, parse_cache: ParseCache = None,
+             collect_metrics: bool = False, profiler: Profiler = None, stream: bool = False,
+             engine: str = None, parallel_parts: bool = False) -> List[Dict]:
+    """Run the selected days, fanning them out over jobs processes.
+
+    Each day runs in a fresh process, so that the rss of its phases does
+    not include the peak of the days run before it (a single day runs in
+    the current process)."""
+    if len(selected_days) <= 1:
+        return [run_day(day, parts, input_name, trace_memory, parse_cache, collect_metrics, profiler, stream,
+                        engine, parallel_parts)
+                for day in selected_days]
+
+    reports = list()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(jobs, 1), max_tasks_per_child=1) as executor:
+        futures = [
+            executor.submit(run_day, day, parts, input_name, trace_memory, parse_cache, collect_metrics,
+                            profiler, stream, engine, parallel_parts)
+            for day in selected_days
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            reports.append(future.result())
+    reports.sort(key=lambda report: report["day"])
+    return reports
+
+
+def get_metrics(reports: List[Dict]) -> Dict:
+    """Metrics of every phase, keyed by 'DD/phase'."""
+    return {
+        "%02d/%s" % (report["day"], phase["phase"]): phase["metrics"]
+        for report in reports
+        for phase in report["phases"]
+        if "metrics" in phase
+    }
+
+
+def _format_bytes(value: int | None) -> str:
+    if value is None:
+        return "-"
+    return "%.1f" % (value / 2 ** 20)
+
+
+def format_reports(reports: List[Dict]) -> str:
+    lines = ["day  phase     time (s)  peak (MiB)  max rss (MiB)  result"]
+    for report in reports:
+        for phase in report["phases"]:
+            result = "" if phase["result"] is None else str(phase["result"])
+            lines.append("%02d   %-7s %10.4f  %10s  %13s  %s" % (
+                report["day"], phase["phase"], phase["time"],
+                _format_bytes(phase["peak"]), _format_bytes(phase["rss"]), result
+            ))
+        if report["error"] is not None:
+            lines.append("%02d   error: %s" % (report["day"], report["error"]))
+    return "\n".join(lines)
@@ -0,0 +1,180 @@
+"""Local solving service: a small HTTP front end on asyncio and a pool of
+worker processes that have already imported every solution.
+
+POST /solve with {"day": 1, "part": 2, "input": "..."} returns
+{"day", "part", "result", "time", "cached"}, or 404 for a part the day
+does not have; GET /health returns the number of cached results."""
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+from typing import Dict, Tuple
+
+from aoc import days
+from aoc import runner
+
+MAX_BODY_BYTES = 64 * 2 ** 20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _warm_up() -> None:
+    for day in days.DAYS:
+        try:
+            days.load_module(day)
+        except Exception:
+            # Reported when a request for the day comes in
+            pass
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _solve(day: int, part: int, content: bytes) -> Dict:
+    # The solvers parse the request body straight from memory
+    report = runner.run_solver(day, content, (part,))
+    if report["error"] is not None:
+        return {"error": report["error"], "status": 500}
+    solve = [phase for phase in report["phases"] if phase["phase"] == "solve%d" % part]
+    if len(solve) == 0:
+        # The solver has no solve method for the part (for instance part 2 of day 25)
+        return {"error": f"Day {day} has no part {part}", "status": 404}
+    return {"result": solve[0]["result"], "time": sum(phase["time"] for phase in report["phases"])}
+
+
+class SolverService:
+    """Dispatch requests to warm workers and keep the latest results.
+
+    Results are keyed by day, part and the hash of the input; identical
+    requests arriving while one is being solved wait for the same job."""
+
+    def __init__(self, jobs: int = 1, max_entries: int = 1024):
+        self.jobs = jobs
+        self.max_entries = max_entries
+        self.results = collections.OrderedDict()
+        self.pending = dict()
+        self.executor = None
+
+    def start(self) -> None:
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs, initializer=_warm_up)
+        # Workers start lazily, make sure they are all up before the first request
+        for future in [self.executor.submit(_ping) for _ in range(self.jobs)]:
+            future.result()
+
+    def stop(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def solve(self, day: int, part: int, content: bytes) -> Dict:
+        if day not in days.DAYS:
+            raise RequestError(400, f"Invalid day {day}")
+        if part not in days.PARTS:
+            raise RequestError(400, f"Invalid part {part}")
+        key = (day, part, hashlib.sha256(content).hexdigest())
+        if key in self.results:
+            self.results.move_to_end(key)
+            return dict(self.results[key], cached=True)
+
+        future = self.pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(self.executor, _solve, day, part, content))
+            self.pending[key] = future
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+        answer = await future
+        if "error" in answer:
+            raise RequestError(answer["status"], answer["error"])
+
+        answer = {"day": day, "part": part, "result": answer["result"], "time": answer["time"]}
+        self.results[key] = answer
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+        return dict(answer, cached=False)
+
+    async def _route(self, method: str, target: str, body: bytes) -> Dict:
+        if target == "/health":
+            return {"status": "ok", "cached_results": len(self.results)}
+        if target != "/solve":
+            raise RequestError(404, f"Unknown path {target}")
+        if method != "POST":
+            raise RequestError(405, "Use POST")
+        try:
+            request = json.loads(body)
+            day = int(request["day"])
+            part = int(request["part"])
+            content = request["input"].encode()
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise RequestError(400, f"Invalid request: {e}")
+        return await self.solve(day, part, content)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, body = await _read_request(reader)
+                status, answer = 200, await self._route(method, target, body)
+            except RequestError as e:
+                status, answer = e.status, {"error": str(e)}
+            payload = json.dumps(answer).encode()
+            writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                         b"Connection: close\r\n\r\n" % (status, _REASONS[status].encode(), len(payload)))
+            writer.write(payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        method, target = request_line[0], request_line[1]
+    except (IndexError, UnicodeDecodeError):
+        raise RequestError(400, "Malformed request line")
+    length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if line == "":
+            break
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            try:
+                length = int(value)
+            except ValueError:
+                raise RequestError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(400, "Input too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), target, body
+
+
+async def serve(service: SolverService, host: str = "127.0.0.1", port: int = 8023, unix_path: str = None) -> None:
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(service.handle, path=unix_path)
+    else:
+        server = await asyncio.start_server(service.handle, host=host, port=port)
+    async with server:
+        await server.serve_forever()
+
+
+def run_service(jobs: int = 1, max_entries: int = 1024, host: str = "127.0.0.1", port: int = 8023,
+                unix_path: str = None) -> None:
+    service = SolverService(jobs, max_entries)
+    service.start()
+    try:
+        asyncio.run(serve(service, host, port, unix_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()